@@ -1,4 +1,5 @@
 import os
+import sys
 import dj_database_url 
 from pathlib import Path
 from dotenv import load_dotenv
@@ -12,6 +13,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Security
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-me")
 DEBUG = 'RENDER' not in os.environ
+# manage.py test or pytest, wherever it runs
+TESTING = sys.argv[1:2] == ["test"] or "pytest" in sys.modules
 ALLOWED_HOSTS = ["localhost", "127.0.0.1", ".onrender.com"]
 
 # Applications
@@ -65,9 +68,25 @@ TEMPLATES = [
 DATABASES = {
     'default': dj_database_url.config(
         default=f'sqlite:///{BASE_DIR / "db.sqlite3"}',
-        conn_max_age=600
+        # Set DB_CONN_MAX_AGE=0 behind pgbouncer so connections are not pooled twice
+        conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        conn_health_checks=True,
     )
 }
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default'].setdefault('OPTIONS', {}).update(
+        # Fail fast instead of hanging a worker when PostgreSQL is unreachable
+        connect_timeout=2,
+        # Persistent connections sit idle between requests; keepalives stop NAT/firewalls dropping them
+        keepalives=1,
+        keepalives_idle=30,
+    )
+    # pgbouncer in transaction-pooling mode cannot hold server-side cursors open
+    if os.getenv('DB_PGBOUNCER', 'false').lower() == 'true':
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# The login form accepts an email or a username in one field
+AUTHENTICATION_BACKENDS = ["core.backends.EmailOrUsernameBackend"]
 
 # Password validation (keep defaults)
 AUTH_PASSWORD_VALIDATORS = [
@@ -77,6 +96,14 @@ AUTH_PASSWORD_VALIDATORS = [
 	{"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 
+# PBKDF2 costs ~150 ms per hash; use a cheap hasher locally and under test but
+# still verify PBKDF2 hashes
+if DEBUG or TESTING:
+	PASSWORD_HASHERS = [
+		"django.contrib.auth.hashers.MD5PasswordHasher",
+		"django.contrib.auth.hashers.PBKDF2PasswordHasher",
+	]
+
 # Internationalization
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
@@ -127,12 +154,22 @@ EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
-EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "shashankk1410@gmail.com")
-EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "afzp axal ajww imue")
+# Seconds before a stalled SMTP connection raises (and the task retries) instead of hanging a worker
+EMAIL_TIMEOUT = 10
+# Credentials come from the environment only; never commit them
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 
 DEFAULT_FROM_EMAIL = "college.portal@example.com"
 SITE_BASE_URL = os.getenv("SITE_BASE_URL", "http://localhost:8000")
 
+# Background tasks (core.tasks) run after commit on a thread pool; set true to run inline
+TASKS_ALWAYS_EAGER = os.getenv("TASKS_ALWAYS_EAGER", "false").lower() == "true"
+
+# Visitor rows are written in batches (core.tracking); 1 writes each visit immediately
+VISITOR_BUFFER_SIZE = int(os.getenv("VISITOR_BUFFER_SIZE", "1" if DEBUG else "50"))
+VISITOR_FLUSH_INTERVAL = 2  # seconds
+
 # Admin/Manager emails for error reports
 ADMINS = [("Admin", EMAIL_HOST_USER)] if EMAIL_HOST_USER else []
 MANAGERS = ADMINS
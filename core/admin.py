@@ -1,9 +1,22 @@
+import csv
+
 from django.contrib import admin
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib import messages
-from django.http import HttpResponseForbidden
-from .models import Mentor, UserProfile, AcademicRecord, MentorAssignment, Visitor, EmailVerificationToken, PageContent, RegistrationLog, MentorRequest, Program
+from django.db.models import Count
+from django.http import HttpResponseForbidden, StreamingHttpResponse
+from django.utils import timezone
+from .tasks import send_bulk_notifications_task
+from .utils import MAX_ADMIN_USERS, get_admin_count
+from .models import Mentor, UserProfile, AcademicRecord, MentorAssignment, Visitor, EmailVerificationToken, PageContent, RegistrationLog, MentorRequest, Program, Institution
+
+
+class Echo:
+	"""File-like object whose write() hands the value back, for streaming csv.writer output."""
+
+	def write(self, value):
+		return value
 
 
 @admin.register(Program)
@@ -35,7 +48,7 @@ class UserProfileAdmin(admin.ModelAdmin):
 
 	def get_queryset(self, request):
 		"""Hide staff/superusers from profile list to avoid mixing admin accounts with students."""
-		qs = super().get_queryset(request)
+		qs = super().get_queryset(request).select_related("user", "assigned_mentor")
 		return qs.filter(user__is_staff=False, user__is_superuser=False)
 
 	def mark_verified(self, request, queryset):
@@ -45,22 +58,26 @@ class UserProfileAdmin(admin.ModelAdmin):
 	mark_verified.short_description = "Mark selected profiles as verified"
 
 	def export_as_csv(self, request, queryset):
-		"""Export selected profiles as CSV."""
-		import csv
-		from django.http import HttpResponse
-		response = HttpResponse(content_type="text/csv")
+		"""Export selected profiles as CSV, streamed row by row."""
+		writer = csv.writer(Echo())
+		profiles = queryset.select_related("user", "assigned_mentor").only(
+			"user__username", "user__email", "phone", "city", "verified", "assigned_mentor__name"
+		)
+
+		def rows():
+			yield writer.writerow(["Username", "Email", "Phone", "City", "Verified", "Mentor"])
+			for profile in profiles.iterator(chunk_size=500):
+				yield writer.writerow([
+					profile.user.username,
+					profile.user.email,
+					profile.phone,
+					profile.city,
+					profile.verified,
+					profile.assigned_mentor.name if profile.assigned_mentor else "None"
+				])
+
+		response = StreamingHttpResponse(rows(), content_type="text/csv")
 		response["Content-Disposition"] = "attachment; filename=user_profiles.csv"
-		writer = csv.writer(response)
-		writer.writerow(["Username", "Email", "Phone", "City", "Verified", "Mentor"])
-		for profile in queryset:
-			writer.writerow([
-				profile.user.username,
-				profile.user.email,
-				profile.phone,
-				profile.city,
-				profile.verified,
-				profile.assigned_mentor.name if profile.assigned_mentor else "None"
-			])
 		return response
 	export_as_csv.short_description = "Export selected profiles as CSV"
 
@@ -73,6 +90,9 @@ class AcademicRecordAdmin(admin.ModelAdmin):
 	search_fields = ("user__username", "degree", "institution")
 	readonly_fields = ("created_at",)
 
+	def get_queryset(self, request):
+		return super().get_queryset(request).select_related("user")
+
 
 @admin.register(MentorAssignment)
 class MentorAssignmentAdmin(admin.ModelAdmin):
@@ -81,11 +101,28 @@ class MentorAssignmentAdmin(admin.ModelAdmin):
 	list_filter = ("assigned_at", "mentor")
 	search_fields = ("user__username", "mentor__name")
 	readonly_fields = ("assigned_at",)
+	actions = ["resend_notifications"]
+
+	def get_queryset(self, request):
+		return super().get_queryset(request).select_related("user", "mentor", "assigned_by")
+
+	def resend_notifications(self, request, queryset):
+		"""Queue assignment notifications for the selected rows, sent over one SMTP connection."""
+		assignment_ids = list(queryset.values_list("pk", flat=True))
+		send_bulk_notifications_task.delay(assignment_ids)
+		self.message_user(request, f"Notifications queued for {len(assignment_ids)} assignments.")
+	resend_notifications.short_description = "Resend notifications for selected assignments"
 
 	def formfield_for_foreignkey(self, db_field, request, **kwargs):
-		from django.contrib.auth.models import User
+		"""Limit dropdown querysets to the columns their option labels need."""
 		if db_field.name == "user":
-			kwargs["queryset"] = User.objects.filter(is_staff=False, is_superuser=False)
+			kwargs["queryset"] = User.objects.filter(is_staff=False, is_superuser=False).only(
+				"id", "username", "first_name", "last_name", "email"
+			)
+		elif db_field.name == "assigned_by":
+			kwargs["queryset"] = User.objects.only("id", "username", "first_name", "last_name", "email")
+		elif db_field.name == "mentor":
+			kwargs["queryset"] = Mentor.objects.only("id", "name", "email")
 		return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
@@ -98,21 +135,24 @@ class VisitorAdmin(admin.ModelAdmin):
 	readonly_fields = ("created_at",)
 	actions = ["export_visitor_stats"]
 
+	def get_queryset(self, request):
+		return super().get_queryset(request).select_related("user")
+
 	def export_visitor_stats(self, request, queryset):
-		"""Export visitor statistics as CSV."""
-		import csv
-		from django.http import HttpResponse
-		from django.db.models import Count
-		response = HttpResponse(content_type="text/csv")
-		response["Content-Disposition"] = "attachment; filename=visitor_stats.csv"
-		writer = csv.writer(response)
-		writer.writerow(["Path", "Visit Count", "Unique Users"])
+		"""Export visitor statistics as CSV, streamed row by row."""
+		writer = csv.writer(Echo())
 		stats = queryset.values("path").annotate(
 			count=Count("id"),
 			unique_users=Count("user", distinct=True)
 		).order_by("-count")
-		for stat in stats:
-			writer.writerow([stat["path"], stat["count"], stat["unique_users"]])
+
+		def rows():
+			yield writer.writerow(["Path", "Visit Count", "Unique Users"])
+			for stat in stats.iterator(chunk_size=1000):
+				yield writer.writerow([stat["path"], stat["count"], stat["unique_users"]])
+
+		response = StreamingHttpResponse(rows(), content_type="text/csv")
+		response["Content-Disposition"] = "attachment; filename=visitor_stats.csv"
 		return response
 	export_visitor_stats.short_description = "Export visitor statistics as CSV"
 
@@ -125,9 +165,11 @@ class EmailVerificationTokenAdmin(admin.ModelAdmin):
 	readonly_fields = ("created_at", "expires_at")
 	list_filter = ("created_at", "expires_at")
 
+	def get_queryset(self, request):
+		return super().get_queryset(request).select_related("user")
+
 	def is_expired(self, obj):
 		"""Check if token is expired."""
-		from django.utils import timezone
 		return obj.expires_at < timezone.now()
 	is_expired.boolean = True
 	is_expired.short_description = "Expired"
@@ -150,20 +192,23 @@ class RegistrationLogAdmin(admin.ModelAdmin):
 	readonly_fields = ("created_at",)
 	actions = ["export_registration_stats"]
 
+	def get_queryset(self, request):
+		return super().get_queryset(request).select_related("user")
+
 	def export_registration_stats(self, request, queryset):
-		"""Export registration statistics as CSV."""
-		import csv
-		from django.http import HttpResponse
-		from django.db.models import Count
-		response = HttpResponse(content_type="text/csv")
-		response["Content-Disposition"] = "attachment; filename=registration_stats.csv"
-		writer = csv.writer(response)
-		writer.writerow(["Status", "Count", "Date"])
+		"""Export registration statistics as CSV, streamed row by row."""
+		writer = csv.writer(Echo())
 		stats = queryset.values("status", "created_at__date").annotate(
 			count=Count("id")
 		).order_by("-created_at__date", "-count")
-		for stat in stats:
-			writer.writerow([stat["status"], stat["count"], stat["created_at__date"]])
+
+		def rows():
+			yield writer.writerow(["Status", "Count", "Date"])
+			for stat in stats.iterator(chunk_size=1000):
+				yield writer.writerow([stat["status"], stat["count"], stat["created_at__date"]])
+
+		response = StreamingHttpResponse(rows(), content_type="text/csv")
+		response["Content-Disposition"] = "attachment; filename=registration_stats.csv"
 		return response
 	export_registration_stats.short_description = "Export registration statistics as CSV"
 
@@ -173,11 +218,11 @@ class CustomUserAdmin(BaseUserAdmin):
 	"""Custom User Admin with admin restrictions."""
 	
 	def has_add_permission(self, request):
-		"""Limit admin creation to maximum 4 admins."""
-		if request.POST and 'is_staff' in request.POST and request.POST.get('is_staff') == 'on':
-			admin_count = User.objects.filter(is_staff=True).count()
-			if admin_count >= 4:
-				messages.error(request, 'Maximum of 4 admin users allowed.')
+		"""Limit admin creation to MAX_ADMIN_USERS admins."""
+		if request.POST.get('is_staff') == 'on':
+			admin_count = get_admin_count()
+			if admin_count >= MAX_ADMIN_USERS:
+				messages.error(request, f'Maximum of {MAX_ADMIN_USERS} admin users allowed.')
 				return False
 		return super().has_add_permission(request)
 	
@@ -210,7 +255,15 @@ admin.site.index_title = "Welcome to College Portal Administration"
 class MentorRequestAdmin(admin.ModelAdmin):
 	"""Admin for mentor requests submitted by students."""
 	list_display = ("user", "status", "created_at", "updated_at")
+	list_select_related = ("user",)
 	list_filter = ("status", "created_at")
 	search_fields = ("user__username", "user__email")
 	readonly_fields = ("created_at", "updated_at")
 	autocomplete_fields = ("user",)
+
+
+@admin.register(Institution)
+class InstitutionAdmin(admin.ModelAdmin):
+	"""Admin for the institution list behind the register page's dropdown."""
+	list_display = ("name", "state", "city")
+	search_fields = ("name", "state", "city")
@@ -1,4 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def _relax_sqlite_durability(sender, connection, **kwargs):
+    """Test databases are throwaway: skip fsyncs and keep journals/temp data in RAM."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous=OFF')
+            cursor.execute('PRAGMA journal_mode=MEMORY')
+            cursor.execute('PRAGMA temp_store=MEMORY')
 
 
 class CoreConfig(AppConfig):
@@ -12,3 +23,5 @@ class CoreConfig(AppConfig):
             import core.signals
         except ImportError:
             pass
+        if getattr(settings, 'TESTING', False):
+            connection_created.connect(_relax_sqlite_durability)
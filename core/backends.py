@@ -0,0 +1,35 @@
+"""
+Authentication backend for the portal's login form.
+
+The form's single field takes an email address (students, whose username
+is their email) or a username (admins with separate usernames).
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Case, Q, Value, When
+
+
+class EmailOrUsernameBackend(ModelBackend):
+    """ModelBackend that matches ``username`` against email or username in one query."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        # Email matches win, as the form asks for an email
+        user = (
+            UserModel._default_manager.filter(Q(email__iexact=username) | Q(username=username))
+            .order_by(Case(When(email__iexact=username, then=Value(0)), default=Value(1)), "pk")
+            .first()
+        )
+        if user is None:
+            # Hash anyway so a missing account takes as long as a wrong password
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -1,9 +1,17 @@
+import re
+
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
+from django.db import transaction
 from .models import UserProfile, AcademicRecord, Mentor, MentorAssignment
 
 
+# Compiled once; digits with optional leading '+', dashes and spaces
+_PHONE_RE = re.compile(r'\+?\d[\d\- ]{6,14}')
+_PIN_RE = re.compile(r'\d{6}')
+
+
 class UserRegistrationForm(UserCreationForm):
     """Form for student registration with extended fields."""
     
@@ -94,38 +102,41 @@ class UserRegistrationForm(UserCreationForm):
     
     def clean_phone(self):
         phone = self.cleaned_data.get('phone')
-        # Basic phone validation
-        if not phone.replace('+', '').replace('-', '').replace(' ', '').isdigit():
+        if not _PHONE_RE.fullmatch(phone or ''):
             raise forms.ValidationError('Please enter a valid phone number.')
         return phone
     
     def clean_pincode(self):
         pincode = self.cleaned_data.get('pincode')
-        if not pincode.isdigit() or len(pincode) != 6:
+        if not _PIN_RE.fullmatch(pincode or ''):
             raise forms.ValidationError('Please enter a valid 6-digit PIN code.')
         return pincode
     
     def save(self, commit=True):
         user = super().save(commit=False)
         user.username = self.cleaned_data['email']  # Use email as username
-        user.first_name = self.cleaned_data['full_name'].split()[0] if self.cleaned_data['full_name'] else ''
-        user.last_name = ' '.join(self.cleaned_data['full_name'].split()[1:]) if len(self.cleaned_data['full_name'].split()) > 1 else ''
+        parts = (self.cleaned_data['full_name'] or '').split()
+        user.first_name = parts[0] if parts else ''
+        user.last_name = ' '.join(parts[1:])
         
         if commit:
-            user.save()
-            
-            # Create user profile
-            profile = UserProfile.objects.create(
-                user=user,
-                full_name=self.cleaned_data['full_name'],
-                dob=self.cleaned_data['dob'],
-                father_name=self.cleaned_data['father_name'],
-                mother_name=self.cleaned_data['mother_name'],
-                phone=self.cleaned_data['phone'],
-                pincode=self.cleaned_data['pincode'],
-                city=self.cleaned_data['city'],
-                cet_taken=self.cleaned_data['cet_taken'] == 'yes'
-            )
+            # User and profile commit together so a failed profile never leaves an orphan user
+            with transaction.atomic():
+                user.save()
+                
+                # Create user profile
+                profile = UserProfile(
+                    user=user,
+                    full_name=self.cleaned_data['full_name'],
+                    dob=self.cleaned_data['dob'],
+                    father_name=self.cleaned_data['father_name'],
+                    mother_name=self.cleaned_data['mother_name'],
+                    phone=self.cleaned_data['phone'],
+                    pincode=self.cleaned_data['pincode'],
+                    city=self.cleaned_data['city'],
+                    cet_taken=self.cleaned_data['cet_taken'] == 'yes'
+                )
+                profile.save()
             
         return user
 
@@ -175,14 +186,16 @@ class AcademicRecordForm(forms.ModelForm):
 class MentorAssignmentForm(forms.ModelForm):
     """Form for assigning mentors to students."""
     
+    MAX_STUDENTS_PER_MENTOR = 10
+    
     user_id = forms.ModelChoiceField(
-        queryset=User.objects.filter(is_active=True),
+        queryset=User.objects.filter(is_active=True).only('id', 'username', 'email'),
         empty_label="Select a student",
         widget=forms.Select(attrs={'class': 'form-control'})
     )
     
     mentor_id = forms.ModelChoiceField(
-        queryset=Mentor.objects.all(),
+        queryset=Mentor.objects.only('id', 'name'),
         empty_label="Select a mentor",
         widget=forms.Select(attrs={'class': 'form-control'})
     )
@@ -202,9 +215,11 @@ class MentorAssignmentForm(forms.ModelForm):
             if MentorAssignment.objects.filter(user=user).exists():
                 raise forms.ValidationError('This student already has an assigned mentor.')
             
-            # Check if mentor is available (not overloaded)
-            active_assignments = MentorAssignment.objects.filter(mentor=mentor).count()
-            if active_assignments >= 10:  # Maximum 10 students per mentor
+            # Check if mentor is available (not overloaded). Slicing before
+            # count() lets the database stop counting once the cap is reached.
+            limit = self.MAX_STUDENTS_PER_MENTOR
+            active_assignments = MentorAssignment.objects.filter(mentor=mentor)[:limit].count()
+            if active_assignments >= limit:
                 raise forms.ValidationError('This mentor has reached the maximum number of students.')
         
         return cleaned_data
@@ -239,12 +254,12 @@ class MentorForm(forms.ModelForm):
                 'rows': 3
             })
         }
-    
-    def clean_email(self):
-        email = self.cleaned_data.get('email')
-        if Mentor.objects.filter(email=email).exclude(pk=self.instance.pk if self.instance else None).exists():
-            raise forms.ValidationError('This email address is already registered for another mentor.')
-        return email
+        # Mentor.email is unique, so validate_unique() already probes the index once
+        error_messages = {
+            'email': {
+                'unique': 'This email address is already registered for another mentor.',
+            }
+        }
 
 
 class UserProfileUpdateForm(forms.ModelForm):
@@ -274,13 +289,13 @@ class UserProfileUpdateForm(forms.ModelForm):
     
     def clean_phone(self):
         phone = self.cleaned_data.get('phone')
-        if not phone.replace('+', '').replace('-', '').replace(' ', '').isdigit():
+        if not _PHONE_RE.fullmatch(phone or ''):
             raise forms.ValidationError('Please enter a valid phone number.')
         return phone
     
     def clean_pincode(self):
         pincode = self.cleaned_data.get('pincode')
-        if not pincode.isdigit() or len(pincode) != 6:
+        if not _PIN_RE.fullmatch(pincode or ''):
             raise forms.ValidationError('Please enter a valid 6-digit PIN code.')
         return pincode
 
@@ -377,11 +392,40 @@ class SearchForm(forms.Form):
     )
 
 
+class BaseAcademicRecordFormSet(forms.BaseInlineFormSet):
+    """Inline formset that loads only edited columns and saves in bulk."""
+    
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            fields = ('id', 'user', *AcademicRecordForm._meta.fields)
+            self._queryset = super().get_queryset().only(*fields).order_by('id')
+        return self._queryset
+    
+    def save(self, commit=True):
+        """Write new and changed records with one bulk statement each."""
+        instances = super().save(commit=False)
+        if not commit:
+            return instances
+        
+        new = [obj for obj in instances if obj.pk is None]
+        changed = [obj for obj in instances if obj.pk is not None]
+        with transaction.atomic():
+            for obj in self.deleted_objects:
+                obj.delete()
+            AcademicRecord.objects.bulk_create(new, batch_size=100)
+            if changed:
+                AcademicRecord.objects.bulk_update(
+                    changed, fields=AcademicRecordForm._meta.fields, batch_size=100
+                )
+        return instances
+
+
 # Formset for multiple academic records
 AcademicRecordFormSet = forms.inlineformset_factory(
-    UserProfile,
+    User,
     AcademicRecord,
     form=AcademicRecordForm,
+    formset=BaseAcademicRecordFormSet,
     extra=1,
     can_delete=True,
     min_num=1,
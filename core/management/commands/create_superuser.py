@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.db import transaction
 import os
 
 class Command(BaseCommand):
@@ -19,13 +20,26 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR('You can create a maximum of 4 admin accounts.'))
             return
 
+        specs = []
         for admin_str in admin_list:
             try:
                 username, email, password = admin_str.split(',')
-                if not User.objects.filter(username=username).exists():
-                    self.stdout.write(self.style.SUCCESS(f'Creating superuser: {username}'))
-                    User.objects.create_superuser(username=username, email=email, password=password)
-                else:
-                    self.stdout.write(self.style.WARNING(f'Superuser {username} already exists.'))
             except ValueError:
-                self.stdout.write(self.style.ERROR(f'Invalid admin format: {admin_str}'))
\ No newline at end of file
+                self.stdout.write(self.style.ERROR(f'Invalid admin format: {admin_str}'))
+                continue
+            specs.append((username, email, password))
+
+        # One IN query instead of an exists() per admin
+        existing = set(
+            User.objects.filter(username__in=[spec[0] for spec in specs])
+            .values_list('username', flat=True)
+        )
+
+        with transaction.atomic():
+            for username, email, password in specs:
+                if username in existing:
+                    self.stdout.write(self.style.WARNING(f'Superuser {username} already exists.'))
+                    continue
+                self.stdout.write(self.style.SUCCESS(f'Creating superuser: {username}'))
+                User.objects.create_superuser(username=username, email=email, password=password)
+                existing.add(username)
@@ -0,0 +1,64 @@
+import csv
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Institution
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'core', 'data')
+SOURCES = ('aishe_institutions.csv', 'aicte_institutions.csv', 'ugc_institutions.csv')
+# Header names the source files use for each field, lowercased
+NAME_COLUMNS = ('name', 'institution', 'institute name')
+STATE_COLUMNS = ('state',)
+CITY_COLUMNS = ('city', 'district')
+
+
+def _column(header, aliases):
+    """Index of the first header cell matching one of ``aliases``, or None."""
+    return next((i for i, cell in enumerate(header) if cell in aliases), None)
+
+
+def _read_rows(path):
+    """Yield Institution rows from one CSV, whichever column names it uses."""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = [cell.strip().lower() for cell in next(reader, [])]
+        # Resolve the columns once, then index each row by position
+        columns = (
+            _column(header, NAME_COLUMNS),
+            _column(header, STATE_COLUMNS),
+            _column(header, CITY_COLUMNS),
+        )
+        if columns[0] is None:
+            return
+        width = max(i for i in columns if i is not None) + 1
+        for row in reader:
+            row += [''] * (width - len(row))
+            name, state, city = (row[i].strip() if i is not None else '' for i in columns)
+            if name:
+                yield Institution(name=name[:255], state=state[:100], city=city[:100])
+
+
+class Command(BaseCommand):
+    help = 'Replace the Institution table with the AISHE/AICTE/UGC CSVs in core/data (rerun when they change)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            default=DATA_DIR,
+            help=f'Directory holding the CSV files (default: {DATA_DIR})',
+        )
+
+    def handle(self, *args, **options):
+        rows = []
+        for filename in SOURCES:
+            path = os.path.join(options['data_dir'], filename)
+            if os.path.exists(path):
+                rows.extend(_read_rows(path))
+
+        with transaction.atomic():
+            Institution.objects.all().delete()
+            Institution.objects.bulk_create(rows, batch_size=1000)
+        self.stdout.write(self.style.SUCCESS(f'Loaded {len(rows)} institutions.'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.utils import cleanup_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired email verification tokens (run periodically, e.g. hourly cron)'
+
+    def handle(self, *args, **options):
+        count = cleanup_expired_tokens()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} expired verification tokens.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.utils import cleanup_old_registration_logs
+
+
+class Command(BaseCommand):
+    help = 'Delete registration logs past the retention window (run daily, e.g. via cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='Keep logs newer than this many days (default: 365)',
+        )
+
+    def handle(self, *args, **options):
+        count = cleanup_old_registration_logs(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} old registration logs.'))
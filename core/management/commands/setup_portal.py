@@ -1,10 +1,44 @@
+import hashlib
+from pathlib import Path
+
+import django
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from django.core.management import call_command
+from django.core.cache import cache
 from core.models import PageContent, Mentor, UserProfile
 from django.utils import timezone
 
 
+_DEFAULT_PAGE_CONTENT_ITEMS = tuple({
+    'welcome_title': 'Welcome to Our College Portal',
+    'welcome_message': 'Discover excellence in education and connect with mentors for your academic journey.',
+    'contact_email': 'info@college.edu',
+    'contact_phone': '+1 (555) 123-4567',
+    'program_ug_cs': 'B.Tech Computer Science - 4 years program with modern curriculum',
+    'program_ug_it': 'B.Tech Information Technology - 4 years program with industry focus',
+    'program_pg_cs': 'M.Tech Computer Science - 2 years advanced program',
+    'program_pg_it': 'M.Tech Information Technology - 2 years specialized program',
+    'about_college': 'A premier institution dedicated to academic excellence and innovation.',
+    'admission_info': 'Admissions open for the academic year 2025-26. Apply now!',
+    'academic_calendar': 'Academic calendar and important dates for the current year.',
+    'library_info': 'Access to extensive digital and physical learning resources.',
+    'career_services': 'Comprehensive career counseling and placement assistance.',
+    'student_life': 'Rich campus life with various clubs, events, and activities.',
+    'research_areas': 'Cutting-edge research in Computer Science, AI, and Data Science.',
+    'international_programs': 'Global exchange programs and international collaborations.',
+    'alumni_network': 'Strong alumni network providing mentorship and career guidance.',
+    'facilities_info': 'State-of-the-art laboratories, libraries, and sports facilities.',
+    'scholarship_info': 'Merit-based and need-based scholarship programs available.',
+    'hostel_info': 'Comfortable accommodation with modern amenities for students.',
+    'transport_info': 'Convenient transportation services for students and staff.',
+    'health_services': 'On-campus health center providing medical care and counseling.',
+    'security_info': '24/7 security services ensuring campus safety.',
+}.items())
+
+
 class Command(BaseCommand):
     help = 'Set up the College Portal with initial data and sample content'
 
@@ -39,53 +73,69 @@ class Command(BaseCommand):
         self.stdout.write('Running migrations...')
         call_command('migrate', verbosity=0)
         
-        # Collect static files
-        self.stdout.write('Collecting static files...')
-        call_command('collectstatic', '--noinput', verbosity=0)
+        # Collect static files, unless the sources are unchanged since the last run
+        self.collect_static(options['force'])
         
         self.stdout.write(
             self.style.SUCCESS('✅ College Portal setup completed successfully!')
         )
 
+    def collect_static(self, force=False):
+        """Run collectstatic only when the static sources have changed."""
+        marker = Path(settings.STATIC_ROOT) / '.source-hash'
+        fingerprint = self.static_fingerprint()
+        if not force and marker.exists() and marker.read_text() == fingerprint:
+            self.stdout.write('  - Static files unchanged, skipping collectstatic')
+            return
+        
+        self.stdout.write('Collecting static files...')
+        call_command('collectstatic', '--noinput', verbosity=0)
+        marker.write_text(fingerprint)
+
+    def static_fingerprint(self):
+        """SHA-256 over every file under STATICFILES_DIRS, plus the Django version for admin assets."""
+        digest = hashlib.sha256(django.get_version().encode())
+        for directory in settings.STATICFILES_DIRS:
+            root = Path(directory)
+            for path in sorted(p for p in root.rglob('*') if p.is_file()):
+                digest.update(str(path.relative_to(root)).encode())
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
+
     def setup_page_content(self, force=False):
         """Set up initial page content."""
         self.stdout.write('Setting up page content...')
         
-        content_data = {
-            'welcome_title': 'Welcome to Our College Portal',
-            'welcome_message': 'Discover excellence in education and connect with mentors for your academic journey.',
-            'contact_email': 'info@college.edu',
-            'contact_phone': '+1 (555) 123-4567',
-            'program_ug_cs': 'B.Tech Computer Science - 4 years program with modern curriculum',
-            'program_ug_it': 'B.Tech Information Technology - 4 years program with industry focus',
-            'program_pg_cs': 'M.Tech Computer Science - 2 years advanced program',
-            'program_pg_it': 'M.Tech Information Technology - 2 years specialized program',
-            'about_college': 'A premier institution dedicated to academic excellence and innovation.',
-            'admission_info': 'Admissions open for the academic year 2025-26. Apply now!',
-            'academic_calendar': 'Academic calendar and important dates for the current year.',
-            'library_info': 'Access to extensive digital and physical learning resources.',
-            'career_services': 'Comprehensive career counseling and placement assistance.',
-            'student_life': 'Rich campus life with various clubs, events, and activities.',
-            'research_areas': 'Cutting-edge research in Computer Science, AI, and Data Science.',
-            'international_programs': 'Global exchange programs and international collaborations.',
-            'alumni_network': 'Strong alumni network providing mentorship and career guidance.',
-            'facilities_info': 'State-of-the-art laboratories, libraries, and sports facilities.',
-            'scholarship_info': 'Merit-based and need-based scholarship programs available.',
-            'hostel_info': 'Comfortable accommodation with modern amenities for students.',
-            'transport_info': 'Convenient transportation services for students and staff.',
-            'health_services': 'On-campus health center providing medical care and counseling.',
-            'security_info': '24/7 security services ensuring campus safety.',
-        }
+        # One SELECT for the keys already present and one INSERT for the rest
+        existing = set(
+            PageContent.objects.filter(key__in=[key for key, _ in _DEFAULT_PAGE_CONTENT_ITEMS])
+            .values_list('key', flat=True)
+        )
+        now = timezone.now()
+        rows = [
+            PageContent(key=key, value=value, updated_at=now)
+            for key, value in _DEFAULT_PAGE_CONTENT_ITEMS
+            if force or key not in existing
+        ]
+        if force:
+            PageContent.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['key'],
+                update_fields=['value', 'updated_at'],
+            )
+        else:
+            PageContent.objects.bulk_create(rows, ignore_conflicts=True)
         
-        for key, value in content_data.items():
-            if force or not PageContent.objects.filter(key=key).exists():
-                PageContent.objects.update_or_create(
-                    key=key,
-                    defaults={
-                        'value': value,
-                        'updated_at': timezone.now()
-                    }
-                )
+        # bulk_create skips the post_save write-through, so refresh the cache here
+        cache.set_many(
+            {PageContent.cache_key(row.key): row.value for row in rows},
+            PageContent.CACHE_TIMEOUT,
+        )
+        
+        written = {row.key for row in rows}
+        for key, _ in _DEFAULT_PAGE_CONTENT_ITEMS:
+            if key in written:
                 self.stdout.write(f'  ✓ Created/Updated: {key}')
             else:
                 self.stdout.write(f'  - Skipped (exists): {key}')
@@ -132,9 +182,17 @@ class Command(BaseCommand):
             }
         ]
         
+        existing = set(
+            Mentor.objects.filter(email__in=[m['email'] for m in mentors_data])
+            .values_list('email', flat=True)
+        )
+        Mentor.objects.bulk_create(
+            [Mentor(**m) for m in mentors_data if m['email'] not in existing],
+            ignore_conflicts=True,
+        )
+        
         for mentor_data in mentors_data:
-            if not Mentor.objects.filter(email=mentor_data['email']).exists():
-                Mentor.objects.create(**mentor_data)
+            if mentor_data['email'] not in existing:
                 self.stdout.write(f'  ✓ Created mentor: {mentor_data["name"]}')
             else:
                 self.stdout.write(f'  - Skipped (exists): {mentor_data["name"]}')
@@ -183,26 +241,40 @@ class Command(BaseCommand):
             }
         ]
         
-        for user_data in users_data:
-            if not User.objects.filter(username=user_data['username']).exists():
-                user = User.objects.create_user(
-                    username=user_data['username'],
-                    email=user_data['email'],
-                    first_name=user_data['first_name'],
-                    last_name=user_data['last_name'],
-                    password=user_data['password']
+        existing = set(
+            User.objects.filter(username__in=[u['username'] for u in users_data])
+            .values_list('username', flat=True)
+        )
+        to_create = [u for u in users_data if u['username'] not in existing]
+        
+        if to_create:
+            User.objects.bulk_create([
+                User(
+                    username=u['username'],
+                    email=u['email'],
+                    first_name=u['first_name'],
+                    last_name=u['last_name'],
+                    password=make_password(u['password']),
                 )
-                
-                # Create user profile
-                UserProfile.objects.create(
+                for u in to_create
+            ])
+            
+            # Re-read the new users so their ids are known on every backend
+            users = User.objects.filter(username__in=[u['username'] for u in to_create])
+            UserProfile.objects.bulk_create([
+                UserProfile(
                     user=user,
-                    full_name=f"{user_data['first_name']} {user_data['last_name']}",
+                    full_name=f"{user.first_name} {user.last_name}",
                     phone='+1 (555) 123-4000',
                     city='Sample City',
                     pincode='123456',
                     verified=True
                 )
-                
+                for user in users
+            ])
+        
+        for user_data in users_data:
+            if user_data['username'] not in existing:
                 self.stdout.write(f'  ✓ Created user: {user_data["username"]}')
             else:
                 self.stdout.write(f'  - Skipped (exists): {user_data["username"]}')
@@ -3,11 +3,39 @@
 This is a minimal implementation using Django's cache. For production,
 use django-ratelimit or a Redis-backed rate limiter.
 """
-from datetime import timedelta
+from hashlib import blake2b
 from django.core.cache import cache
 from django.http import HttpResponse, HttpResponseForbidden
-from django.contrib.auth.models import User
 from django.contrib import messages
+from .utils import MAX_ADMIN_USERS, get_admin_count
+
+
+REGISTRATION_SUBMIT_PATH = "/register/submit/"
+REGISTRATION_RATE_LIMIT = 5  # attempts per window
+REGISTRATION_RATE_WINDOW = 60  # seconds
+ADMIN_CREATION_DENIED = f"Maximum of {MAX_ADMIN_USERS} admin users allowed."
+
+# str.startswith() takes a tuple and scans the prefixes in C
+COMMON_USER_PATHS = (
+	'/portal/home/',
+	'/portal/academics/',
+	'/portal/contact/',
+	'/portal/request-mentor/',
+	'/register/',
+	'/login/',
+)
+
+
+def registration_rate_key(ip: str, user_agent: str) -> str:
+	"""
+	Cache key counting registration attempts: ``rl:register:<ip>:<ua hash>``.
+
+	The value is the number of attempts in the current window; a request is
+	rejected once it would push the count past REGISTRATION_RATE_LIMIT.
+	"""
+	# blake2b is stable across workers, unlike the per-process randomized hash()
+	ua_key = blake2b(user_agent.encode("utf-8", "ignore"), digest_size=6).hexdigest()
+	return f"rl:register:{ip}:{ua_key}"
 
 
 class RegistrationRateLimitMiddleware:
@@ -16,14 +44,22 @@ class RegistrationRateLimitMiddleware:
 		self.get_response = get_response
 
 	def __call__(self, request):
-		if request.method == "POST" and request.path.startswith("/register/submit/"):
-			ip = request.META.get("REMOTE_ADDR", "0.0.0.0")
-			ua = request.META.get("HTTP_USER_AGENT", "")
-			key = f"rl:register:{ip}:{hash(ua) % 1000}"
-			count = cache.get(key, 0)
-			if count >= 5:
+		if request.method == "POST" and request.path.startswith(REGISTRATION_SUBMIT_PATH):
+			key = registration_rate_key(
+				request.META.get("REMOTE_ADDR", "0.0.0.0"),
+				request.META.get("HTTP_USER_AGENT", ""),
+			)
+			# add() seeds the window, incr() is atomic on shared backends
+			if cache.add(key, 1, timeout=REGISTRATION_RATE_WINDOW):
+				count = 1
+			else:
+				try:
+					count = cache.incr(key)
+				except ValueError:  # expired between add() and incr()
+					cache.add(key, 1, timeout=REGISTRATION_RATE_WINDOW)
+					count = 1
+			if count > REGISTRATION_RATE_LIMIT:
 				return HttpResponse("Too many registration attempts. Please try again later.", status=429)
-			cache.set(key, count + 1, timeout=60)  # 5 per minute
 		return self.get_response(request)
 
 
@@ -34,16 +70,20 @@ class AdminRestrictionMiddleware:
 		self.get_response = get_response
 
 	def __call__(self, request):
-		# Only apply to admin URLs
-		if request.path.startswith('/admin/'):
-			# Check if user is authenticated and is staff
-			if request.user.is_authenticated and request.user.is_staff:
-				# Enforce maximum 4 admins limit
-				if self._is_admin_creation_request(request):
-					admin_count = User.objects.filter(is_staff=True).count()
-					if admin_count >= 4:
-						messages.error(request, 'Maximum of 4 admin users allowed.')
-						return HttpResponseForbidden('Maximum of 4 admin users allowed.')
+		# Only admin-creation POSTs matter; cheap checks run first so other
+		# requests never load the session user
+		if (
+			request.method == 'POST'
+			and request.path.startswith('/admin/')
+			and request.user.is_authenticated
+			and request.user.is_staff
+			and self._is_admin_creation_request(request)
+		):
+			# Enforce the admin limit
+			admin_count = get_admin_count()
+			if admin_count >= MAX_ADMIN_USERS:
+				messages.error(request, ADMIN_CREATION_DENIED)
+				return HttpResponseForbidden(ADMIN_CREATION_DENIED)
 		
 		# Admin users can access all features - no restrictions here
 			
@@ -51,32 +91,9 @@ class AdminRestrictionMiddleware:
 	
 	def _is_admin_creation_request(self, request):
 		"""Check if this is a request to create a new admin user."""
-		if request.method == 'POST':
-			# Check if creating a new user with staff privileges
-			if 'is_staff' in request.POST and request.POST.get('is_staff') == 'on':
-				return True
-		return False
+		# Check if creating a new user with staff privileges
+		return request.method == 'POST' and request.POST.get('is_staff') == 'on'
 	
 	def _is_common_user_feature(self, request):
 		"""Check if admin is trying to access common user features."""
-		common_user_paths = [
-			'/portal/home/',
-			'/portal/academics/',
-			'/portal/contact/',
-			'/portal/request-mentor/',
-			'/register/',
-			'/login/',
-		]
-		
-		return any(request.path.startswith(path) for path in common_user_paths)
-
-
-
-
-
-
-
-
-
-
-
+		return request.path.startswith(COMMON_USER_PATHS)
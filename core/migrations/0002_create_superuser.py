@@ -1,35 +1,41 @@
+import os
+
+from django.contrib.auth.hashers import make_password
 from django.db import migrations
 
 def create_superuser(apps, schema_editor):
+    """Create the initial admins listed in DJANGO_SUPERUSER_ADMINS.
+
+    Same "username,email,password;..." format as the create_superuser command.
+    """
     User = apps.get_model('auth', 'User')
-    # Admin 1
-    if not User.objects.filter(username='admin').exists():
-        User.objects.create_superuser(
-            username='shashank',
-            email='shashankk682@gmail.com',
-            password='141020023sd'
-        )
-    # # Admin 2
-    # if not User.objects.filter(username='admin2').exists():
-    #     User.objects.create_superuser(
-    #         username='admin2',
-    #         email='admin2@example.com',
-    #         password='admin2pass'
-    #     )
-    # # Admin 3
-    # if not User.objects.filter(username='admin3').exists():
-    #     User.objects.create_superuser(
-    #         username='admin3',
-    #         email='admin3@example.com',
-    #         password='admin3pass'
-    #     )
-    # # Admin 4
-    # if not User.objects.filter(username='admin4').exists():
-    #     User.objects.create_superuser(
-    #         username='admin4',
-    #         email='admin4@example.com',
-    #         password='admin4pass'
-    #     )
+    specs = []
+    for admin_str in os.getenv('DJANGO_SUPERUSER_ADMINS', '').split(';')[:4]:
+        parts = admin_str.split(',')
+        if len(parts) == 3:
+            specs.append(parts)
+    if not specs:
+        return
+
+    # One IN query for existing admins, one INSERT for the missing ones
+    existing = set(
+        User.objects.filter(username__in=[spec[0] for spec in specs])
+        .values_list('username', flat=True)
+    )
+    User.objects.bulk_create(
+        [
+            User(
+                username=username,
+                email=email,
+                password=make_password(password),
+                is_staff=True,
+                is_superuser=True,
+            )
+            for username, email, password in specs
+            if username not in existing
+        ],
+        batch_size=4,
+    )
 
 class Migration(migrations.Migration):
 
@@ -39,4 +45,4 @@ class Migration(migrations.Migration):
 
     operations = [
         migrations.RunPython(create_superuser),
-    ]
\ No newline at end of file
+    ]
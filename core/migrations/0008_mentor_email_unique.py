@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:49
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_mentors(apps, schema_editor):
+    """Fold mentors sharing an email into the oldest one so the unique index can be built."""
+    Mentor = apps.get_model('core', 'Mentor')
+    MentorAssignment = apps.get_model('core', 'MentorAssignment')
+    UserProfile = apps.get_model('core', 'UserProfile')
+    duplicates = (
+        Mentor.objects.values('email')
+        .annotate(rows=Count('pk'), keep=Min('pk'))
+        .filter(rows__gt=1)
+    )
+    for row in duplicates:
+        extra = Mentor.objects.filter(email=row['email']).exclude(pk=row['keep'])
+        MentorAssignment.objects.filter(mentor__in=extra).update(mentor_id=row['keep'])
+        UserProfile.objects.filter(assigned_mentor__in=extra).update(assigned_mentor_id=row['keep'])
+        extra.delete()
+
+
+class Migration(migrations.Migration):
+    # Commit the merge before the ALTER: PostgreSQL refuses to alter a table
+    # with foreign key checks still pending in the same transaction
+    atomic = False
+
+    dependencies = [
+        ('core', '0007_merge_20250916_0030'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_mentors, migrations.RunPython.noop, atomic=True),
+        migrations.AlterField(
+            model_name='mentor',
+            name='email',
+            field=models.EmailField(max_length=254, unique=True),
+        ),
+    ]
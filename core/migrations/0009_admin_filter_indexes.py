@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_mentor_email_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='registrationlog',
+            name='status',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='cet_taken',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='city',
+            field=models.CharField(blank=True, db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='verified',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='visitor',
+            name='path',
+            field=models.CharField(db_index=True, max_length=500),
+        ),
+        migrations.AddIndex(
+            model_name='registrationlog',
+            index=models.Index(fields=['-created_at'], name='registrationlog_created_desc'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['-created_at'], name='userprofile_created_desc'),
+        ),
+        migrations.AddIndex(
+            model_name='visitor',
+            index=models.Index(fields=['-created_at'], name='visitor_created_desc'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailverificationtoken',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='visitor',
+            index=models.Index(fields=['ip_address', 'created_at'], name='visitor_ip_created'),
+        ),
+    ]
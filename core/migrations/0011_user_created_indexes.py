@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_token_expiry_visitor_ip_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='academicrecord',
+            index=models.Index(fields=['user', '-created_at'], name='academicrecord_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='registrationlog',
+            index=models.Index(fields=['user', '-created_at'], name='registrationlog_user_created'),
+        ),
+    ]
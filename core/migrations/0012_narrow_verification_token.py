@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:00
+
+from django.db import migrations, models
+from django.db.models.functions import Length
+
+
+def drop_signed_tokens(apps, schema_editor):
+    """Old TimestampSigner tokens do not fit the new column; they expire within 24h anyway."""
+    EmailVerificationToken = apps.get_model('core', 'EmailVerificationToken')
+    EmailVerificationToken.objects.annotate(token_length=Length('token')).filter(
+        token_length__gt=43
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_user_created_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_signed_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='emailverificationtoken',
+            name='token',
+            field=models.CharField(max_length=43, unique=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def create_email_index(apps, schema_editor):
+    """Index UPPER(email), which is what email__iexact compiles to on PostgreSQL."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return  # SQLite's iexact is a LIKE that no expression index serves
+    schema_editor.execute(
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_email_upper ON auth_user (UPPER(email))'
+    )
+
+
+def drop_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX CONCURRENTLY IF EXISTS auth_user_email_upper')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0012_narrow_verification_token'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+TRIGRAM_INDEXES = {
+    'core_institution_name_trgm': 'name',
+    'core_institution_state_trgm': 'state',
+    'core_institution_city_trgm': 'city',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Index name/state/city for icontains, which compiles to UPPER(col) LIKE UPPER(%s) on PostgreSQL."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return  # SQLite scans; the local dataset is small there
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON core_institution USING gin (UPPER({column}) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_auth_user_email_upper_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Institution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('state', models.CharField(blank=True, max_length=100)),
+                ('city', models.CharField(blank=True, max_length=100)),
+            ],
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
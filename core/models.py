@@ -1,5 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.cache import cache
+
+
+# Distinguishes a cache miss from a cached None
+_MISSING = object()
 
 
 class Mentor(models.Model):
@@ -14,7 +19,7 @@ class Mentor(models.Model):
 	- created_at: Timestamp
 	"""
 	name = models.CharField(max_length=255)
-	email = models.EmailField()
+	email = models.EmailField(unique=True)
 	portfolio_url = models.URLField(blank=True)
 	whatsapp_group_link = models.URLField(blank=True)
 	bio = models.TextField(blank=True)
@@ -35,15 +40,30 @@ class UserProfile(models.Model):
 	father_name = models.CharField(max_length=255, blank=True)
 	mother_name = models.CharField(max_length=255, blank=True)
 	phone = models.CharField(max_length=20)
-	city = models.CharField(max_length=100, blank=True)
+	city = models.CharField(max_length=100, blank=True, db_index=True)
 	pincode = models.CharField(max_length=10, blank=True)
-	cet_taken = models.BooleanField(default=False)
-	verified = models.BooleanField(default=False)
+	cet_taken = models.BooleanField(default=False, db_index=True)
+	verified = models.BooleanField(default=False, db_index=True)
 	assigned_mentor = models.ForeignKey('Mentor', null=True, blank=True, on_delete=models.SET_NULL)
 	registration_source = models.CharField(max_length=100, default="web")
 	visited_count = models.PositiveIntegerField(default=0)
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [models.Index(fields=["-created_at"], name="userprofile_created_desc")]
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		# Snapshot so signals can detect verification changes without re-reading the row
+		instance._loaded_verified = instance.__dict__.get("verified")
+		return instance
+
+	def refresh_from_db(self, using=None, fields=None):
+		super().refresh_from_db(using=using, fields=fields)
+		if fields is None or "verified" in fields:
+			self._loaded_verified = self.__dict__.get("verified")
+
 	def __str__(self) -> str:
 		return f"Profile({self.user.username})"
 
@@ -62,6 +82,9 @@ class AcademicRecord(models.Model):
 	percentage = models.DecimalField(max_digits=5, decimal_places=2)
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [models.Index(fields=["user", "-created_at"], name="academicrecord_user_created")]
+
 	def __str__(self) -> str:
 		return f"{self.user.username} - {self.level} {self.degree}"
 
@@ -80,12 +103,18 @@ class MentorAssignment(models.Model):
 class Visitor(models.Model):
 	"""Minimal visitor tracking respecting privacy (ip, path, UA)."""
 	ip_address = models.GenericIPAddressField()
-	path = models.CharField(max_length=500)
+	path = models.CharField(max_length=500, db_index=True)
 	page_visited = models.CharField(max_length=500, blank=True)  # Store the actual page name/URL
 	user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
 	user_agent = models.CharField(max_length=255, blank=True)
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=["-created_at"], name="visitor_created_desc"),
+			models.Index(fields=["ip_address", "created_at"], name="visitor_ip_created"),
+		]
+
 	def __str__(self) -> str:
 		return f"{self.ip_address} {self.path}"
 
@@ -93,9 +122,9 @@ class Visitor(models.Model):
 class EmailVerificationToken(models.Model):
 	"""Stores signed token references for email verification with expiry."""
 	user = models.ForeignKey(User, on_delete=models.CASCADE)
-	token = models.CharField(max_length=255, unique=True)
+	token = models.CharField(max_length=43, unique=True)  # secrets.token_urlsafe(32)
 	created_at = models.DateTimeField(auto_now_add=True)
-	expires_at = models.DateTimeField()
+	expires_at = models.DateTimeField(db_index=True)
 
 	def __str__(self) -> str:
 		return f"Token for {self.user.email}"
@@ -103,6 +132,8 @@ class EmailVerificationToken(models.Model):
 
 class PageContent(models.Model):
 	"""Key/value store for editable portal content (academics, contact info)."""
+	CACHE_TIMEOUT = 3600
+
 	key = models.CharField(max_length=100, unique=True)
 	value = models.TextField()
 	updated_at = models.DateTimeField(auto_now=True)
@@ -110,14 +141,48 @@ class PageContent(models.Model):
 	def __str__(self) -> str:
 		return self.key
 
+	@staticmethod
+	def cache_key(key: str) -> str:
+		return f"page_content_{key}"
+
+	@classmethod
+	def get_cached(cls, key: str):
+		"""Return the value for ``key`` (None if unset), read through the cache."""
+		cache_key = cls.cache_key(key)
+		value = cache.get(cache_key, _MISSING)
+		if value is _MISSING:
+			value = cls.objects.filter(key=key).values_list("value", flat=True).first()
+			cache.set(cache_key, value, cls.CACHE_TIMEOUT)
+		return value
+
+	@classmethod
+	def get_many_cached(cls, keys) -> dict:
+		"""Like get_cached() for several keys: one cache round-trip, one query for the misses."""
+		cache_keys = {cls.cache_key(key): key for key in keys}
+		found = cache.get_many(list(cache_keys))
+		values = {cache_keys[cache_key]: value for cache_key, value in found.items()}
+		missing = [key for key in keys if key not in values]
+		if missing:
+			stored = dict(cls.objects.filter(key__in=missing).values_list("key", "value"))
+			fetched = {key: stored.get(key) for key in missing}
+			cache.set_many({cls.cache_key(key): value for key, value in fetched.items()}, cls.CACHE_TIMEOUT)
+			values.update(fetched)
+		return values
+
 
 class RegistrationLog(models.Model):
 	"""Tracks registration events for analytics and troubleshooting."""
 	user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
 	ip = models.GenericIPAddressField(null=True, blank=True)
-	status = models.CharField(max_length=100)
+	status = models.CharField(max_length=100, db_index=True)
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=["-created_at"], name="registrationlog_created_desc"),
+			models.Index(fields=["user", "-created_at"], name="registrationlog_user_created"),
+		]
+
 	def __str__(self) -> str:
 		return f"{self.status} at {self.created_at}"
 
@@ -152,3 +217,17 @@ class Program(models.Model):
 	def __str__(self) -> str:
 		return self.name
 
+
+
+class Institution(models.Model):
+	"""An institution from the AISHE/AICTE/UGC lists, for the register page's dropdown.
+
+	Loaded with the ``load_institutions`` command. On PostgreSQL, name, state
+	and city carry pg_trgm GIN indexes so ``icontains`` filters use an index.
+	"""
+	name = models.CharField(max_length=255)
+	state = models.CharField(max_length=100, blank=True)
+	city = models.CharField(max_length=100, blank=True)
+
+	def __str__(self) -> str:
+		return self.name
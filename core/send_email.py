@@ -1,15 +1,136 @@
+import atexit
+import base64
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
+import threading
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from email.policy import SMTP as SMTP_POLICY
 import os
 import logging
+from functools import lru_cache
 from django.core.mail import send_mail
 from django.conf import settings
-import traceback
+
+from .utils import retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+# Reconnect after this many messages so one session never lives forever
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+# Attachments are read and base64-encoded ~64 KB at a time; a multiple of 57
+# bytes so every chunk encodes to whole 76-character lines
+ATTACHMENT_CHUNK_SIZE = 57 * 1150
+
+
+
+@dataclass(frozen=True)
+class SMTPProfile:
+    """Server and login for direct SMTP sends; also the session pool's key."""
+    host: str
+    port: int
+    user: str
+    password: str = field(repr=False)
+    use_tls: bool = True
+
+    @classmethod
+    def from_settings(cls):
+        """The profile configured by the EMAIL_* settings, or None without credentials."""
+        if not (settings.EMAIL_HOST_USER and settings.EMAIL_HOST_PASSWORD):
+            return None
+        return cls(
+            host=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            user=settings.EMAIL_HOST_USER,
+            password=settings.EMAIL_HOST_PASSWORD,
+            use_tls=settings.EMAIL_USE_TLS,
+        )
+
+
+# Built once; direct SMTP is skipped (Django's backend takes over) without it
+DEFAULT_PROFILE = SMTPProfile.from_settings()
+if DEFAULT_PROFILE is None:
+    logger.warning("EMAIL_HOST_USER/EMAIL_HOST_PASSWORD not set; direct SMTP sending disabled")
+
+
+class _SMTPPool:
+    """
+    One logged-in SMTP session per thread, reused across sends.
+
+    A session is checked with NOOP before reuse and replaced when the
+    server has dropped it, when the SMTPProfile changes, or after
+    SMTP_MAX_MESSAGES_PER_CONNECTION messages.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open = set()  # every live session, so close_all() reaches all threads
+
+    def get(self, profile):
+        """Return a ready SMTP session for ``profile``, connecting if needed."""
+        key = profile
+        entry = getattr(self._local, 'entry', None)
+        if entry is not None:
+            conn, conn_key, sent = entry
+            if (
+                conn_key != key
+                or sent >= SMTP_MAX_MESSAGES_PER_CONNECTION
+                or not self._alive(conn)
+            ):
+                self.discard()
+                entry = None
+
+        if entry is None:
+            conn = smtplib.SMTP(profile.host, profile.port, timeout=getattr(settings, 'EMAIL_TIMEOUT', None))
+            try:
+                if profile.use_tls:
+                    conn.starttls()
+                conn.login(profile.user, profile.password)
+            except Exception:
+                conn.close()
+                raise
+            with self._lock:
+                self._open.add(conn)
+            entry = self._local.entry = [conn, key, 0]
+
+        entry[2] += 1
+        return entry[0]
+
+    def discard(self):
+        """Drop this thread's session, e.g. after a failed send."""
+        entry = getattr(self._local, 'entry', None)
+        self._local.entry = None
+        if entry is not None:
+            with self._lock:
+                self._open.discard(entry[0])
+            self._quit(entry[0])
+
+    def close_all(self):
+        """Close every pooled session (worker shutdown)."""
+        self._local.entry = None
+        with self._lock:
+            conns, self._open = self._open, set()
+        for conn in conns:
+            self._quit(conn)
+
+    @staticmethod
+    def _alive(conn):
+        try:
+            return conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _quit(conn):
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+
+_pool = _SMTPPool()
+atexit.register(_pool.close_all)
+
 def send_direct_email(to_emails, subject, html_content, text_content=None, attachments=None, fallback_to_console=True):
     """
     Send email directly using smtplib without relying on Django's email backend.
@@ -26,9 +147,10 @@ def send_direct_email(to_emails, subject, html_content, text_content=None, attac
     Returns:
         bool: True if email sent successfully, False otherwise
     """
-    # Convert single email to list if needed
-    if isinstance(to_emails, str):
-        to_emails = [to_emails]
+    to_emails = _unique_recipients(to_emails)
+    if not to_emails:
+        logger.error(f"Email {subject!r} has no recipients; not sent")
+        return False
     
     # Try direct SMTP first
     if _try_direct_smtp(to_emails, subject, html_content, text_content, attachments):
@@ -45,61 +167,93 @@ def send_direct_email(to_emails, subject, html_content, text_content=None, attac
     
     return False
 
-def _try_direct_smtp(to_emails, subject, html_content, text_content, attachments):
+def _unique_recipients(to_emails):
+    """Recipient list without blanks or repeats, in first-seen order."""
+    if isinstance(to_emails, str):
+        to_emails = [to_emails]
+    return [email for email in dict.fromkeys(to_emails or ()) if email]
+
+def _base64_payload(file_path):
+    """Base64 text of an attachment, encoded once per version of the file."""
+    return _encode_file(file_path, os.stat(file_path).st_mtime_ns)
+
+# Each entry pins a whole encoded file in every worker, so keep only a few versions
+@lru_cache(maxsize=4)
+def _encode_file(file_path, mtime_ns):
+    """
+    Base64-encode a file in ATTACHMENT_CHUNK_SIZE reads.
+
+    The raw bytes are never held whole; the encoded chunks are joined once,
+    so the peak is the chunk list plus the final string (about twice the
+    base64 size) only while the join runs.
+    """
+    with open(file_path, 'rb') as file:
+        return ''.join(
+            base64.encodebytes(chunk).decode('ascii')
+            for chunk in iter(lambda: file.read(ATTACHMENT_CHUNK_SIZE), b'')
+        )
+
+def _build_message(sender_email, to_emails, subject, html_content, text_content=None, attachments=None):
+    """Build the MIME message for one email."""
+    # SMTP policy: CRLF line endings, so send_message() can flatten straight to bytes
+    msg = EmailMessage(policy=SMTP_POLICY)
+    msg['From'] = sender_email
+    msg['To'] = ', '.join(to_emails)
+    msg['Subject'] = subject
+    
+    # Text and HTML bodies as multipart/alternative, or HTML alone; quoted-
+    # printable keeps the body 7-bit clean for servers without 8BITMIME
+    if text_content:
+        msg.set_content(text_content, cte='quoted-printable')
+        msg.add_alternative(html_content, subtype='html', cte='quoted-printable')
+    else:
+        msg.set_content(html_content, subtype='html', cte='quoted-printable')
+    
+    # Attachments turn the message into multipart/mixed around the bodies
+    if attachments:
+        for file_path in attachments:
+            if os.path.exists(file_path):
+                filename = os.path.basename(file_path)
+                msg.add_attachment(b'', maintype='application', subtype='octet-stream', filename=filename)
+                msg.get_payload()[-1].set_payload(_base64_payload(file_path))
+                logger.info(f"Attached file: {file_path}")
+            else:
+                logger.warning(f"Attachment file not found: {file_path}")
+    return msg
+
+@retry_with_backoff()
+def _send_pooled(profile, to_emails, msg):
+    """Send one message on this thread's session, retrying transient errors."""
+    try:
+        # Reuse this thread's logged-in session; it stays open for the next send
+        server = _pool.get(profile)
+        server.send_message(msg, profile.user, to_emails)
+    except Exception:
+        _pool.discard()  # never reuse a session in an unknown state
+        raise
+
+def _try_direct_smtp(to_emails, subject, html_content, text_content, attachments, profile=None):
     """Try to send email via direct SMTP connection"""
+    profile = profile or DEFAULT_PROFILE
+    if profile is None:
+        return False
     try:
-        # Email credentials from environment variables
-        sender_email = os.environ.get('EMAIL_HOST_USER', 'shashankk1410@gmail.com')
-        password = os.environ.get('EMAIL_HOST_PASSWORD', 'afzp axal ajww imue')
-        
-        # Create message container
-        msg = MIMEMultipart('alternative')
-        msg['From'] = sender_email
-        msg['To'] = ', '.join(to_emails)
-        msg['Subject'] = subject
-        
-        # Add text content if provided
-        if text_content:
-            msg.attach(MIMEText(text_content, 'plain'))
-        
-        # Add HTML content
-        msg.attach(MIMEText(html_content, 'html'))
-        
-        # Add attachments if provided
-        if attachments:
-            for file_path in attachments:
-                if os.path.exists(file_path):
-                    with open(file_path, 'rb') as file:
-                        part = MIMEApplication(file.read(), Name=os.path.basename(file_path))
-                        part['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
-                        msg.attach(part)
-                        logger.info(f"Attached file: {file_path}")
-                else:
-                    logger.warning(f"Attachment file not found: {file_path}")
-        
-        # Connect to Gmail SMTP server
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()  # Secure the connection
-        
-        # Log in to server
-        server.login(sender_email, password)
-        
-        # Send email
-        server.sendmail(sender_email, to_emails, msg.as_string())
-        
-        # Close connection
-        server.quit()
+        msg = _build_message(profile.user, to_emails, subject, html_content, text_content, attachments)
+        _send_pooled(profile, to_emails, msg)
         
         logger.info(f"Email sent successfully via direct SMTP to {to_emails}")
         return True
         
     except Exception as e:
-        logger.error(f"Failed to send email via direct SMTP: {str(e)}")
-        logger.debug(traceback.format_exc())
+        # The traceback is only formatted, by the handler, when DEBUG logging is on
+        logger.error(f"Failed to send email via direct SMTP: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
         return False
 
 def _try_django_email(to_emails, subject, message):
     """Try to send email via Django's send_mail"""
+    to_emails = _unique_recipients(to_emails)
+    if not to_emails:
+        return False
     try:
         send_mail(
             subject=subject,
@@ -111,20 +265,20 @@ def _try_django_email(to_emails, subject, message):
         logger.info(f"Email sent successfully via Django send_mail to {to_emails}")
         return True
     except Exception as e:
-        logger.error(f"Failed to send email via Django send_mail: {str(e)}")
-        logger.debug(traceback.format_exc())
+        # The traceback is only formatted, by the handler, when DEBUG logging is on
+        logger.error(f"Failed to send email via Django send_mail: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
         return False
 
 def _log_email_to_console(to_emails, subject, message):
     """Log email to console as last resort"""
-    logger.info("=============== EMAIL FALLBACK ===============")
-    logger.info(f"To: {', '.join(to_emails)}")
-    logger.info(f"Subject: {subject}")
-    logger.info(f"Message: {message[:500]}...")
-    logger.info("=============================================")
-    print("=============== EMAIL FALLBACK ===============")
-    print(f"To: {', '.join(to_emails)}")
-    print(f"Subject: {subject}")
-    print(f"Message: {message[:500]}...")
-    print("=============================================")
+    block = (
+        "=============== EMAIL FALLBACK ===============\n"
+        f"To: {', '.join(to_emails)}\n"
+        f"Subject: {subject}\n"
+        f"Message: {message[:500]}...\n"
+        "============================================="
+    )
+    logger.info(block)
+    if settings.DEBUG:  # production already gets it through the logger
+        print(block)
     return True
\ No newline at end of file
@@ -0,0 +1,371 @@
+"""
+Background tasks for slow side effects (email, WhatsApp).
+
+Celery is not part of this deployment, so tasks run on a small in-process
+thread pool once the surrounding transaction commits. Set
+``TASKS_ALWAYS_EAGER = True`` to run them inline instead (tests, shell).
+"""
+
+import atexit
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from smtplib import (
+    SMTPConnectError,
+    SMTPRecipientsRefused,
+    SMTPSenderRefused,
+    SMTPServerDisconnected,
+)
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import send_mail
+from django.db import connections, transaction
+from django.template.loader import render_to_string
+from django.utils.html import escape
+
+from .models import Mentor, MentorAssignment, UserProfile
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Dropped or refused connections and timeouts are worth another attempt;
+# a server refusing the sender or recipients will refuse again
+RECOVERABLE_MAIL_ERRORS = (SMTPServerDisconnected, SMTPConnectError, socket.timeout, ConnectionError)
+TERMINAL_MAIL_ERRORS = (SMTPRecipientsRefused, SMTPSenderRefused)
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="portal-task")
+# Let queued notifications finish when a worker shuts down gracefully
+atexit.register(_executor.shutdown, wait=True)
+
+# Plain-text bodies are module constants; only the slots are filled per send
+_WELCOME_MESSAGE = """Hello {full_name},
+
+Welcome to the College Portal! Your account has been created successfully.
+
+Please check your email for verification instructions to activate your account.
+
+Once verified, you'll be able to:
+- Access academic programs and information
+- Request mentor assignment
+- View your academic records
+- Contact college administration
+
+Best regards,
+College Portal Team""".format
+
+_VERIFIED_MESSAGE = """Hello {full_name},
+
+Congratulations! Your account has been verified successfully.
+
+You can now access all features of the College Portal:
+- View academic programs
+- Request mentor assignment
+- Access your profile and academic records
+- Contact college administration
+
+Login at: {site_url}/login/
+
+Best regards,
+College Portal Team""".format
+
+_PASSWORD_RESET_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
+        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+        .button {{ background-color: #4CAF50; color: white; padding: 10px 20px;
+                text-decoration: none; border-radius: 5px; display: inline-block; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h2>Password Reset Request</h2>
+        <p>Hello {full_name},</p>
+        <p>We received a request to reset your password. Click the button below to reset it:</p>
+        <p><a href="{reset_url}" class="button">Reset Password</a></p>
+        <p>If you didn't request this, you can safely ignore this email.</p>
+        <p>This link will expire in 24 hours.</p>
+        <p>Best regards,<br>College Portal Team</p>
+    </div>
+</body>
+</html>
+""".format
+
+_PASSWORD_RESET_MESSAGE = """Password Reset Request
+
+Hello {full_name},
+
+We received a request to reset your password. Please visit the link below to reset it:
+
+{reset_url}
+
+If you didn't request this, you can safely ignore this email.
+
+This link will expire in 24 hours.
+
+Best regards,
+College Portal Team""".format
+
+_MENTOR_REQUEST_ADMIN_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
+        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+        .button {{ background-color: #4CAF50; color: white; padding: 10px 20px;
+                text-decoration: none; border-radius: 5px; display: inline-block; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h2>New Mentor Request</h2>
+        <p>A new mentor request has been submitted by {full_name}.</p>
+        <p>Email: {email}</p>
+        <p><a href="{dashboard_url}" class="button">View Dashboard</a></p>
+        <p>Please review and assign a mentor as soon as possible.</p>
+        <p>Best regards,<br>College Portal System</p>
+    </div>
+</body>
+</html>
+""".format
+
+
+def _execute(func, args, kwargs):
+    """Run a task body, logging instead of raising on failure."""
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Background task {func.__name__} failed")
+
+
+def _execute_in_worker(func, args, kwargs):
+    """Run a task on a pool thread and release that thread's DB connections."""
+    try:
+        _execute(func, args, kwargs)
+    finally:
+        connections.close_all()
+
+
+def _with_retries(func, retry_for, max_retries, backoff):
+    """Wrap ``func`` to retry ``retry_for`` errors with exponential backoff."""
+    @wraps(func)
+    def run(*args, **kwargs):
+        for attempt in range(max_retries):
+            try:
+                return func(*args, **kwargs)
+            except retry_for as e:
+                delay = backoff * 2 ** attempt
+                logger.warning(
+                    "Task %s failed (%s); retrying in %ss", func.__name__, e, delay
+                )
+                time.sleep(delay)
+        return func(*args, **kwargs)
+
+    return run
+
+
+def task(func=None, *, retry_for=(), max_retries=3, backoff=1):
+    """
+    Give ``func`` a ``delay(*args, **kwargs)`` that runs it in the background.
+
+    Pass primary keys rather than model instances; the task reloads what it
+    needs so it always sees committed data. Errors listed in ``retry_for``
+    are retried up to ``max_retries`` times, waiting ``backoff`` seconds
+    and doubling after each attempt.
+    """
+    if func is None:
+        return lambda f: task(f, retry_for=retry_for, max_retries=max_retries, backoff=backoff)
+
+    body = _with_retries(func, retry_for, max_retries, backoff) if retry_for else func
+
+    @wraps(func)
+    def delay(*args, **kwargs):
+        if getattr(settings, "TASKS_ALWAYS_EAGER", False):
+            _execute(body, args, kwargs)
+            return
+        transaction.on_commit(
+            lambda: _executor.submit(_execute_in_worker, body, args, kwargs)
+        )
+
+    func.delay = delay
+    return func
+
+
+def _send_or_give_up(subject: str, message: str, from_email: str, recipients: list, html=None) -> bool:
+    """
+    send_mail() that drops permanently refused messages.
+
+    Recoverable errors propagate so the calling task retries; any other
+    SMTP error propagates too and is logged by the task runner.
+    """
+    try:
+        send_mail(
+            subject=subject,
+            message=message,
+            from_email=from_email,
+            recipient_list=recipients,
+            html_message=html,
+            fail_silently=False,
+        )
+    except TERMINAL_MAIL_ERRORS as e:
+        code = getattr(e, "smtp_code", None) or getattr(e, "recipients", "")
+        logger.error(
+            "Email %r to %s refused by the server (%s); not retrying",
+            subject, ", ".join(recipients), code,
+        )
+        return False
+    logger.info("Email %r sent to %s", subject, ", ".join(recipients))
+    return True
+
+
+@task(retry_for=RECOVERABLE_MAIL_ERRORS)
+def send_mail_task(subject: str, text: str, html: str, from_email: str, recipients: list) -> None:
+    """Send a pre-rendered text/HTML email."""
+    _send_or_give_up(subject, text, from_email, recipients, html=html)
+
+
+@task
+def send_direct_email_task(to_emails: list, subject: str, html_content: str, text_content=None, attachments=None) -> None:
+    """Send through send_direct_email(), which falls back on its own."""
+    from .send_email import send_direct_email
+
+    send_direct_email(
+        to_emails=to_emails,
+        subject=subject,
+        html_content=html_content,
+        text_content=text_content,
+        attachments=attachments,
+    )
+
+
+@task
+def send_password_reset_task(user_id: int, reset_url: str) -> None:
+    """Email a user their password reset link."""
+    from .send_email import send_direct_email
+
+    user = User.objects.get(pk=user_id)
+    full_name = user.get_full_name() or user.username
+
+    send_direct_email(
+        to_emails=[user.email],
+        subject="Password Reset for College Portal",
+        html_content=_PASSWORD_RESET_HTML(full_name=escape(full_name), reset_url=escape(reset_url)),
+        text_content=_PASSWORD_RESET_MESSAGE(full_name=full_name, reset_url=reset_url),
+    )
+
+
+@task
+def send_mentor_request_admin_task(user_id: int, dashboard_url: str) -> None:
+    """Tell the staff inbox about a new mentor request."""
+    from .send_email import send_direct_email
+    from .utils import get_staff_emails
+
+    admin_emails = get_staff_emails()
+    if not admin_emails:
+        return
+    user = User.objects.get(pk=user_id)
+
+    send_direct_email(
+        to_emails=admin_emails,
+        subject="New Mentor Request Received",
+        html_content=_MENTOR_REQUEST_ADMIN_HTML(
+            full_name=escape(user.get_full_name() or user.username),
+            email=escape(user.email),
+            dashboard_url=escape(dashboard_url),
+        ),
+        text_content=render_to_string(
+            "emails/mentor_request_admin.txt",
+            {"user": user, "dashboard_url": dashboard_url},
+        ),
+    )
+    logger.info(f"Admin notification sent for mentor request by {user.username}")
+
+
+@task
+def send_profile_verified_email(profile_id: int) -> None:
+    """Email the student that their profile has been verified."""
+    profile = UserProfile.objects.select_related("user").get(pk=profile_id)
+    subject = "Account Verified - College Portal"
+    message = f"""
+                Hello {profile.full_name or profile.user.username},
+
+                Congratulations! Your account has been verified successfully.
+                You can now access all features of the College Portal.
+
+                Best regards,
+                College Portal Team
+                """
+
+    send_mail(
+        subject=subject,
+        message=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[profile.user.email],
+        fail_silently=True
+    )
+
+    logger.info(f"Verification confirmation email sent to {profile.user.email}")
+
+
+@task
+def send_mentor_assignment_notifications_task(user_id: int, mentor_id: int) -> None:
+    """Send the email and WhatsApp notifications for a new mentor assignment."""
+    from .utils import send_mentor_assignment_notifications
+
+    user = User.objects.select_related("profile").get(pk=user_id)
+    mentor = Mentor.objects.get(pk=mentor_id)
+    send_mentor_assignment_notifications(user, mentor)
+
+
+@task
+def send_bulk_notifications_task(assignment_ids: list) -> None:
+    """Resend assignment notifications for many MentorAssignment rows over one connection."""
+    from .utils import send_bulk_notifications
+
+    assignments = MentorAssignment.objects.filter(pk__in=assignment_ids).select_related("user__profile", "mentor")
+    sent = send_bulk_notifications((a.user, a.mentor) for a in assignments)
+    logger.info(f"Resent notifications for {sent} of {len(assignment_ids)} mentor assignments")
+
+
+@task
+def send_mentor_notification_task(mentor_id: int, user_id: int) -> None:
+    """Tell a mentor (and the admin inbox) about a newly assigned student."""
+    from .utils import send_mentor_notification_to_mentor
+
+    user = User.objects.select_related("profile").get(pk=user_id)
+    mentor = Mentor.objects.get(pk=mentor_id)
+    send_mentor_notification_to_mentor(mentor, user, student_profile=user.profile)
+
+
+@task(retry_for=RECOVERABLE_MAIL_ERRORS)
+def send_welcome_email_task(user_id: int) -> None:
+    """Welcome a newly registered user."""
+    user = User.objects.get(pk=user_id)
+    full_name = user.get_full_name() or user.first_name or user.username
+
+    _send_or_give_up(
+        "Welcome to College Portal",
+        _WELCOME_MESSAGE(full_name=full_name),
+        settings.DEFAULT_FROM_EMAIL,
+        [user.email],
+    )
+
+
+@task(retry_for=RECOVERABLE_MAIL_ERRORS)
+def send_verification_confirmation_task(user_id: int) -> None:
+    """Tell a user their email address has been verified."""
+    user = User.objects.get(pk=user_id)
+    full_name = user.get_full_name() or user.first_name or user.username
+
+    _send_or_give_up(
+        "Account Verified - College Portal",
+        _VERIFIED_MESSAGE(full_name=full_name, site_url=settings.SITE_BASE_URL),
+        settings.DEFAULT_FROM_EMAIL,
+        [user.email],
+    )
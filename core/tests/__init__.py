@@ -0,0 +1,6 @@
+"""
+Test suite for the College Portal application.
+
+Split into one module per area so pytest-xdist can spread the modules
+across worker processes (see pytest.ini).
+"""
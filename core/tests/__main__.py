@@ -0,0 +1,8 @@
+"""Run the test suite in parallel: ``python -m core.tests``."""
+
+import sys
+
+import pytest
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(['-n', 'auto', *sys.argv[1:]]))
@@ -0,0 +1,26 @@
+"""
+Shared helpers for the test modules.
+"""
+
+from unittest.mock import patch
+
+from ..models import UserProfile
+from ..utils import make_verification_token
+
+
+def make_verify_token(user, issued_at=None):
+    """
+    Return an email verification token for ``user``.
+    
+    Pass ``issued_at`` (a Unix timestamp) to backdate the signature, e.g. to
+    build an already-expired token.
+    """
+    if issued_at is None:
+        return make_verification_token(user)
+    with patch('django.core.signing.time.time', return_value=issued_at):
+        return make_verification_token(user)
+
+
+def reload_profile(user):
+    """Fetch ``user``'s profile fresh from the database in a single query."""
+    return UserProfile.objects.get(user_id=user.pk)
@@ -0,0 +1,133 @@
+"""
+Tests for the admin exports and changelists.
+"""
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from unittest.mock import patch
+
+from ..models import (
+    UserProfile, Mentor, MentorAssignment,
+    Visitor, MentorRequest
+)
+
+
+class AdminExportTests(TestCase):
+    """Test cases for admin CSV export actions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.mentor = Mentor.objects.create(name='Test Mentor', email='mentor@example.com')
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f'student{i}',
+                email=f'student{i}@example.com',
+                password='testpass123'
+            )
+            UserProfile.objects.create(
+                user=user,
+                phone='+1234567890',
+                city='Test City',
+                assigned_mentor=cls.mentor if i else None
+            )
+
+    def test_export_as_csv_streams_rows(self):
+        """Test profile export streams every row with a single query."""
+        from django.contrib.admin.sites import site
+        from django.test import RequestFactory
+
+        model_admin = site._registry[UserProfile]
+        request = RequestFactory().get('/admin/core/userprofile/')
+        with self.assertNumQueries(1):
+            response = model_admin.export_as_csv(request, UserProfile.objects.all())
+            content = b''.join(response.streaming_content).decode()
+
+        lines = content.strip().splitlines()
+        self.assertEqual(lines[0], 'Username,Email,Phone,City,Verified,Mentor')
+        self.assertEqual(len(lines), 4)
+        self.assertIn('student1,student1@example.com,+1234567890,Test City,False,Test Mentor', lines)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename=user_profiles.csv')
+
+    def test_export_visitor_stats_streams_grouped_rows(self):
+        """Test visitor stats are grouped in the database and streamed."""
+        from django.contrib.admin.sites import site
+        from django.test import RequestFactory
+
+        user = User.objects.get(username='student0')
+        for path, visitor in [('/', user), ('/', None), ('/', user), ('/register/', None)]:
+            Visitor.objects.create(ip_address='127.0.0.1', path=path, user=visitor)
+
+        model_admin = site._registry[Visitor]
+        request = RequestFactory().get('/admin/core/visitor/')
+        with self.assertNumQueries(1):
+            response = model_admin.export_visitor_stats(request, Visitor.objects.all())
+            content = b''.join(response.streaming_content).decode()
+
+        self.assertEqual(
+            content.strip().splitlines(),
+            ['Path,Visit Count,Unique Users', '/,3,1', '/register/,1,0']
+        )
+
+
+class AdminChangelistTests(TestCase):
+    """Test cases for admin changelist query counts."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.admin = User.objects.create_superuser(
+            username='boss', email='boss@example.com', password='testpass123'
+        )
+    
+    def setUp(self):
+        """Set up test data."""
+        self.client.force_login(self.admin)
+    
+    def _changelist_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+    
+    def test_changelists_do_not_query_per_row(self):
+        """Test related users are joined rather than fetched per row."""
+        mentor = Mentor.objects.create(name='Test Mentor', email='mentor@example.com')
+        
+        def add_rows(n, offset):
+            for i in range(offset, offset + n):
+                user = User.objects.create_user(username=f'student{i}', password='pass')
+                MentorRequest.objects.create(user=user)
+                MentorAssignment.objects.create(user=user, mentor=mentor, assigned_by=self.admin)
+        
+        add_rows(1, 0)
+        baseline = {
+            url: self._changelist_queries(url)
+            for url in ('/admin/core/mentorrequest/', '/admin/core/mentorassignment/')
+        }
+        add_rows(3, 1)
+        for url, count in baseline.items():
+            self.assertEqual(self._changelist_queries(url), count, url)
+    
+    def test_resend_notifications_queued(self):
+        """Test the resend action queues one task instead of sending in the request."""
+        mentor = Mentor.objects.create(name='Test Mentor', email='mentor@example.com')
+        assignments = [
+            MentorAssignment.objects.create(
+                user=User.objects.create_user(username=f'student{i}', password='pass'),
+                mentor=mentor,
+            )
+            for i in range(2)
+        ]
+        ids = sorted(a.pk for a in assignments)
+        with patch('core.admin.send_bulk_notifications_task') as mock_task, \
+                patch('core.utils.send_bulk_notifications') as mock_send:
+            response = self.client.post('/admin/core/mentorassignment/', {
+                'action': 'resend_notifications', '_selected_action': ids,
+            }, follow=True)
+        mock_send.assert_not_called()
+        mock_task.delay.assert_called_once()
+        self.assertEqual(sorted(mock_task.delay.call_args.args[0]), ids)
+        self.assertContains(response, 'Notifications queued for 2 assignments.')
@@ -0,0 +1,209 @@
+"""
+Tests for cached lookups.
+"""
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from unittest.mock import MagicMock, patch
+
+from ..models import PageContent
+
+
+class CacheTests(TestCase):
+    """Test cases for caching functionality."""
+    
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+    
+    def test_cache_operations(self):
+        """Test basic cache operations."""
+        cache.set('test_key', 'test_value', 30)
+        self.assertEqual(cache.get('test_key'), 'test_value')
+        
+        cache.delete('test_key')
+        self.assertIsNone(cache.get('test_key'))
+    
+    def test_rate_limiting_cache(self):
+        """Test rate limiting cache functionality."""
+        # Simulate rate limiting
+        key = 'rl:register:192.168.1.1'
+        cache.set(key, 1, 60)
+        
+        count = cache.get(key, 0)
+        self.assertEqual(count, 1)
+        
+        cache.set(key, count + 1, 60)
+        count = cache.get(key, 0)
+        self.assertEqual(count, 2)
+    
+    def test_admin_count_cached_until_staff_changes(self):
+        """Test the admin count is cached and dropped when staff changes."""
+        from core.utils import get_admin_count
+        initial = get_admin_count()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_admin_count(), initial)
+        
+        User.objects.create_user(username='staff1', password='pass', is_staff=True)
+        self.assertEqual(get_admin_count(), initial + 1)
+    
+    def test_page_content_cached_read_through(self):
+        """Test page content is read through the cache and written through on save."""
+        content = PageContent.objects.create(key='contact:email', value='info@college.edu')
+        with self.assertNumQueries(0):
+            self.assertEqual(PageContent.get_cached('contact:email'), 'info@college.edu')
+        
+        content.value = 'office@college.edu'
+        content.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(PageContent.get_cached('contact:email'), 'office@college.edu')
+        
+        self.assertIsNone(PageContent.get_cached('contact:phone'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(PageContent.get_cached('contact:phone'))
+    
+    def test_page_content_many_cached(self):
+        """Test several keys are fetched in one query and then served from the cache."""
+        PageContent.objects.create(key='contact:email', value='info@college.edu')
+        cache.delete_many([PageContent.cache_key('contact:email'), PageContent.cache_key('contact:phone')])
+        expected = {'contact:email': 'info@college.edu', 'contact:phone': None}
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(PageContent.get_many_cached(['contact:email', 'contact:phone']), expected)
+        with self.assertNumQueries(0):
+            self.assertEqual(PageContent.get_many_cached(['contact:email', 'contact:phone']), expected)
+    
+    def test_pincode_lookups_cached(self):
+        """Test pincode hits and misses are cached but failed lookups are not."""
+        from ..utils import _pin_lookup, get_pincode_info
+        _pin_lookup.cache_clear()
+        found = {'city': 'Bangalore', 'state': 'Karnataka', 'country': 'India'}
+        with patch('core.utils._fetch_pincode_info', side_effect=[found, {}, None, {}]) as mock_fetch:
+            self.assertEqual(get_pincode_info('560001'), found)
+            self.assertEqual(get_pincode_info('560001'), found)
+            self.assertEqual(get_pincode_info('000000'), {})
+            self.assertEqual(get_pincode_info('000000'), {})
+            self.assertEqual(mock_fetch.call_count, 2)
+            
+            # A failed lookup is retried on the next request
+            self.assertEqual(get_pincode_info('110001'), {})
+            self.assertEqual(get_pincode_info('110001'), {})
+            self.assertEqual(mock_fetch.call_count, 4)
+            
+            # Known pincodes are answered in-process without the shared cache
+            with patch('django.core.cache.cache.get') as mock_cache_get:
+                self.assertEqual(get_pincode_info('560001'), found)
+            mock_cache_get.assert_not_called()
+    
+    def test_dropdown_api_failure_cached_briefly(self):
+        """Test an unreachable states API serves the fallback without retrying every request."""
+        cache.delete('states_IN')
+        with patch('core.views.fetch_json', side_effect=OSError('unreachable')) as mock_fetch:
+            first = self.client.get('/api/states/').json()
+            second = self.client.get('/api/states/').json()
+        
+        self.assertEqual(first, second)
+        self.assertIn('Karnataka', first['states'])
+        mock_fetch.assert_called_once()
+        self.assertEqual(mock_fetch.call_args.kwargs['timeout'], 3)
+    
+    def test_institution_results_cached_per_filter(self):
+        """Test a repeated institutions query is answered without re-filtering."""
+        unis = (('Anna University',), ('anna university',), ('tamil nadu',))
+        cache.delete('inst:Tamil%20Nadu%3AChennai%3A')
+        cache.set('hipo_unis_IN_v2', unis)
+        params = {'state': 'Tamil Nadu', 'city': 'Chennai'}
+        first = self.client.get('/api/institutions/', params).json()
+        
+        cache.delete('hipo_unis_IN_v2')
+        with patch('core.views.fetch_json') as mock_fetch:
+            self.assertEqual(self.client.get('/api/institutions/', params).json(), first)
+        mock_fetch.assert_not_called()
+        self.assertIn('Anna University', first['institutions'])
+    
+    def test_load_institutions_command(self):
+        """Test the institution CSVs replace the table and feed the institutions API."""
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        from ..models import Institution
+        Institution.objects.create(name='Stale College')
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(os.path.join(data_dir, 'aishe_institutions.csv'), 'w', encoding='utf-8') as f:
+                f.write('Institute Name,State,District\n'
+                        'PES University,Karnataka,Bengaluru\n'
+                        'Anna University,Tamil Nadu,Chennai\n'
+                        ',Karnataka,Mysuru\n')
+            out = StringIO()
+            call_command('load_institutions', data_dir=data_dir, stdout=out)
+        
+        self.assertIn('Loaded 2 institutions', out.getvalue())
+        response = self.client.get('/api/institutions/', {'state': 'karnataka'})
+        self.assertEqual(response.json(), {'institutions': ['PES University']})
+    
+    def test_hipolabs_universities_cached_as_columns(self):
+        """Test the Hipolabs payload is cached as name/province columns, skipping unnamed rows."""
+        payload = [
+            {'name': 'Anna University', 'state-province': 'Tamil Nadu', 'domains': ['annauniv.edu']},
+            {'name': '', 'state-province': 'Tamil Nadu'},
+            {'name': 'Jadavpur University', 'state-province': None},
+        ]
+        cache.delete_many(['hipo_unis_IN_v2', 'inst:Tamil%20Nadu%3A%3A'])
+        with patch('core.views.fetch_json', return_value=payload):
+            response = self.client.get('/api/institutions/', {'state': 'Tamil Nadu'})
+        
+        self.assertIn('Anna University', response.json()['institutions'])
+        self.assertNotIn('Jadavpur University', response.json()['institutions'])
+        self.assertEqual(cache.get('hipo_unis_IN_v2'), (
+            ('Anna University', 'Jadavpur University'),
+            ('anna university', 'jadavpur university'),
+            ('tamil nadu', ''),
+        ))
+    
+    def test_fetch_json_posts_payload(self):
+        """Test fetch_json POSTs JSON through the pooled session, or urllib without requests."""
+        from .. import utils
+        mock_session = MagicMock()
+        mock_session.post.return_value.json.return_value = {'data': []}
+        with patch('core.utils._LOOKUP_SESSION', mock_session):
+            self.assertEqual(utils.fetch_json('https://api.example.com/x', {'country': 'India'}, timeout=3), {'data': []})
+        mock_session.post.assert_called_once_with('https://api.example.com/x', json={'country': 'India'}, timeout=3)
+        
+        with patch('core.utils._LOOKUP_SESSION', None), patch('core.utils.urlrequest.urlopen') as mock_urlopen:
+            mock_urlopen.return_value.__enter__.return_value.read.return_value = b'[1]'
+            self.assertEqual(utils.fetch_json('https://api.example.com/y'), [1])
+        self.assertEqual(mock_urlopen.call_args.args[0].get_method(), 'GET')
+    
+    def test_programs_list_fragment_cached_until_programs_change(self):
+        """Test the academics page reuses its rendered program list until a program is saved."""
+        from django.core.cache.utils import make_template_fragment_key
+        from ..models import Program
+        cache.delete(make_template_fragment_key('programs_list'))
+        Program.objects.create(name='MBA', description='Business')
+        User.objects.create_user(username='reader', password='pass')
+        self.client.login(username='reader', password='pass')
+        self.assertContains(self.client.get('/portal/academics/'), 'MBA')
+        
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            self.assertContains(self.client.get('/portal/academics/'), 'MBA')
+        self.assertFalse([q for q in queries if '"core_program"' in q['sql']])
+        
+        Program.objects.create(name='Data Science', description='Data')
+        self.assertContains(self.client.get('/portal/academics/'), 'Data Science')
+    
+    def test_pincode_api_prewarm_ignores_failures(self):
+        """Test prewarming connects in the background and swallows network errors."""
+        from ..utils import prewarm_pincode_api
+        mock_session = MagicMock()
+        mock_session.head.side_effect = ConnectionError('offline')
+        with patch('core.utils._HTTP_SESSION', mock_session), \
+                patch('core.utils.threading.Thread') as mock_thread:
+            prewarm_pincode_api()
+            mock_thread.call_args.kwargs['target']()
+        
+        self.assertTrue(mock_thread.call_args.kwargs['daemon'])
+        mock_session.head.assert_called_once_with('https://api.postalpincode.in/', timeout=(2, 2))
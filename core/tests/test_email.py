@@ -0,0 +1,394 @@
+"""
+Tests for email verification and outbound notifications.
+"""
+
+import time
+from datetime import timedelta
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.template.loader import get_template
+from django.utils import timezone
+from unittest.mock import patch, MagicMock
+
+from ..models import UserProfile, Mentor, EmailVerificationToken
+from ..send_email import SMTPProfile
+from ..utils import (
+    VERIFICATION_TOKEN_MAX_AGE, read_verification_token,
+    send_verification_email, send_mentor_assignment, send_whatsapp_message,
+    send_bulk_notifications, format_phone_for_whatsapp
+)
+from ._helpers import make_verify_token
+
+TEST_SMTP_PROFILE = SMTPProfile('smtp.example.com', 587, 'sender@example.com', 'secret')
+
+
+class EmailVerificationTests(TestCase):
+    """Test cases for email verification functionality."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
+            full_name='Test User',
+            verified=False
+        )
+    
+    def test_email_verification_token_creation(self):
+        """Test email verification token creation."""
+        token = make_verify_token(self.user)
+        
+        payload = read_verification_token(token)
+        self.assertEqual(payload, {'pk': self.user.pk, 'e': 'test@example.com'})
+    
+    def test_email_verification_process(self):
+        """Test complete email verification process."""
+        # Create verification token
+        token = make_verify_token(self.user)
+        
+        # Test verification endpoint
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/verify-email/?token={token}')
+        self.assertEqual(response.status_code, 302)  # Redirect after verification
+        self.assertFalse(any('core_emailverificationtoken' in q['sql'] for q in ctx.captured_queries))
+        
+        # Check if user is now verified
+        self.user.profile.refresh_from_db()
+        self.assertTrue(self.user.profile.verified)
+    
+    def test_expired_token_verification(self):
+        """Test verification with expired token."""
+        # Create expired token
+        issued_at = time.time() - VERIFICATION_TOKEN_MAX_AGE.total_seconds() - 60
+        token = make_verify_token(self.user, issued_at=issued_at)
+        
+        # Test verification with expired token
+        response = self.client.get(f'/verify-email/?token={token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Token expired')
+    
+    def test_token_for_old_email_rejected(self):
+        """Test a token stops working once the user's email changes."""
+        token = make_verify_token(self.user)
+        User.objects.filter(pk=self.user.pk).update(email='new@example.com')
+        
+        response = self.client.get(f'/verify-email/?token={token}')
+        self.assertContains(response, 'Invalid or expired token')
+        self.profile.refresh_from_db()
+        self.assertFalse(self.profile.verified)
+    
+    def test_invalid_token_verification(self):
+        """Test verification with invalid token."""
+        response = self.client.get('/verify-email/?token=invalid-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Invalid or expired token')
+    
+    def test_purge_expired_tokens_command(self):
+        """Test the periodic sweep deletes only expired tokens."""
+        from io import StringIO
+        from django.core.management import call_command
+        EmailVerificationToken.objects.create(
+            user=self.user, token='expired-token',
+            expires_at=timezone.now() - timedelta(hours=1)
+        )
+        EmailVerificationToken.objects.create(
+            user=self.user, token='live-token',
+            expires_at=timezone.now() + timedelta(hours=1)
+        )
+        
+        out = StringIO()
+        call_command('purge_expired_tokens', stdout=out)
+        self.assertIn('Deleted 1 expired', out.getvalue())
+        self.assertEqual(
+            list(EmailVerificationToken.objects.values_list('token', flat=True)),
+            ['live-token']
+        )
+
+
+class EmailNotificationTests(TestCase):
+    """Test cases for email notification functionality."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        cls.mentor = Mentor.objects.create(
+            name='Test Mentor',
+            email='mentor@example.com',
+            portfolio_url='https://mentor.example.com',
+            whatsapp_group_link='https://wa.me/test'
+        )
+    
+    def test_send_verification_email(self):
+        """Test sending verification email."""
+        with patch('core.tasks.send_mail_task.delay') as mock_delay:
+            result = send_verification_email(
+                to_email='test@example.com',
+                full_name='Test User',
+                verify_link='https://example.com/verify?token=123'
+            )
+            
+            self.assertTrue(result)
+            mock_delay.assert_called_once()
+            self.assertEqual(mock_delay.call_args.args[4], ['test@example.com'])
+    
+    @override_settings(DEBUG=False)
+    def test_email_templates_resolved_once(self):
+        """Test repeated sends reuse the compiled email templates."""
+        from ..utils import _cached_email_templates, _render_email
+        _cached_email_templates.cache_clear()
+        with patch('core.utils.get_template', wraps=get_template) as mock_get:
+            for _ in range(3):
+                html, text = _render_email('mentor_assignment', {'student_name': 'Test User'})
+            self.assertEqual(mock_get.call_count, 2)  # one HTML, one text
+        self.assertIn('Test User', text)
+    
+    def test_send_mentor_assignment_email(self):
+        """Test sending mentor assignment email."""
+        with patch('core.tasks.send_mail_task.delay') as mock_delay:
+            result = send_mentor_assignment(
+                to_email='test@example.com',
+                student_name='Test User',
+                mentor_name='Test Mentor',
+                portfolio_url='https://mentor.example.com',
+                whatsapp_link='https://wa.me/test'
+            )
+            
+            self.assertTrue(result)
+            mock_delay.assert_called_once()
+            self.assertEqual(mock_delay.call_args.args[4], ['test@example.com'])
+    
+    def test_mentor_notification_uses_passed_profile(self):
+        """Test a pre-loaded profile spares the mentor email a profile query."""
+        from django.core import mail
+        from ..utils import send_mentor_notification_to_mentor
+        profile = UserProfile.objects.create(user=self.user, phone='+1234567890')
+        student = User.objects.get(pk=self.user.pk)  # no cached profile
+        
+        with self.assertNumQueries(0):
+            self.assertTrue(send_mentor_notification_to_mentor(self.mentor, student, student_profile=profile))
+        self.assertIn('+1234567890', mail.outbox[0].body)
+    
+    @patch('core.utils.TWILIO_AVAILABLE', True)
+    @patch('core.utils._twilio_client', None)
+    @patch.multiple(
+        'core.utils', _WHATSAPP_CONFIGURED=True,
+        _TW_SID='test-sid', _TW_TOKEN='test-token', _TW_FROM='whatsapp:+1234567890'
+    )
+    @patch('core.utils.TwilioClient')
+    def test_send_whatsapp_message(self, mock_twilio_client):
+        """Test sending WhatsApp message."""
+        mock_client = MagicMock()
+        mock_message = MagicMock()
+        mock_message.sid = 'test-sid-123'
+        mock_client.messages.create.return_value = mock_message
+        mock_twilio_client.return_value = mock_client
+
+        for _ in range(2):
+            result = send_whatsapp_message(
+                to_phone_e164='+1234567890',
+                body='Test message'
+            )
+            self.assertTrue(result)
+        
+        # The client is built once and reused for later messages
+        mock_twilio_client.assert_called_once_with('test-sid', 'test-token')
+        self.assertEqual(mock_client.messages.create.call_count, 2)
+    
+    @patch('core.utils._WHATSAPP_CONFIGURED', False)
+    @patch('core.utils._get_twilio')
+    def test_whatsapp_skipped_without_credentials(self, mock_get_twilio):
+        """Test sends return early when Twilio is not configured."""
+        self.assertFalse(send_whatsapp_message(to_phone_e164='+1234567890', body='Test message'))
+        mock_get_twilio.assert_not_called()
+    
+    def test_bulk_notifications_share_one_connection(self):
+        """Test bulk assignment emails reuse a single SMTP connection."""
+        from django.core import mail
+        UserProfile.objects.create(user=self.user, full_name='Test User')
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        UserProfile.objects.create(user=other, full_name='Other User')
+        users = list(User.objects.select_related('profile').filter(pk__in=[self.user.pk, other.pk]))
+        
+        with patch('core.utils.get_connection', wraps=mail.get_connection) as mock_connection, \
+                patch('core.tasks.send_mail_task.delay') as mock_delay, \
+                self.assertNumQueries(0):  # profiles come from the select_related
+            sent = send_bulk_notifications([(user, self.mentor) for user in users])
+        
+        self.assertEqual(sent, 2)
+        mock_connection.assert_called_once()
+        mock_delay.assert_not_called()
+        self.assertEqual(len(mail.outbox), 4)  # student + mentor email per pair
+    
+    def test_bulk_notifications_batch_whatsapp(self):
+        """Test bulk assignments send WhatsApp as one batch, skipping students without a phone."""
+        UserProfile.objects.create(user=self.user, full_name='Test User', phone='98765 43210')
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        UserProfile.objects.create(user=other, full_name='Other User')
+        users = list(User.objects.select_related('profile').order_by('pk'))
+        
+        with patch('core.utils.send_whatsapp_message', return_value=True) as mock_whatsapp, \
+                patch('core.utils.send_mentor_assignment', return_value=False), \
+                patch('core.utils.send_user_assignment_to_mentor', return_value=False):
+            sent = send_bulk_notifications([(user, self.mentor) for user in users])
+        
+        self.assertEqual(sent, 1)  # only the student with a phone got anything
+        mock_whatsapp.assert_called_once()
+        self.assertEqual(mock_whatsapp.call_args.args[0], '+919876543210')
+    
+    def test_assignment_without_phone_skips_whatsapp_pool(self):
+        """Test an assignment for a student without a phone never touches the WhatsApp pool."""
+        from ..utils import send_mentor_assignment_notifications
+        UserProfile.objects.create(user=self.user, full_name='Test User')
+        user = User.objects.select_related('profile').get(pk=self.user.pk)
+        with patch('core.utils._whatsapp_executor') as mock_executor, \
+                patch('core.utils.ThreadPoolExecutor') as mock_pool_class:
+            self.assertTrue(send_mentor_assignment_notifications(user, self.mentor))
+        mock_executor.submit.assert_not_called()
+        mock_pool_class.assert_not_called()
+    
+    def test_format_phone_for_whatsapp(self):
+        """Test raw phone numbers are normalised to E.164."""
+        self.assertEqual(format_phone_for_whatsapp('098765 43210'), '+919876543210')
+        self.assertEqual(format_phone_for_whatsapp('98765-43210'), '+919876543210')
+        self.assertEqual(format_phone_for_whatsapp('+1 (234) 567-890'), '+1234567890')
+        self.assertEqual(format_phone_for_whatsapp('919876543210'), '+919876543210')
+        self.assertEqual(format_phone_for_whatsapp('+91 98765+43210'), '+919876543210')
+        self.assertEqual(format_phone_for_whatsapp(''), '')
+    
+    def test_warm_email_templates_fills_cache(self):
+        """Test warming compiles every email template pair up front."""
+        from ..utils import EMAIL_TEMPLATE_NAMES, _cached_email_templates, warm_email_templates
+        _cached_email_templates.cache_clear()
+        warm_email_templates()
+        self.assertEqual(_cached_email_templates.cache_info().currsize, len(EMAIL_TEMPLATE_NAMES))
+    
+    @patch('core.send_email.DEFAULT_PROFILE', TEST_SMTP_PROFILE)
+    def test_direct_smtp_reuses_session(self):
+        """Test direct SMTP sends reuse one logged-in session until it goes stale."""
+        from ..send_email import _pool, send_direct_email
+        with patch('core.send_email.smtplib.SMTP') as mock_smtp:
+            server = mock_smtp.return_value
+            server.noop.return_value = (250, b'OK')
+            try:
+                for _ in range(3):
+                    self.assertTrue(send_direct_email('test@example.com', 'Subject', '<p>Hi</p>'))
+                mock_smtp.assert_called_once()
+                server.login.assert_called_once()
+                self.assertEqual(server.send_message.call_count, 3)
+                server.quit.assert_not_called()
+                
+                # A dropped session is replaced on the next send
+                server.noop.side_effect = OSError('connection reset')
+                self.assertTrue(send_direct_email('test@example.com', 'Subject', '<p>Hi</p>'))
+                self.assertEqual(mock_smtp.call_count, 2)
+            finally:
+                _pool.close_all()
+    
+    @patch('core.send_email.DEFAULT_PROFILE', TEST_SMTP_PROFILE)
+    def test_direct_smtp_retries_only_transient_replies(self):
+        """Test a 4xx SMTP reply is retried with backoff while a 5xx reply is final."""
+        from smtplib import SMTPResponseException
+        from ..send_email import _pool, _try_direct_smtp
+        with patch('core.send_email.smtplib.SMTP') as mock_smtp, \
+                patch('core.utils.time.sleep') as mock_sleep:
+            server = mock_smtp.return_value
+            server.noop.return_value = (250, b'OK')
+            try:
+                server.send_message.side_effect = [SMTPResponseException(421, b'Try again later'), {}]
+                self.assertTrue(_try_direct_smtp(['test@example.com'], 'Subject', '<p>Hi</p>', None, None))
+                self.assertEqual(server.send_message.call_count, 2)
+                mock_sleep.assert_called_once()
+                
+                server.send_message.reset_mock()
+                server.send_message.side_effect = SMTPResponseException(550, b'Mailbox unavailable')
+                self.assertFalse(_try_direct_smtp(['test@example.com'], 'Subject', '<p>Hi</p>', None, None))
+                server.send_message.assert_called_once()
+            finally:
+                _pool.close_all()
+    
+    def test_attachment_encoded_in_chunks(self):
+        """Test attachments are encoded in chunks and kept out of the alternative bodies."""
+        import os
+        import tempfile
+        from ..send_email import ATTACHMENT_CHUNK_SIZE, _build_message
+        data = os.urandom(ATTACHMENT_CHUNK_SIZE * 2 + 1000)
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+            f.write(data)
+        try:
+            msg = _build_message('from@example.com', ['to@example.com'], 'Subject', '<p>Hi</p>', 'Hi', attachments=[f.name])
+        finally:
+            os.unlink(f.name)
+        
+        # Bodies stay an alternative pair; the attachment sits beside them
+        self.assertEqual(msg.get_content_type(), 'multipart/mixed')
+        self.assertEqual(msg.get_payload()[0].get_content_type(), 'multipart/alternative')
+        part = msg.get_payload()[-1]
+        self.assertEqual(part.get_payload(decode=True), data)
+        self.assertEqual(part.get_filename(), os.path.basename(f.name))
+    
+    def test_plain_text_bodies_skip_django_templates(self):
+        """Test substitution-only text bodies bypass Django and are not HTML-escaped."""
+        import string
+        from ..utils import _load_email_templates, _render_email
+        self.assertIsInstance(_load_email_templates('verify_email')[1], string.Template)
+        self.assertNotIsInstance(_load_email_templates('mentor_assignment')[1], string.Template)
+        
+        html, text = _render_email('registration_email', {'full_name': "O'Brien & Co", 'portal_link': 'https://x'})
+        self.assertIn("Hello O'Brien & Co,", text)
+        self.assertIn('O&#x27;Brien &amp; Co', html)
+    
+    @patch('core.send_email.DEFAULT_PROFILE', TEST_SMTP_PROFILE)
+    def test_direct_email_dedupes_and_rejects_empty_recipients(self):
+        """Test repeated recipients are sent once and an empty list never reaches SMTP."""
+        from ..send_email import _pool, send_direct_email
+        with patch('core.send_email.smtplib.SMTP') as mock_smtp:
+            server = mock_smtp.return_value
+            server.noop.return_value = (250, b'OK')
+            try:
+                self.assertFalse(send_direct_email(['', None], 'Subject', '<p>Hi</p>'))
+                mock_smtp.assert_not_called()
+                
+                self.assertTrue(send_direct_email(['a@example.com', 'b@example.com', 'a@example.com'], 'Subject', '<p>Hi</p>'))
+                self.assertEqual(server.send_message.call_args.args[2], ['a@example.com', 'b@example.com'])
+            finally:
+                _pool.close_all()
+    
+    def test_brochure_attachment_read_once_per_version(self):
+        """Test a shared attachment is encoded once until the file changes."""
+        import os
+        import tempfile
+        from ..send_email import _base64_payload, _encode_file
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+            f.write(b'first version')
+        try:
+            _encode_file.cache_clear()
+            first = _base64_payload(f.name)
+            self.assertIs(_base64_payload(f.name), first)
+            
+            with open(f.name, 'wb') as changed:
+                changed.write(b'second version')
+            os.utime(f.name, ns=(0, os.stat(f.name).st_mtime_ns + 1))
+            self.assertNotEqual(_base64_payload(f.name), first)
+        finally:
+            os.unlink(f.name)
+    
+    def test_smtp_profile_needs_credentials(self):
+        """Test direct SMTP has no profile without credentials and never shows the password."""
+        with override_settings(EMAIL_HOST_USER='sender@example.com', EMAIL_HOST_PASSWORD=''):
+            self.assertIsNone(SMTPProfile.from_settings())
+        with override_settings(EMAIL_HOST_USER='sender@example.com', EMAIL_HOST_PASSWORD='secret'):
+            profile = SMTPProfile.from_settings()
+        self.assertEqual(profile.user, 'sender@example.com')
+        self.assertNotIn('secret', repr(profile))
@@ -0,0 +1,77 @@
+"""
+Tests for the registration and academic forms.
+"""
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+
+from ..models import AcademicRecord, Mentor
+
+
+class FormTests(TestCase):
+    """Test cases for portal forms."""
+    
+    def test_profile_update_form_phone_and_pincode_validation(self):
+        """Test phone and PIN code inputs are matched in full."""
+        from ..forms import UserProfileUpdateForm
+        valid = UserProfileUpdateForm(data={'phone': '+91 98765-43210', 'pincode': '560001'})
+        self.assertTrue(valid.is_valid(), valid.errors)
+        
+        invalid = UserProfileUpdateForm(data={'phone': '+ --- ---', 'pincode': '5600012'})
+        self.assertFalse(invalid.is_valid())
+        self.assertIn('phone', invalid.errors)
+        self.assertIn('pincode', invalid.errors)
+    
+    def test_academic_record_formset_loads_edited_columns_only(self):
+        """Test the academic record formset renders from one narrow query."""
+        from ..forms import AcademicRecordFormSet
+        user = User.objects.create_user(username='student', password='pass')
+        for year in (2020, 2022):
+            AcademicRecord.objects.create(
+                user=user, level='UG', degree='B.Sc', institution='Test College',
+                year=year, percentage=80.0
+            )
+        
+        formset = AcademicRecordFormSet(instance=user)
+        with self.assertNumQueries(1):
+            formset.as_p()
+        records = formset.get_queryset()
+        self.assertEqual([r.year for r in records], [2020, 2022])
+        self.assertIn('created_at', records[0].get_deferred_fields())
+    
+    def test_academic_record_formset_saves_in_bulk(self):
+        """Test new academic records are inserted with a single statement."""
+        from ..forms import AcademicRecordFormSet
+        user = User.objects.create_user(username='student', password='pass')
+        data = {
+            'academics-TOTAL_FORMS': '3',
+            'academics-INITIAL_FORMS': '0',
+            'academics-MIN_NUM_FORMS': '1',
+            'academics-MAX_NUM_FORMS': '1000',
+        }
+        for i, year in enumerate((2018, 2020, 2022)):
+            data.update({
+                f'academics-{i}-level': 'UG',
+                f'academics-{i}-degree': 'B.Sc',
+                f'academics-{i}-institution': 'Test College',
+                f'academics-{i}-year': str(year),
+                f'academics-{i}-percentage': '75.50',
+            })
+        
+        formset = AcademicRecordFormSet(data, instance=user)
+        self.assertTrue(formset.is_valid(), formset.errors)
+        with self.assertNumQueries(3):  # savepoint, INSERT, release
+            formset.save()
+        self.assertEqual(user.academics.count(), 3)
+    
+    def test_mentor_form_rejects_duplicate_email(self):
+        """Test duplicate mentor emails are caught by the unique check."""
+        from ..forms import MentorForm
+        Mentor.objects.create(name='Existing', email='mentor@example.com')
+        form = MentorForm(data={'name': 'Other', 'email': 'mentor@example.com'})
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(
+            form.errors['email'],
+            ['This email address is already registered for another mentor.']
+        )
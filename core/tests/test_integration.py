@@ -0,0 +1,134 @@
+"""
+Integration tests for complete workflows.
+"""
+
+from django.db import connection
+from django.test import TransactionTestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from unittest.mock import patch
+
+from ..models import UserProfile, Mentor, MentorAssignment
+from ._helpers import make_verify_token, reload_profile
+
+
+@override_settings(TASKS_ALWAYS_EAGER=True)
+class IntegrationTests(TransactionTestCase):
+    """Integration tests for complete workflows."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.mentor = Mentor.objects.create(
+            name='Test Mentor',
+            email='mentor@example.com',
+            portfolio_url='https://mentor.example.com',
+            whatsapp_group_link='https://wa.me/test'
+        )
+    
+    def test_complete_registration_workflow(self):
+        """Test complete user registration workflow."""
+        # Step 1: Register user
+        data = {
+            'full_name': 'Test User',
+            'email': 'test@example.com',
+            'password': 'testpass123',
+            'confirm_password': 'testpass123',
+            'phone': '+1234567890',
+            'city': 'Test City',
+            'pincode': '12345',
+            'cet_taken': 'yes',
+            'level[]': ['UG'],
+            'degree[]': ['B.Tech Computer Science'],
+            'institution[]': ['Test University'],
+            'year[]': ['2023'],
+            'percentage[]': ['85.5']
+        }
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/register/submit/', data)
+        self.assertEqual(response.status_code, 302)
+        # Query budget: catches per-row queries creeping into registration
+        self.assertLessEqual(len(ctx), 10)
+        
+        # Step 2: Verify user was created
+        user = User.objects.get(email='test@example.com')
+        self.assertFalse(user.profile.verified)
+        
+        # Step 3: Create verification token
+        token = make_verify_token(user)
+        
+        # Step 4: Verify email
+        response = self.client.get(f'/verify-email/?token={token}')
+        self.assertEqual(response.status_code, 302)
+        
+        # Step 5: Check user is verified
+        user.profile.refresh_from_db()
+        self.assertTrue(user.profile.verified)
+        
+        # Step 6: Login
+        login_data = {
+            'email': 'test@example.com',
+            'password': 'testpass123'
+        }
+        response = self.client.post('/login/submit/', login_data)
+        self.assertEqual(response.status_code, 302)
+        
+        # Step 7: Access portal
+        response = self.client.get('/portal/home/')
+        self.assertEqual(response.status_code, 200)
+    
+    def test_mentor_assignment_workflow(self):
+        """Test complete mentor assignment workflow."""
+        # Create staff user
+        staff_user = User.objects.create_user(
+            username='staff',
+            email='staff@example.com',
+            password='staffpass123'
+        )
+        staff_user.is_staff = True
+        staff_user.save()
+        
+        # Create student user
+        student_user = User.objects.create_user(
+            username='student',
+            email='student@example.com',
+            password='studentpass123'
+        )
+        UserProfile.objects.create(
+            user=student_user,
+            full_name='Student User',
+            phone='+1234567890',
+            verified=True
+        )
+        
+        # Login as staff
+        self.client.login(username='staff', password='staffpass123')
+        
+        # Assign mentor
+        data = {
+            'user_id': student_user.id,
+            'mentor_id': self.mentor.id
+        }
+        
+        with patch('core.utils.send_mentor_assignment') as mock_email, \
+             patch('core.utils.send_whatsapp_message') as mock_whatsapp:
+            
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post('/director/assign-mentor/', data)
+            self.assertEqual(response.status_code, 302)
+            # Query budget, including the eager notification tasks' lookups
+            self.assertLessEqual(len(ctx), 12)
+            
+            # Check assignment was created
+            self.assertTrue(MentorAssignment.objects.filter(
+                user=student_user,
+                mentor=self.mentor
+            ).exists())
+            
+            # Check profile was updated
+            self.assertEqual(reload_profile(student_user).assigned_mentor_id, self.mentor.id)
+            
+            # Check notifications were sent
+            mock_email.assert_called_once()
+            mock_whatsapp.assert_called_once()
@@ -0,0 +1,277 @@
+"""
+Tests for the core models and their signal side effects.
+"""
+
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+from unittest.mock import patch
+
+from ..models import (
+    UserProfile, AcademicRecord, Mentor, MentorAssignment,
+    Visitor, EmailVerificationToken, PageContent, RegistrationLog
+)
+from ._helpers import reload_profile
+
+
+class ModelTests(TestCase):
+    """Test cases for database models."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        cls.mentor = Mentor.objects.create(
+            name='Test Mentor',
+            email='mentor@example.com',
+            portfolio_url='https://mentor.example.com',
+            whatsapp_group_link='https://wa.me/test',
+            bio='Test mentor bio'
+        )
+    
+    def test_user_profile_creation(self):
+        """Test UserProfile model creation."""
+        profile = UserProfile.objects.create(
+            user=self.user,
+            full_name='Test User',
+            phone='+1234567890',
+            city='Test City',
+            pincode='12345',
+            cet_taken=True
+        )
+        
+        self.assertEqual(profile.user, self.user)
+        self.assertEqual(profile.full_name, 'Test User')
+        self.assertTrue(profile.cet_taken)
+        self.assertFalse(profile.verified)
+    
+    def test_academic_record_creation(self):
+        """Test AcademicRecord model creation."""
+        record = AcademicRecord.objects.create(
+            user=self.user,
+            level='UG',
+            degree='B.Tech Computer Science',
+            institution='Test University',
+            year=2023,
+            percentage=85.5
+        )
+        
+        self.assertEqual(record.user, self.user)
+        self.assertEqual(record.level, 'UG')
+        self.assertEqual(record.percentage, 85.5)
+    
+    def test_mentor_creation(self):
+        """Test Mentor model creation."""
+        mentor = Mentor.objects.create(
+            name='Dr. Test Mentor',
+            email='dr.test@example.com',
+            bio='Test bio'
+        )
+        
+        self.assertEqual(mentor.name, 'Dr. Test Mentor')
+        self.assertEqual(mentor.email, 'dr.test@example.com')
+        self.assertIsNotNone(mentor.created_at)
+    
+    def test_mentor_assignment_creation(self):
+        """Test MentorAssignment model creation."""
+        assignment = MentorAssignment.objects.create(
+            user=self.user,
+            mentor=self.mentor,
+            assigned_by=self.user
+        )
+        
+        self.assertEqual(assignment.user, self.user)
+        self.assertEqual(assignment.mentor, self.mentor)
+        self.assertIsNotNone(assignment.assigned_at)
+    
+    def test_mentor_assignment_syncs_profile_on_commit(self):
+        """Test the student's profile picks up the mentor once the assignment commits."""
+        profile = UserProfile.objects.create(user=self.user, phone='+1234567890')
+        with patch('core.signals.send_mentor_assignment_notifications_task'):
+            with self.captureOnCommitCallbacks(execute=True):
+                MentorAssignment.objects.create(
+                    user=self.user,
+                    mentor=self.mentor,
+                    assigned_by=self.user
+                )
+                profile.refresh_from_db()
+                self.assertIsNone(profile.assigned_mentor_id)
+        
+        self.assertEqual(reload_profile(self.user).assigned_mentor_id, self.mentor.id)
+    
+    def test_visitor_tracking(self):
+        """Test Visitor model for tracking page visits."""
+        visitor = Visitor.objects.create(
+            ip_address='192.168.1.1',
+            path='/test-page',
+            page_visited='/test-page',
+            user=self.user,
+            user_agent='Test Browser'
+        )
+        
+        self.assertEqual(visitor.ip_address, '192.168.1.1')
+        self.assertEqual(visitor.path, '/test-page')
+        self.assertEqual(visitor.user, self.user)
+    
+    @override_settings(VISITOR_BUFFER_SIZE=3, VISITOR_FLUSH_INTERVAL=60, TASKS_ALWAYS_EAGER=True)
+    def test_visits_written_in_batches(self):
+        """Test page visits are buffered and written with one bulk insert."""
+        from ..tracking import record_visit
+        record_visit('192.168.1.1', '/')
+        record_visit('192.168.1.1', '/register/', user_id=self.user.pk)
+        self.assertEqual(Visitor.objects.count(), 0)
+        
+        with self.assertNumQueries(3):  # savepoint, INSERT, release
+            record_visit('192.168.1.2', '/login/', user_agent='Test Browser')
+        self.assertEqual(
+            list(Visitor.objects.order_by('pk').values_list('path', 'page_visited', 'user_id')),
+            [('/', '/', None), ('/register/', '/register/', self.user.pk), ('/login/', '/login/', None)]
+        )
+    
+    @override_settings(VISITOR_BUFFER_SIZE=1, TASKS_ALWAYS_EAGER=False)
+    def test_visit_flush_deferred_to_task_pool(self):
+        """Test a full batch is handed to the task pool instead of written in the request."""
+        from ..tracking import flush_visits, record_visit
+        flush_visits()  # drop visits buffered by earlier tests
+        Visitor.objects.all().delete()
+        with self.captureOnCommitCallbacks() as callbacks, self.assertNumQueries(0):
+            record_visit('192.168.1.1', '/')
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(Visitor.objects.count(), 0)
+        
+        self.assertEqual(flush_visits(), 1)
+        self.assertEqual(Visitor.objects.count(), 1)
+    
+    @override_settings(VISITOR_BUFFER_SIZE=2, TASKS_ALWAYS_EAGER=False)
+    def test_visit_flush_queued_once(self):
+        """Test visits arriving before a queued flush runs do not queue another."""
+        from ..tracking import flush_visits, record_visit
+        flush_visits()  # drop visits buffered by earlier tests
+        with self.captureOnCommitCallbacks() as callbacks:
+            for i in range(10):
+                record_visit('192.168.1.1', f'/page/{i}/')
+        self.assertEqual(len(callbacks), 1)
+        
+        self.assertEqual(flush_visits(), 10)
+        with self.captureOnCommitCallbacks() as callbacks:
+            record_visit('192.168.1.1', '/')
+            record_visit('192.168.1.1', '/')
+        self.assertEqual(len(callbacks), 1)
+        flush_visits()
+    
+    def test_email_verification_token_creation(self):
+        """Test EmailVerificationToken model creation."""
+        token = EmailVerificationToken.objects.create(
+            user=self.user,
+            token='test-token-123',
+            expires_at=timezone.now() + timedelta(hours=24)
+        )
+        
+        self.assertEqual(token.user, self.user)
+        self.assertEqual(token.token, 'test-token-123')
+        self.assertFalse(token.expires_at < timezone.now())
+    
+    def test_cleanup_expired_tokens_single_delete(self):
+        """Test expired tokens are removed with one DELETE and counted from it."""
+        from ..utils import cleanup_expired_tokens
+        now = timezone.now()
+        EmailVerificationToken.objects.bulk_create([
+            EmailVerificationToken(user=self.user, token='expired-1', expires_at=now - timedelta(hours=1)),
+            EmailVerificationToken(user=self.user, token='expired-2', expires_at=now - timedelta(days=2)),
+            EmailVerificationToken(user=self.user, token='live', expires_at=now + timedelta(hours=1)),
+        ])
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(cleanup_expired_tokens(), 2)
+        self.assertEqual(list(EmailVerificationToken.objects.values_list('token', flat=True)), ['live'])
+    
+    def test_page_content_creation(self):
+        """Test PageContent model creation."""
+        content = PageContent.objects.create(
+            key='test_key',
+            value='Test content value'
+        )
+        
+        self.assertEqual(content.key, 'test_key')
+        self.assertEqual(content.value, 'Test content value')
+        self.assertIsNotNone(content.updated_at)
+    
+    def test_registration_log_creation(self):
+        """Test RegistrationLog model creation."""
+        log = RegistrationLog.objects.create(
+            user=self.user,
+            ip='192.168.1.1',
+            status='submitted'
+        )
+        
+        self.assertEqual(log.user, self.user)
+        self.assertEqual(log.ip, '192.168.1.1')
+        self.assertEqual(log.status, 'submitted')
+    
+    def test_purge_old_logs_command(self):
+        """Test the periodic sweep removes only logs past retention."""
+        from io import StringIO
+        from django.core.management import call_command
+        old_log = RegistrationLog.objects.create(user=self.user, status='submitted')
+        RegistrationLog.objects.filter(pk=old_log.pk).update(
+            created_at=timezone.now() - timedelta(days=400)
+        )
+        recent_log = RegistrationLog.objects.create(user=self.user, status='submitted')
+        
+        out = StringIO()
+        call_command('purge_old_logs', stdout=out)
+        self.assertIn('Deleted 1 old', out.getvalue())
+        self.assertEqual(list(RegistrationLog.objects.values_list('pk', flat=True)), [recent_log.pk])
+    
+    def test_setup_page_content_keeps_existing_unless_forced(self):
+        """Test page content seeding skips existing keys and overwrites them with force."""
+        from io import StringIO
+        from ..management.commands.setup_portal import Command
+        PageContent.objects.create(key='contact_email', value='office@college.edu')
+        command = Command(stdout=StringIO())
+        
+        command.setup_page_content()
+        self.assertEqual(PageContent.objects.get(key='contact_email').value, 'office@college.edu')
+        self.assertEqual(PageContent.get_cached('welcome_title'), 'Welcome to Our College Portal')
+        
+        command.setup_page_content(force=True)
+        self.assertEqual(PageContent.objects.get(key='contact_email').value, 'info@college.edu')
+        self.assertEqual(PageContent.get_cached('contact_email'), 'info@college.edu')
+    
+    def test_setup_sample_data_is_idempotent(self):
+        """Test sample mentors and users are seeded once with working logins."""
+        from io import StringIO
+        from ..management.commands.setup_portal import Command
+        command = Command(stdout=StringIO())
+        
+        for _ in range(2):
+            command.create_sample_mentors()
+            command.create_sample_users()
+        
+        self.assertEqual(Mentor.objects.filter(email__endswith='@college.edu').count(), 5)
+        student = User.objects.get(username='student1')
+        self.assertTrue(student.check_password('student123'))
+        self.assertTrue(UserProfile.objects.get(user=student).verified)
+    
+    def test_setup_skips_collectstatic_when_sources_unchanged(self):
+        """Test collectstatic only reruns when static sources change or --force is given."""
+        import tempfile
+        from io import StringIO
+        from unittest.mock import patch
+        from django.test import override_settings
+        from ..management.commands.setup_portal import Command
+        command = Command(stdout=StringIO())
+        
+        with tempfile.TemporaryDirectory() as static_root, override_settings(STATIC_ROOT=static_root), \
+                patch('core.management.commands.setup_portal.call_command') as mock_call:
+            command.collect_static()
+            command.collect_static()
+            self.assertEqual(mock_call.call_count, 1)
+            
+            command.collect_static(force=True)
+            self.assertEqual(mock_call.call_count, 2)
@@ -0,0 +1,77 @@
+"""
+Performance and query-count tests.
+"""
+
+from django.test import TransactionTestCase, Client
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from ..models import Mentor, MentorRequest, UserProfile
+
+
+class PerformanceTests(TransactionTestCase):
+    """Test cases for performance and optimization."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+    
+    def _create_students(self, start, count, mentor):
+        """Bulk-create ``count`` verified students, each with ``mentor`` assigned."""
+        users = User.objects.bulk_create([
+            # Students never log in here, so skip the hasher entirely
+            User(username=f'user{i}', email=f'user{i}@example.com', password=make_password(None))
+            for i in range(start, start + count)
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(
+                user=user,
+                full_name=f'User {i}',
+                phone=f'+123456789{i}',
+                verified=True,
+                assigned_mentor=mentor
+            )
+            for i, user in enumerate(users, start)
+        ])
+
+    def test_database_query_optimization(self):
+        """Test database query optimization."""
+        cache.delete('dashboard:totals')
+        mentor = Mentor.objects.create(name='Perf Mentor', email='perf.mentor@example.com')
+        User.objects.create_user(
+            username='director', email='director@example.com',
+            password='testpass123', is_staff=True
+        )
+        self.client.login(username='director', password='testpass123')
+
+        # Create multiple users and profiles, plus one waiting for a mentor
+        self._create_students(0, 10, mentor)
+        waiting = User.objects.create_user(username='waiting', email='waiting@example.com', first_name='Wanda')
+        UserProfile.objects.create(user=waiting, full_name='Wanda')
+        MentorRequest.objects.create(user=waiting)
+        
+        # Test query count for director dashboard
+        # session + user, then two counts and four lists; no per-row queries
+        with self.assertNumQueries(8) as ctx:
+            response = self.client.get('/director/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Perf Mentor')
+        self.assertContains(response, 'waiting@example.com')
+
+        # Query count must not grow with the number of students listed; the
+        # visitor and registration totals now come from the cache
+        self._create_students(10, 10, mentor)
+        with self.assertNumQueries(len(ctx.captured_queries) - 2):
+            self.client.get('/director/dashboard/')
+    
+    def test_cache_performance(self):
+        """Test cache miss then hit."""
+        cache.delete('test_key')
+        
+        # First access (cache miss)
+        self.assertIsNone(cache.get('test_key'))
+        cache.set('test_key', 'test_value', 30)
+        
+        # Second access (cache hit)
+        self.assertEqual(cache.get('test_key'), 'test_value')
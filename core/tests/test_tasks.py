@@ -0,0 +1,191 @@
+"""
+Tests for the background task helpers.
+"""
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from unittest.mock import patch
+
+from ..models import UserProfile
+
+
+class TaskTests(TestCase):
+    """Test cases for background task dispatch."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
+            username='student',
+            email='student@example.com',
+            password='testpass123'
+        )
+        cls.profile = UserProfile.objects.create(user=cls.user, full_name='Student User')
+    
+    @override_settings(TASKS_ALWAYS_EAGER=False)
+    def test_delay_waits_for_commit(self):
+        """Test tasks are handed to the pool only after the transaction commits."""
+        from ..tasks import send_profile_verified_email
+        with patch('core.tasks._executor') as mock_executor:
+            with self.captureOnCommitCallbacks() as callbacks:
+                send_profile_verified_email.delay(self.profile.pk)
+                mock_executor.submit.assert_not_called()
+            
+            self.assertEqual(len(callbacks), 1)
+            callbacks[0]()
+            mock_executor.submit.assert_called_once()
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_profile_verification_sends_email(self):
+        """Test verifying a profile emails the student."""
+        self.profile.verified = True
+        self.profile.save()
+        
+        from django.core import mail
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['student@example.com'])
+        self.assertEqual(mail.outbox[0].subject, 'Account Verified - College Portal')
+    
+    def test_verification_change_tracked_without_reload(self):
+        """Test saving a loaded profile does not re-read it to detect verification."""
+        profile = UserProfile.objects.select_related('user').get(pk=self.profile.pk)
+        profile.verified = True
+        with patch('core.signals.send_profile_verified_email') as mock_task:
+            with self.assertNumQueries(1):  # the UPDATE only
+                profile.save()
+            mock_task.delay.assert_called_once_with(profile.pk)
+            
+            profile.city = 'Pune'
+            profile.save()
+            mock_task.delay.assert_called_once()
+    
+    def test_verification_snapshot_follows_refresh_and_failed_saves(self):
+        """Test a refreshed or failed-to-save profile does not report a stale verification change."""
+        from django.db import DatabaseError, transaction
+        stale = UserProfile.objects.get(pk=self.profile.pk)
+        UserProfile.objects.filter(pk=self.profile.pk).update(verified=True)  # verified elsewhere
+        with patch('core.signals.send_profile_verified_email') as mock_task:
+            stale.refresh_from_db()
+            stale.save()
+            mock_task.delay.assert_not_called()
+            
+            UserProfile.objects.filter(pk=self.profile.pk).update(verified=False)
+            profile = UserProfile.objects.get(pk=self.profile.pk)
+            profile.verified = True
+            with patch.object(UserProfile, '_do_update', side_effect=DatabaseError('down')):
+                with self.assertRaises(DatabaseError), transaction.atomic():
+                    profile.save()
+            profile.save()
+            mock_task.delay.assert_called_once_with(profile.pk)
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_verification_email_sent_through_task(self):
+        """Test the queued verification email keeps its HTML alternative."""
+        from django.core import mail
+        from ..utils import send_verification_email
+        self.assertTrue(send_verification_email(
+            to_email='student@example.com',
+            full_name='Student User',
+            verify_link='https://example.com/verify?token=abc'
+        ))
+        
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['student@example.com'])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_welcome_email_retried_after_smtp_error(self):
+        """Test a transient SMTP failure is retried with backoff."""
+        from smtplib import SMTPServerDisconnected
+        from ..utils import send_welcome_email
+        with patch('core.tasks.send_mail', side_effect=[SMTPServerDisconnected('busy'), 1]) as mock_send, \
+                patch('core.tasks.time.sleep') as mock_sleep:
+            self.assertTrue(send_welcome_email(self.user))
+        
+        self.assertEqual(mock_send.call_count, 2)
+        mock_sleep.assert_called_once_with(1)
+        self.assertEqual(mock_send.call_args.kwargs['recipient_list'], ['student@example.com'])
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_mail_task_gives_up_after_retries(self):
+        """Test a mail server that keeps timing out is retried a bounded number of times."""
+        import socket
+        from ..tasks import send_mail_task
+        with patch('core.tasks.send_mail', side_effect=socket.timeout('timed out')) as mock_send, \
+                patch('core.tasks.time.sleep') as mock_sleep:
+            send_mail_task.delay('Subject', 'text', '<p>html</p>', 'from@example.com', ['to@example.com'])
+        
+        self.assertEqual(mock_send.call_count, 4)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [1, 2, 4])
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_mail_task_does_not_retry_refused_recipients(self):
+        """Test a permanent SMTP refusal is logged once instead of retried."""
+        from smtplib import SMTPRecipientsRefused
+        from ..tasks import send_mail_task
+        refused = SMTPRecipientsRefused({'to@example.com': (550, b'User unknown')})
+        with patch('core.tasks.send_mail', side_effect=refused) as mock_send, \
+                patch('core.tasks.time.sleep') as mock_sleep, \
+                self.assertLogs('core.tasks', level='ERROR') as logs:
+            send_mail_task.delay('Subject', 'text', '<p>html</p>', 'from@example.com', ['to@example.com'])
+        
+        mock_send.assert_called_once()
+        mock_sleep.assert_not_called()
+        self.assertIn('550', logs.output[0])
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_mentor_notification_task_emails_mentor(self):
+        """Test the queued mentor notification reloads the student and emails the mentor."""
+        from django.core import mail
+        from ..models import Mentor
+        from ..tasks import send_mentor_notification_task
+        mentor = Mentor.objects.create(name='Test Mentor', email='mentor@example.com')
+        
+        send_mentor_notification_task.delay(mentor.pk, self.user.pk)
+        
+        mentor_mail = next(m for m in mail.outbox if m.to == ['mentor@example.com'])
+        self.assertIn('student@example.com', mentor_mail.body)
+        self.assertEqual(len(mail.outbox), 2)  # plus the admin copy
+    
+    @override_settings(TASKS_ALWAYS_EAGER=False)
+    def test_forgot_password_queues_email(self):
+        """Test the reset email is handed to the task pool instead of sent in the view."""
+        with patch('core.send_email.send_direct_email') as mock_send, \
+                patch('core.tasks._executor') as mock_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post('/forgot-password/', {'email': 'student@example.com'})
+        
+        self.assertEqual(response.status_code, 200)
+        mock_send.assert_not_called()
+        mock_executor.submit.assert_called_once()
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_mentor_request_admin_email_uses_cached_staff_list(self):
+        """Test the mentor-request notice goes to staff, whose emails are cached until staff changes."""
+        from ..tasks import send_mentor_request_admin_task
+        from ..utils import get_staff_emails
+        User.objects.create_user(username='staff', email='staff@example.com', password='pass', is_staff=True)
+        self.assertEqual(get_staff_emails(), ['staff@example.com'])
+        
+        with patch('core.send_email.send_direct_email') as mock_send, self.assertNumQueries(1):
+            send_mentor_request_admin_task.delay(self.user.pk, 'https://example.com/director/dashboard/')
+        kwargs = mock_send.call_args.kwargs
+        self.assertEqual(kwargs['to_emails'], ['staff@example.com'])
+        self.assertIn('student@example.com', kwargs['html_content'])
+        self.assertIn('https://example.com/director/dashboard/', kwargs['text_content'])
+        
+        User.objects.create_user(username='staff2', email='staff2@example.com', password='pass', is_staff=True)
+        self.assertEqual(sorted(get_staff_emails()), ['staff2@example.com', 'staff@example.com'])
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_password_reset_email_rendered_in_task(self):
+        """Test the reset email carries the link and the student's name, rendered off the view."""
+        with patch('core.send_email.send_direct_email') as mock_send:
+            response = self.client.post('/forgot-password/', {'email': 'student@example.com'})
+        
+        self.assertEqual(response.status_code, 200)
+        kwargs = mock_send.call_args.kwargs
+        self.assertEqual(kwargs['to_emails'], ['student@example.com'])
+        self.assertIn('/reset/', kwargs['text_content'])
+        self.assertIn('Hello student,', kwargs['text_content'])
+        self.assertIn('class="button">Reset Password</a>', kwargs['html_content'])
@@ -0,0 +1,97 @@
+"""
+Buffered visitor tracking.
+
+Page views are queued in process memory and written with one bulk_create
+per batch instead of one INSERT per request. ``VISITOR_BUFFER_SIZE`` sets
+the batch size (1 writes every visit immediately); a batch is also flushed
+once it is ``VISITOR_FLUSH_INTERVAL`` seconds old, and at process exit.
+Flushes run on the task pool, so no request waits on the INSERT.
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Visitor
+from .tasks import task
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending = []
+_oldest = None
+# Set while a flush is waiting on the pool, so a busy pool gets one, not one per request
+_flush_queued = False
+
+
+def _note_visit_from(ip_address: str) -> None:
+    """Warn when one IP makes more than 10 visits in a 5 minute cache window."""
+    key = f"susp:{ip_address}"
+    if cache.add(key, 1, timeout=300):
+        return
+    try:
+        recent_visits = cache.incr(key)
+    except ValueError:  # window expired between add() and incr()
+        cache.add(key, 1, timeout=300)
+        return
+
+    if recent_visits > 10:
+        logger.warning(f"Suspicious activity detected from IP: {ip_address}")
+
+
+def record_visit(ip_address: str, path: str, user_id=None, user_agent: str = "") -> None:
+    """Queue a Visitor row, flushing the batch when it is full or stale."""
+    global _oldest, _flush_queued
+
+    _note_visit_from(ip_address)
+    visitor = Visitor(
+        ip_address=ip_address,
+        path=path,
+        page_visited=path,  # Store the page path for analytics
+        user_id=user_id,
+        user_agent=user_agent[:255],
+    )
+    now = time.monotonic()
+    with _lock:
+        _pending.append(visitor)
+        if _oldest is None:
+            _oldest = now
+        due = not _flush_queued and (
+            len(_pending) >= getattr(settings, "VISITOR_BUFFER_SIZE", 1)
+            or now - _oldest >= getattr(settings, "VISITOR_FLUSH_INTERVAL", 2)
+        )
+        if due:
+            _flush_queued = True
+    if due:
+        flush_visits.delay()
+
+
+@task
+def flush_visits() -> int:
+    """Write all queued visits; returns the number of rows written."""
+    global _oldest, _flush_queued
+
+    with _lock:
+        batch = _pending[:]
+        _pending.clear()
+        _oldest = None
+        _flush_queued = False
+    if not batch:
+        return 0
+
+    try:
+        with transaction.atomic():
+            Visitor.objects.bulk_create(batch, batch_size=500)
+    except Exception as e:
+        logger.error(f"Failed to write {len(batch)} visitor rows: {e}")
+        return 0
+    return len(batch)
+
+
+atexit.register(flush_visits)
@@ -5,24 +5,284 @@ This module contains helper functions for sending verification emails,
 mentor assignment notifications, and WhatsApp messages using Twilio API.
 """
 
+import atexit
 import os
+import json
 import logging
+import random
+import re
+import socket
+import string
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from smtplib import SMTPException, SMTPResponseException, SMTPServerDisconnected
+from datetime import timedelta
+from functools import lru_cache, wraps
 from typing import Optional
-from django.core.mail import send_mail, EmailMultiAlternatives, EmailMessage
-from django.template.loader import render_to_string
+from urllib import request as urlrequest
+from django.core.mail import send_mail, get_connection, EmailMultiAlternatives
+from django.core.signing import TimestampSigner
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
 from django.conf import settings
 from django.utils import timezone
 
+from .tasks import (
+    send_mail_task,
+    send_verification_confirmation_task,
+    send_welcome_email_task,
+)
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# requests is optional; without it pincode lookups are skipped and other
+# lookups fall back to urllib
 try:
-    from twilio.rest import Client as TwilioClient
-    from twilio.base.exceptions import TwilioException
-    TWILIO_AVAILABLE = True
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
-    TWILIO_AVAILABLE = False
-    logger.warning("Twilio not installed. WhatsApp notifications will be disabled.")
+    requests = None
+
+# Twilio credentials are read once; the client (and its HTTP session) is
+# built on first use and shared by every send
+_TW_SID = os.getenv('TWILIO_ACCOUNT_SID')
+_TW_TOKEN = os.getenv('TWILIO_AUTH_TOKEN')
+_TW_FROM = os.getenv('TWILIO_WHATSAPP_FROM')
+_WHATSAPP_CONFIGURED = bool(_TW_SID and _TW_TOKEN and _TW_FROM)
+
+# Only pay for the twilio import when WhatsApp is actually configured
+TwilioClient = None
+TwilioException = Exception
+TWILIO_AVAILABLE = False
+if _WHATSAPP_CONFIGURED:
+    try:
+        from twilio.rest import Client as TwilioClient
+        from twilio.base.exceptions import TwilioException
+        TWILIO_AVAILABLE = True
+    except ImportError:
+        logger.warning("Twilio not installed. WhatsApp notifications will be disabled.")
+_twilio_client = None
+_twilio_lock = threading.Lock()
+
+# Twilio statuses worth another attempt; other 4xx responses fail at once
+WHATSAPP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Concurrent Twilio requests; the client's HTTP session keeps these
+# connections alive between messages
+WHATSAPP_BATCH_WORKERS = 4
+# One WhatsApp pool per process, shared by single and batch sends
+_whatsapp_executor = ThreadPoolExecutor(max_workers=WHATSAPP_BATCH_WORKERS, thread_name_prefix="whatsapp")
+atexit.register(_whatsapp_executor.shutdown, wait=True)
+
+# Errors retry_with_backoff() catches by default; _is_transient() then
+# rejects permanent SMTP replies (5xx)
+SMTP_RETRY_ERRORS = (SMTPServerDisconnected, SMTPResponseException, socket.timeout, ConnectionError)
+
+# Message bodies are plain constants; only the slots are filled per send
+_MENTOR_ASSIGNED_WHATSAPP = """Hello {student_name},
+
+Your mentor {mentor_name} has been assigned to you!
+
+Portfolio: {portfolio}
+WhatsApp Group: {group}
+
+Please contact your mentor for guidance and support.
+
+Best regards,
+College Portal Team""".format
+
+
+def _is_transient(error) -> bool:
+    """Whether a caught send error is worth another attempt."""
+    if isinstance(error, SMTPResponseException):
+        return 400 <= error.smtp_code < 500  # 4xx is "try again later"
+    if isinstance(error, OSError):  # dropped connections and timeouts
+        return True
+    return getattr(error, 'status', None) in WHATSAPP_RETRY_STATUSES
+
+
+def retry_with_backoff(max_retries=3, base=1.0, cap=30.0, jitter=0.5, recoverable=SMTP_RETRY_ERRORS):
+    """
+    Retry transient ``recoverable`` errors with capped exponential backoff.
+    
+    Retry n waits min(cap, base * 2**n) seconds, scaled by a random factor
+    in [1 - jitter, 1 + jitter]. Permanent failures (SMTP 5xx, Twilio 4xx)
+    and the last failed attempt are re-raised.
+    """
+    def decorator(func):
+        @wraps(func)
+        def run(*args, **kwargs):
+            for attempt in range(max_retries + 1):
+                try:
+                    return func(*args, **kwargs)
+                except recoverable as e:
+                    if attempt == max_retries or not _is_transient(e):
+                        raise
+                    delay = min(cap, base * 2 ** attempt) * (1 + random.uniform(-jitter, jitter))
+                    logger.warning(
+                        "%s failed (%s); retry %d/%d in %.1fs",
+                        func.__name__, e, attempt + 1, max_retries, delay,
+                    )
+                    time.sleep(delay)
+        
+        return run
+    
+    return decorator
+
+
+def _get_twilio():
+    """Return the shared Twilio client, or None if credentials are not configured."""
+    global _twilio_client
+    if _twilio_client is None and _WHATSAPP_CONFIGURED:
+        with _twilio_lock:
+            if _twilio_client is None:
+                _twilio_client = TwilioClient(_TW_SID, _TW_TOKEN)
+    return _twilio_client
+
+
+def _build_http_session(retries: int = 3):
+    """
+    Build a shared requests session for outbound API lookups.
+    
+    Idempotent GETs that hit a connection error or a 5xx are retried
+    ``retries`` times with exponential backoff, and the session keeps its
+    connections pooled.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+    )
+    session = requests.Session()
+    # Keep enough warm connections for every gunicorn thread in the worker
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry))
+    return session
+
+
+_HTTP_SESSION = _build_http_session() if requests else None
+# Dropdown lookups have a fallback answer, so they fail fast instead of retrying
+_LOOKUP_SESSION = _build_http_session(retries=0) if requests else None
+
+
+def fetch_json(url: str, payload: Optional[dict] = None, timeout: float = 5):
+    """
+    GET ``url``, or POST ``payload`` to it as JSON, and return the decoded body.
+    
+    Goes through a pooled session, so repeat calls reuse a warm TLS
+    connection; falls back to a one-off urllib request without requests.
+    Raises on network errors and non-2xx responses.
+    """
+    if _LOOKUP_SESSION is not None:
+        if payload is None:
+            response = _LOOKUP_SESSION.get(url, timeout=timeout)
+        else:
+            response = _LOOKUP_SESSION.post(url, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    data = None if payload is None else json.dumps(payload).encode('utf-8')
+    req = urlrequest.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urlrequest.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read().decode('utf-8'))
+
+
+_SIMPLE_VARIABLE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+
+def _plain_text_template(template):
+    """
+    A string.Template equivalent of a Django .txt template, if it has one.
+    
+    Bodies that only substitute bare ``{{ name }}`` variables skip the Django
+    engine (and its HTML autoescaping, which mangles text/plain); anything
+    using tags, filters or attribute lookups keeps the Django template.
+    """
+    source = template.template.source
+    plain = _SIMPLE_VARIABLE.sub('', source)
+    if '{{' in plain or '{%' in plain or '{#' in plain:
+        return template
+    return string.Template(_SIMPLE_VARIABLE.sub(r'${\1}', source.replace('$', '$$')))
+
+
+def _load_email_templates(name: str):
+    """Return the (HTML, text) template pair for ``emails/<name>``."""
+    return (
+        get_template(f'emails/{name}.html'),
+        _plain_text_template(get_template(f'emails/{name}.txt')),
+    )
+
+
+_cached_email_templates = lru_cache(maxsize=None)(_load_email_templates)
+
+EMAIL_TEMPLATE_NAMES = ('verify_email', 'mentor_assignment', 'user_assignment_to_mentor', 'registration_email')
+
+
+def warm_email_templates() -> None:
+    """
+    Compile every email template pair into the per-process cache.
+    
+    Called in the gunicorn master under preload_app, so forked workers
+    inherit the compiled templates instead of each building its own copy.
+    """
+    for name in EMAIL_TEMPLATE_NAMES:
+        _cached_email_templates(name)
+
+
+def _render_email(name: str, context: dict) -> tuple:
+    """
+    Render the HTML and text bodies of an email template pair.
+    
+    The compiled templates are kept per process; with DEBUG on they are looked
+    up on every call so template edits show up without a restart.
+    """
+    loader = _load_email_templates if settings.DEBUG else _cached_email_templates
+    html_template, text_template = loader(name)
+    if isinstance(text_template, string.Template):
+        # Missing variables render empty, as they would in Django
+        text = text_template.substitute(defaultdict(str, context))
+    else:
+        text = text_template.render(context)
+    return html_template.render(context), text
+
+
+VERIFICATION_TOKEN_MAX_AGE = timedelta(hours=24)
+
+# Attached to registration emails; its encoded form is cached per file version
+BROCHURE_PATH = os.path.join(settings.BASE_DIR, 'static', 'brochures', 'mca_brochure.pdf')
+_verification_signer = TimestampSigner(salt="core.verify-email")
+
+# What building and handing off an email can legitimately raise; anything
+# else is a bug and should propagate
+EMAIL_ERRORS = (TemplateDoesNotExist, TemplateSyntaxError, SMTPException, OSError)
+
+
+def _admin_email() -> str:
+    """Where admin copies go: ADMIN_EMAIL, or the sender address if unset."""
+    return getattr(settings, 'ADMIN_EMAIL', settings.DEFAULT_FROM_EMAIL)
+
+
+def make_verification_token(user) -> str:
+    """
+    Build a signed, timestamped email verification token for ``user``.
+    
+    The token carries the user's pk and email, so nothing is stored; changing
+    the email invalidates any token issued for the old address.
+    """
+    return _verification_signer.sign_object({"pk": user.pk, "e": getattr(user, "email", "")})
+
+
+def read_verification_token(token: str) -> dict:
+    """
+    Return the ``{"pk", "e"}`` payload of a verification token.
+    
+    Raises SignatureExpired once the token is older than
+    VERIFICATION_TOKEN_MAX_AGE and BadSignature if it was tampered with.
+    """
+    return _verification_signer.unsign_object(token, max_age=VERIFICATION_TOKEN_MAX_AGE)
 
 
 def send_verification_email(to_email: str, full_name: str, verify_link: str) -> bool:
@@ -35,7 +295,7 @@ def send_verification_email(to_email: str, full_name: str, verify_link: str) ->
         verify_link: Signed verification link
         
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if the email was queued, False otherwise
     """
     if not to_email:
         logger.error("Cannot send verification email: recipient email is empty")
@@ -45,39 +305,19 @@ def send_verification_email(to_email: str, full_name: str, verify_link: str) ->
         subject = "Welcome to College Portal - Verify Your Email"
         
         # Render HTML and text versions
-        html_content = render_to_string('emails/verify_email.html', {
+        html_content, text_content = _render_email('verify_email', {
             'full_name': full_name or "User",
             'verify_link': verify_link,
             'site_url': settings.SITE_BASE_URL,
             'current_year': timezone.now().year,
         })
         
-        text_content = render_to_string('emails/verify_email.txt', {
-            'full_name': full_name or "User",
-            'verify_link': verify_link,
-            'site_url': settings.SITE_BASE_URL,
-            'current_year': timezone.now().year,
-        })
-        
-        # Create email with both HTML and text versions
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[to_email],
-        )
-        msg.attach_alternative(html_content, "text/html")
-        
-        # Send email
-        result = msg.send(fail_silently=True)
-        if result:
-            logger.info(f"Verification email sent to {to_email}")
-            return True
-        else:
-            logger.error(f"Failed to send verification email to {to_email}")
-            return False
+        # Queue the SMTP round-trip; the request only pays for rendering
+        send_mail_task.delay(subject, text_content, html_content, settings.DEFAULT_FROM_EMAIL, [to_email])
+        logger.info(f"Verification email queued for {to_email}")
+        return True
         
-    except Exception as e:
+    except EMAIL_ERRORS as e:
         logger.error(f"Failed to send verification email to {to_email}: {e}")
         return False
 
@@ -87,7 +327,8 @@ def send_mentor_assignment(
     student_name: str, 
     mentor_name: str, 
     portfolio_url: str, 
-    whatsapp_link: str
+    whatsapp_link: str,
+    connection=None
 ) -> bool:
     """
     Send mentor assignment notification via email.
@@ -98,9 +339,11 @@ def send_mentor_assignment(
         mentor_name: Assigned mentor's name
         portfolio_url: Mentor's portfolio URL
         whatsapp_link: WhatsApp group invite link
+        connection: Open mail connection to send on directly instead of
+            queueing (optional)
         
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if the email was sent or queued, False otherwise
     """
     if not to_email:
         logger.error("Cannot send mentor assignment email: recipient email is empty")
@@ -119,27 +362,23 @@ def send_mentor_assignment(
         }
         
         # Render HTML and text versions
-        html_content = render_to_string('emails/mentor_assignment.html', context)
-        text_content = render_to_string('emails/mentor_assignment.txt', context)
+        html_content, text_content = _render_email('mentor_assignment', context)
         
-        # Send email with both HTML and text versions
-        result = send_mail(
-            subject=subject,
-            message=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[to_email],
-            html_message=html_content,
-            fail_silently=True,  # Don't raise exceptions that would break the flow
-        )
-        
-        if result:
+        if connection is not None:
+            msg = EmailMultiAlternatives(
+                subject, text_content, settings.DEFAULT_FROM_EMAIL, [to_email], connection=connection
+            )
+            msg.attach_alternative(html_content, "text/html")
+            msg.send()
             logger.info(f"Mentor assignment email sent to {to_email}")
             return True
-        else:
-            logger.warning(f"Failed to send mentor assignment email to {to_email}")
-            return False
         
-    except Exception as e:
+        # Queue the SMTP round-trip; the request only pays for rendering
+        send_mail_task.delay(subject, text_content, html_content, settings.DEFAULT_FROM_EMAIL, [to_email])
+        logger.info(f"Mentor assignment email queued for {to_email}")
+        return True
+        
+    except EMAIL_ERRORS as e:
         logger.error(f"Failed to send mentor assignment email to {to_email}: {e}")
         return False
 
@@ -148,7 +387,8 @@ def send_user_assignment_to_mentor(
     to_email: str,
     student_name: str,
     mentor_name: str,
-    student_email: str
+    student_email: str,
+    connection=None
 ) -> bool:
     """
     Send notification to mentor about new mentee assignment.
@@ -158,6 +398,7 @@ def send_user_assignment_to_mentor(
         student_name: Student's full name
         mentor_name: Mentor's name
         student_email: Student's email
+        connection: Open mail connection to reuse (optional)
         
     Returns:
         bool: True if email sent successfully, False otherwise
@@ -176,8 +417,7 @@ def send_user_assignment_to_mentor(
             'site_url': getattr(settings, 'SITE_BASE_URL', 'https://college-portal.example.com'),
         }
         
-        html_content = render_to_string('emails/user_assignment_to_mentor.html', context)
-        text_content = render_to_string('emails/user_assignment_to_mentor.txt', context)
+        html_content, text_content = _render_email('user_assignment_to_mentor', context)
         
         result = send_mail(
             subject=subject,
@@ -186,6 +426,7 @@ def send_user_assignment_to_mentor(
             recipient_list=[to_email],
             html_message=html_content,
             fail_silently=True,
+            connection=connection,
         )
         
         if result:
@@ -195,11 +436,60 @@ def send_user_assignment_to_mentor(
             logger.error(f"Failed to send user assignment email to mentor {to_email}")
             return False
             
-    except Exception as e:
+    except EMAIL_ERRORS as e:
         logger.error(f"Failed to send user assignment email to mentor {to_email}: {e}")
         return False
 
 
+# Bodies of the mentor's "new student" email; only the slots are filled per send
+_MENTOR_NOTIFICATION_HTML = """
+<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+        .header {{ background-color: #67e8f9; color: #fff; padding: 10px; text-align: center; }}
+        .content {{ padding: 20px; }}
+        .student-info {{ background-color: #f5f5f5; padding: 15px; margin: 15px 0; border-left: 4px solid #67e8f9; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h2>New Student Assignment</h2>
+        </div>
+        <div class="content">
+            <p>Hello {mentor_name},</p>
+            <p>You have been assigned a new student in the College Portal:</p>
+            
+            <div class="student-info">
+                <p><strong>Student:</strong> {student_name}</p>
+                <p><strong>Email:</strong> {student_email}</p>
+                <p><strong>Phone:</strong> {student_phone}</p>
+            </div>
+            
+            <p>Please reach out to the student to introduce yourself and provide guidance.</p>
+            <p>Best regards,<br>College Portal Team</p>
+        </div>
+    </div>
+</body>
+</html>
+""".format
+
+_MENTOR_NOTIFICATION_TEXT = """Hello {mentor_name},
+
+You have been assigned a new student in the College Portal:
+
+Student: {student_name}
+Email: {student_email}
+Phone: {student_phone}
+
+Please reach out to the student to introduce yourself and provide guidance.
+
+Best regards,
+College Portal Team""".format
+
+
 def send_mentor_notification_to_mentor(mentor, student_user, student_profile=None) -> bool:
     """
     Send notification to mentor about new student assignment.
@@ -207,7 +497,8 @@ def send_mentor_notification_to_mentor(mentor, student_user, student_profile=Non
     Args:
         mentor: Mentor instance
         student_user: User instance of the student
-        student_profile: UserProfile instance of the student (optional)
+        student_profile: UserProfile of the student; pass it when already loaded
+            to skip the profile lookup (optional)
         
     Returns:
         bool: True if email sent successfully, False otherwise
@@ -226,59 +517,38 @@ def send_mentor_notification_to_mentor(mentor, student_user, student_profile=Non
         # Get student information with fallbacks
         student_name = student_user.get_full_name() or student_user.first_name or student_user.username
         
-        # Get student phone safely
+        # Get student phone safely; callers that already hold the profile pass it
+        # in so no lazy profile SELECT is needed
         student_phone = "Not provided"
-        if student_profile and hasattr(student_profile, 'phone'):
+        if student_profile is None:
+            student_profile = getattr(student_user, 'profile', None)
+        if student_profile is not None and student_profile.phone:
             student_phone = student_profile.phone
-        elif hasattr(student_user, 'profile') and hasattr(student_user.profile, 'phone'):
-            student_phone = student_user.profile.phone
             
-        html_content = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #67e8f9; color: #fff; padding: 10px; text-align: center; }}
-                .content {{ padding: 20px; }}
-                .student-info {{ background-color: #f5f5f5; padding: 15px; margin: 15px 0; border-left: 4px solid #67e8f9; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h2>New Student Assignment</h2>
-                </div>
-                <div class="content">
-                    <p>Hello {mentor.name},</p>
-                    <p>You have been assigned a new student in the College Portal:</p>
-                    
-                    <div class="student-info">
-                        <p><strong>Student:</strong> {student_name}</p>
-                        <p><strong>Email:</strong> {student_user.email}</p>
-                        <p><strong>Phone:</strong> {student_phone}</p>
-                    </div>
-                    
-                    <p>Please reach out to the student to introduce yourself and provide guidance.</p>
-                    <p>Best regards,<br>College Portal Team</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        slots = {
+            'mentor_name': mentor.name,
+            'student_name': student_name,
+            'student_email': student_user.email,
+            'student_phone': student_phone,
+        }
+        html_content = _MENTOR_NOTIFICATION_HTML(**slots)
+        text_content = _MENTOR_NOTIFICATION_TEXT(**slots)
         
-        text_content = f"""Hello {mentor.name},
-
-You have been assigned a new student in the College Portal:
-
-Student: {student_name}
-Email: {student_user.email}
-Phone: {student_phone}
-
-Please reach out to the student to introduce yourself and provide guidance.
-
-Best regards,
-College Portal Team"""
+        # Hand the admin copy to the task pool first so its SMTP session
+        # runs alongside the mentor email instead of after it
+        try:
+            admin_email = _admin_email()
+            if admin_email and admin_email != mentor.email:
+                send_mail_task.delay(
+                    f"Mentor Assignment: {student_name} to {mentor.name}",
+                    f"A student has been assigned to a mentor:\nStudent: {student_name}\nMentor: {mentor.name}\nMentor Email: {mentor.email}",
+                    None,
+                    settings.DEFAULT_FROM_EMAIL,
+                    [admin_email],
+                )
+                logger.info(f"Admin notification queued for {admin_email} about mentor assignment")
+        except Exception as e:
+            logger.error(f"Failed to queue admin notification about mentor assignment: {e}")
         
         msg = EmailMultiAlternatives(
             subject=subject,
@@ -287,24 +557,8 @@ College Portal Team"""
             to=[mentor.email],
         )
         msg.attach_alternative(html_content, "text/html")
-        
         result = msg.send(fail_silently=True)
         
-        # Also send a copy to admin
-        try:
-            admin_email = settings.ADMIN_EMAIL if hasattr(settings, 'ADMIN_EMAIL') else settings.DEFAULT_FROM_EMAIL
-            if admin_email and admin_email != mentor.email:
-                admin_msg = EmailMessage(
-                    subject=f"Mentor Assignment: {student_name} to {mentor.name}",
-                    body=f"A student has been assigned to a mentor:\nStudent: {student_name}\nMentor: {mentor.name}\nMentor Email: {mentor.email}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=[admin_email],
-                )
-                admin_msg.send(fail_silently=True)
-                logger.info(f"Admin notification sent to {admin_email} about mentor assignment")
-        except Exception as e:
-            logger.error(f"Failed to send admin notification about mentor assignment: {e}")
-        
         if result:
             logger.info(f"Mentor notification sent to {mentor.email} about student {student_user.email}")
             return True
@@ -312,11 +566,21 @@ College Portal Team"""
             logger.error(f"Failed to send mentor notification to {mentor.email}")
             return False
         
-    except Exception as e:
+    except EMAIL_ERRORS as e:
         logger.error(f"Failed to send mentor notification to {mentor.email if mentor else 'unknown'}: {e}")
         return False
 
 
+@retry_with_backoff(recoverable=(TwilioException, OSError))
+def _create_whatsapp_message(to_phone_e164: str, body: str):
+    """Hand one message to Twilio, retrying 429/5xx and connection errors."""
+    return _get_twilio().messages.create(
+        body=body,
+        from_=_TW_FROM,
+        to=f'whatsapp:{to_phone_e164}'
+    )
+
+
 def send_whatsapp_message(to_phone_e164: str, body: str) -> bool:
     """
     Send WhatsApp message using Twilio API with fallback to email.
@@ -328,48 +592,34 @@ def send_whatsapp_message(to_phone_e164: str, body: str) -> bool:
     Returns:
         bool: True if message sent successfully, False otherwise
     """
+    if not _WHATSAPP_CONFIGURED:
+        logger.warning("Twilio credentials not configured. WhatsApp message not sent.")
+        return False
     if not TWILIO_AVAILABLE:
         logger.warning("Twilio not available. WhatsApp message not sent.")
         return False
         
     try:
-        # Get Twilio credentials from environment
-        account_sid = os.getenv('TWILIO_ACCOUNT_SID')
-        auth_token = os.getenv('TWILIO_AUTH_TOKEN')
-        whatsapp_from = os.getenv('TWILIO_WHATSAPP_FROM')
-        
-        if not all([account_sid, auth_token, whatsapp_from]):
-            logger.warning("Twilio credentials not configured. WhatsApp message not sent.")
-            return False
-            
-        # Initialize Twilio client
-        client = TwilioClient(account_sid, auth_token)
-        
-        # Send WhatsApp message
-        message = client.messages.create(
-            body=body,
-            from_=whatsapp_from,
-            to=f'whatsapp:{to_phone_e164}'
-        )
-        
-        logger.info(f"WhatsApp message sent to {to_phone_e164}. SID: {message.sid}")
-        return True
-        
-    except TwilioException as e:
-        logger.error(f"Twilio error sending WhatsApp to {to_phone_e164}: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"Unexpected error sending WhatsApp to {to_phone_e164}: {e}")
+        message = _create_whatsapp_message(to_phone_e164, body)
+    except (TwilioException, OSError) as e:
+        logger.error(f"Failed to send WhatsApp to {to_phone_e164}: {e}")
         return False
+    
+    logger.info(f"WhatsApp message sent to {to_phone_e164}. SID: {message.sid}")
+    return True
 
 
-def send_mentor_assignment_notifications(user, mentor) -> bool:
+def send_mentor_assignment_notifications(user, mentor, connection=None, profile=None, send_whatsapp=True) -> bool:
     """
     Send both email and WhatsApp notifications for mentor assignment.
     
     Args:
-        user: User instance
+        user: User instance; load it with select_related('profile') when
+            ``profile`` is not given
         mentor: Mentor instance
+        connection: Open mail connection to send both emails on (optional)
+        profile: The student's UserProfile, when the caller already has it (optional)
+        send_whatsapp: False when the caller sends the WhatsApp message itself
         
     Returns:
         bool: True if at least one notification sent successfully
@@ -385,13 +635,19 @@ def send_mentor_assignment_notifications(user, mentor) -> bool:
     if not whatsapp_link:
         whatsapp_link = "https://chat.whatsapp.com/default-group"
     
+    # Start the WhatsApp send first so its HTTP round-trip overlaps the SMTP sends
+    phone, whatsapp_body = _assignment_whatsapp(user, mentor, profile) if send_whatsapp else ('', '')
+    
+    whatsapp_future = _whatsapp_executor.submit(send_whatsapp_message, phone, whatsapp_body) if phone else None
+    
     # Send email notification to the student
     email_sent_to_student = send_mentor_assignment(
         to_email=user.email,
         student_name=student_name,
         mentor_name=mentor.name,
         portfolio_url=portfolio_url,
-        whatsapp_link=whatsapp_link
+        whatsapp_link=whatsapp_link,
+        connection=connection
     )
 
     # Send email notification to the mentor
@@ -399,83 +655,96 @@ def send_mentor_assignment_notifications(user, mentor) -> bool:
         to_email=mentor.email,
         student_name=student_name,
         mentor_name=mentor.name,
-        student_email=user.email
+        student_email=user.email,
+        connection=connection
     )
     
-    # Send WhatsApp notification
-    whatsapp_body = f"""Hello {student_name},
+    whatsapp_sent = whatsapp_future.result() if whatsapp_future else False
+    
+    return email_sent_to_student or email_sent_to_mentor or whatsapp_sent
 
-Your mentor {mentor.name} has been assigned to you!
 
-Portfolio: {mentor.portfolio_url or 'Not available'}
-WhatsApp Group: {mentor.whatsapp_group_link or 'Not available'}
+def _assignment_whatsapp(user, mentor, profile=None) -> tuple:
+    """The (E.164 phone, body) WhatsApp message telling a student about their mentor."""
+    body = _MENTOR_ASSIGNED_WHATSAPP(
+        student_name=user.get_full_name() or user.first_name or user.email,
+        mentor_name=mentor.name,
+        portfolio=mentor.portfolio_url or 'Not available',
+        group=mentor.whatsapp_group_link or 'Not available',
+    )
+    return format_phone_for_whatsapp((profile or user.profile).phone), body
 
-Please contact your mentor for guidance and support.
 
-Best regards,
-College Portal Team"""
-    
-    whatsapp_sent = False
-    if user.profile.phone:
-        # Format phone number for WhatsApp (basic E.164 formatting)
-        phone = user.profile.phone.strip()
-        if not phone.startswith('+'):
-            # Assume Indian number if no country code
-            if phone.startswith('0'):
-                phone = '+91' + phone[1:]
-            elif len(phone) == 10:
-                phone = '+91' + phone
-            else:
-                phone = '+' + phone
-                
-        whatsapp_sent = send_whatsapp_message(phone, whatsapp_body)
+def send_whatsapp_batch(items) -> list:
+    """
+    Send several WhatsApp messages concurrently on the shared WhatsApp pool.
     
-    return email_sent_to_student or email_sent_to_mentor or whatsapp_sent
+    Args:
+        items: Iterable of (phone_e164, body) tuples
+        
+    Returns:
+        list: One bool per item, in order, True where the message was sent
+    """
+    return list(_whatsapp_executor.map(lambda item: send_whatsapp_message(*item), items))
+
+
+def send_bulk_notifications(pairs) -> int:
+    """
+    Send mentor assignment notifications for many (user, mentor) pairs.
+    
+    All emails go out over one SMTP connection, so the TLS and AUTH
+    handshake is paid once rather than once per message, while the
+    WhatsApp messages run on the shared WhatsApp pool alongside them.
+    
+    Args:
+        pairs: Iterable of (User, Mentor) tuples; users should have their
+            profile loaded
+        
+    Returns:
+        int: Number of assignments for which at least one notification went out
+    """
+    pairs = list(pairs)
+    # Queue every WhatsApp message before the emails so they run alongside them;
+    # students without a phone number get none
+    whatsapp = [
+        _whatsapp_executor.submit(send_whatsapp_message, phone, body) if phone else None
+        for phone, body in (_assignment_whatsapp(user, mentor) for user, mentor in pairs)
+    ]
+    
+    with get_connection() as connection:
+        emailed = [
+            send_mentor_assignment_notifications(user, mentor, connection=connection, send_whatsapp=False)
+            for user, mentor in pairs
+        ]
+    
+    whatsapp_sent = [future.result() if future else False for future in whatsapp]
+    return sum(1 for email_ok, whatsapp_ok in zip(emailed, whatsapp_sent) if email_ok or whatsapp_ok)
 
 
 def send_welcome_email(user) -> bool:
     """
-    Send welcome email to newly registered user.
+    Queue the welcome email for a newly registered user.
     
     Args:
         user: User instance
         
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True once the email has been queued
     """
-    try:
-        subject = "Welcome to College Portal"
-        full_name = user.get_full_name() or user.first_name or user.username
-        
-        message = f"""Hello {full_name},
+    send_welcome_email_task.delay(user.pk)
+    return True
 
-Welcome to the College Portal! Your account has been created successfully.
 
-Please check your email for verification instructions to activate your account.
+def _read_attachment(path: str) -> bytes:
+    """Bytes of an attachment file, read once per version of the file."""
+    return _read_file_version(path, os.stat(path).st_mtime_ns)
 
-Once verified, you'll be able to:
-- Access academic programs and information
-- Request mentor assignment
-- View your academic records
-- Contact college administration
 
-Best regards,
-College Portal Team"""
-        
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False
-        )
-        
-        logger.info(f"Welcome email sent to {user.email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send welcome email to {user.email}: {e}")
-        return False
+@lru_cache(maxsize=4)
+def _read_file_version(path: str, mtime_ns: int) -> bytes:
+    """Contents of ``path`` as of ``mtime_ns``; a new mtime reads it again."""
+    with open(path, 'rb') as f:
+        return f.read()
 
 
 def send_registration_email(user, full_name: str, portal_link: str, brochure_path: str = None) -> bool:
@@ -499,13 +768,7 @@ def send_registration_email(user, full_name: str, portal_link: str, brochure_pat
         
     try:
         subject = "Welcome to College Portal - Get Started"
-        html_content = render_to_string('emails/registration_email.html', {
-            'full_name': full_name or "User",
-            'portal_link': portal_link or f"{settings.SITE_BASE_URL}/login/",
-            'site_url': settings.SITE_BASE_URL,
-            'current_year': timezone.now().year,
-        })
-        text_content = render_to_string('emails/registration_email.txt', {
+        html_content, text_content = _render_email('registration_email', {
             'full_name': full_name or "User",
             'portal_link': portal_link or f"{settings.SITE_BASE_URL}/login/",
             'site_url': settings.SITE_BASE_URL,
@@ -522,36 +785,36 @@ def send_registration_email(user, full_name: str, portal_link: str, brochure_pat
 
         # Default brochure path if not provided
         if not brochure_path:
-            brochure_path = os.path.join(settings.BASE_DIR, 'static', 'brochures', 'mca_brochure.pdf')
+            brochure_path = BROCHURE_PATH
             
         # Attach brochure if exists
         if os.path.exists(brochure_path):
             try:
-                with open(brochure_path, 'rb') as f:
-                    msg.attach(os.path.basename(brochure_path), f.read(), 'application/pdf')
-                    logger.info(f"Attached brochure to email for {user.email}")
+                msg.attach(os.path.basename(brochure_path), _read_attachment(brochure_path), 'application/pdf')
+                logger.info(f"Attached brochure to email for {user.email}")
             except Exception as e:
                 logger.warning(f"Failed to attach brochure {brochure_path}: {e}")
         else:
             logger.warning(f"Brochure not found at {brochure_path}")
 
-        # Send to user with real-time delivery
-        result = msg.send(fail_silently=False)
-        
-        # Also send a copy to admin
+        # Queue the admin copy first so it goes out on its own session
+        # while the user email (with the brochure) is being sent
         try:
-            admin_email = settings.ADMIN_EMAIL if hasattr(settings, 'ADMIN_EMAIL') else settings.DEFAULT_FROM_EMAIL
+            admin_email = _admin_email()
             if admin_email and admin_email != user.email:
-                admin_msg = EmailMultiAlternatives(
-                    subject=f"New User Registration: {full_name}",
-                    body=f"A new user has registered:\nName: {full_name}\nEmail: {user.email}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=[admin_email],
+                send_mail_task.delay(
+                    f"New User Registration: {full_name}",
+                    f"A new user has registered:\nName: {full_name}\nEmail: {user.email}",
+                    None,
+                    settings.DEFAULT_FROM_EMAIL,
+                    [admin_email],
                 )
-                admin_msg.send(fail_silently=True)
-                logger.info(f"Admin notification sent to {admin_email} about new user {user.email}")
+                logger.info(f"Admin notification queued for {admin_email} about new user {user.email}")
         except Exception as e:
-            logger.error(f"Failed to send admin notification about {user.email}: {e}")
+            logger.error(f"Failed to queue admin notification about {user.email}: {e}")
+        
+        # Send to user with real-time delivery
+        result = msg.send(fail_silently=False)
         
         if result:
             logger.info(f"Registration email sent to {user.email}")
@@ -560,56 +823,29 @@ def send_registration_email(user, full_name: str, portal_link: str, brochure_pat
             logger.error(f"Failed to send registration email to {user.email}")
             return False
 
-    except Exception as e:
+    except EMAIL_ERRORS as e:
         logger.error(f"Failed to send registration email to {user.email}: {e}")
         return False
 
 
 def send_verification_confirmation(user) -> bool:
     """
-    Send email confirmation when user's email is verified.
+    Queue the confirmation email sent once a user's email is verified.
     
     Args:
         user: User instance
         
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True once the email has been queued
     """
-    try:
-        subject = "Account Verified - College Portal"
-        full_name = user.get_full_name() or user.first_name or user.username
-        
-        message = f"""Hello {full_name},
-
-Congratulations! Your account has been verified successfully.
+    send_verification_confirmation_task.delay(user.pk)
+    return True
 
-You can now access all features of the College Portal:
-- View academic programs
-- Request mentor assignment
-- Access your profile and academic records
-- Contact college administration
 
-Login at: {settings.SITE_BASE_URL}/login/
-
-Best regards,
-College Portal Team"""
-        
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False
-        )
-        
-        logger.info(f"Verification confirmation email sent to {user.email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send verification confirmation to {user.email}: {e}")
-        return False
+_strip_non_phone_chars = re.compile(r'[^\d+]').sub
 
 
+@lru_cache(maxsize=4096)
 def format_phone_for_whatsapp(phone: str) -> str:
     """
     Format phone number for WhatsApp E.164 format.
@@ -624,53 +860,115 @@ def format_phone_for_whatsapp(phone: str) -> str:
         return ""
         
     # Remove all non-digit characters except +
-    cleaned = ''.join(c for c in phone if c.isdigit() or c == '+')
+    cleaned = _strip_non_phone_chars('', phone)
+    if '+' in cleaned[1:]:  # '+' is only meaningful as the leading character
+        cleaned = cleaned[0] + cleaned[1:].replace('+', '')
     
     # If it starts with +, return as is
-    if cleaned.startswith('+'):
+    if cleaned[:1] == '+':
         return cleaned
     
-    # Handle Indian numbers
-    if cleaned.startswith('0') and len(cleaned) == 11:
+    # Indian numbers: 0XXXXXXXXXX trunk-prefixed or bare 10-digit mobile
+    if len(cleaned) == 11 and cleaned[0] == '0':
         return '+91' + cleaned[1:]
-    elif len(cleaned) == 10:
+    if len(cleaned) == 10:
         return '+91' + cleaned
     
-    # If it's already 12 digits, assume it has country code
-    if len(cleaned) == 12:
-        return '+' + cleaned
+    # Anything else (e.g. 12 digits) already carries its country code
+    return '+' + cleaned
+
+
+PINCODE_CACHE_TIMEOUT = 60 * 60 * 24 * 30  # pincode areas practically never change
+PINCODE_MISS_TIMEOUT = 60 * 60
+PINCODE_API_ROOT = "https://api.postalpincode.in"
+
+
+def prewarm_pincode_api() -> None:
+    """
+    Open a pooled connection to the pincode API in the background.
+    
+    DNS and the TLS handshake are done before the first lookup needs them;
+    a failure is ignored and that lookup simply connects itself.
+    """
+    if _HTTP_SESSION is None:
+        return
+    
+    def warm():
+        try:
+            _HTTP_SESSION.head(f"{PINCODE_API_ROOT}/", timeout=(2, 2))
+        except Exception as e:
+            logger.debug(f"Pincode API prewarm failed: {e}")
+    
+    threading.Thread(target=warm, name="pincode-prewarm", daemon=True).start()
+
+
+def _fetch_pincode_info(pincode: str) -> Optional[dict]:
+    """Look a PINCODE up upstream; {} if unknown, None if the lookup failed."""
+    if _HTTP_SESSION is None:
+        logger.warning("requests not installed. Pincode lookup skipped.")
+        return None
+    
+    try:
+        response = _HTTP_SESSION.get(
+            f"{PINCODE_API_ROOT}/pincode/{pincode}",
+            timeout=(2, 5),  # (connect, read)
+        )
+        data = response.json()
+    except Exception as e:
+        logger.error(f"Failed to fetch pincode info for {pincode}: {e}")
+        return None
     
-    # Default: add + if not present
-    return '+' + cleaned if not cleaned.startswith('+') else cleaned
+    if data and data[0].get('Status') == 'Success':
+        post_office = data[0].get('PostOffice', [{}])[0]
+        return {
+            'city': post_office.get('District', ''),
+            'state': post_office.get('State', ''),
+            'country': post_office.get('Country', 'India')
+        }
+    return {}
+
+
+def _shared_pincode_info(pincode: str) -> Optional[dict]:
+    """Pincode info through the shared cache; None if the lookup failed."""
+    from django.core.cache import cache
+    
+    key = f"pincode:{pincode}"
+    info = cache.get(key)
+    if info is None:
+        info = _fetch_pincode_info(pincode)
+        if info is not None:
+            cache.set(key, info, PINCODE_CACHE_TIMEOUT if info else PINCODE_MISS_TIMEOUT)
+    return info
+
+
+@lru_cache(maxsize=4096)
+def _pin_lookup(pincode: str) -> tuple:
+    """(city, state, country) for a known PINCODE, memoised for the process."""
+    info = _shared_pincode_info(pincode)
+    if not info:
+        raise LookupError(pincode)  # misses and failures are not memoised
+    return info['city'], info['state'], info['country']
 
 
 def get_pincode_info(pincode: str) -> dict:
     """
     Fetch city and state information from PINCODE using external API.
     
+    Known pincodes are memoised per process and kept in the shared cache
+    for a month; unknown pincodes are remembered in the shared cache for an
+    hour, failed lookups are not cached at all.
+    
     Args:
         pincode: 6-digit PINCODE
         
     Returns:
         dict: City and state information or empty dict if not found
     """
-    import requests
-    
     try:
-        response = requests.get(f"https://api.postalpincode.in/pincode/{pincode}", timeout=5)
-        data = response.json()
-        
-        if data and data[0].get('Status') == 'Success':
-            post_office = data[0].get('PostOffice', [{}])[0]
-            return {
-                'city': post_office.get('District', ''),
-                'state': post_office.get('State', ''),
-                'country': post_office.get('Country', 'India')
-            }
-    except Exception as e:
-        logger.error(f"Failed to fetch pincode info for {pincode}: {e}")
-    
-    return {}
+        city, state, country = _pin_lookup(pincode)
+    except LookupError:
+        return {}
+    return {'city': city, 'state': state, 'country': country}
 
 
 def log_notification_sent(notification_type: str, recipient: str, status: str, details: str = "") -> None:
@@ -696,11 +994,13 @@ def cleanup_expired_tokens() -> int:
     from .models import EmailVerificationToken
     
     try:
-        expired_tokens = EmailVerificationToken.objects.filter(
+        # delete() reports the number of rows removed, no separate count() needed.
+        # Tokens have no dependent rows or delete signals, so Django's fast
+        # path issues a single DELETE ... WHERE without collecting PKs first;
+        # keep it that way (no post_delete receivers on this model).
+        count, _ = EmailVerificationToken.objects.filter(
             expires_at__lt=timezone.now()
-        )
-        count = expired_tokens.count()
-        expired_tokens.delete()
+        ).delete()
         
         if count > 0:
             logger.info(f"Cleaned up {count} expired email verification tokens")
@@ -718,3 +1018,63 @@ def cleanup_expired_tokens() -> int:
 
 
 
+
+
+
+def cleanup_old_registration_logs(days: int = 365) -> int:
+    """
+    Delete registration logs older than the retention window.
+    
+    Args:
+        days: Number of days of logs to keep
+        
+    Returns:
+        int: Number of logs deleted
+    """
+    from .models import RegistrationLog
+    
+    try:
+        cutoff_date = timezone.now() - timezone.timedelta(days=days)
+        # Nothing cascades from RegistrationLog, so this is a single DELETE
+        count, _ = RegistrationLog.objects.filter(created_at__lt=cutoff_date).delete()
+        
+        if count > 0:
+            logger.info(f"Cleaned up {count} old registration logs")
+        
+        return count
+    except Exception as e:
+        logger.error(f"Failed to cleanup old logs: {e}")
+        return 0
+
+ADMIN_COUNT_CACHE_KEY = "admin_count"
+STAFF_EMAILS_CACHE_KEY = "staff_emails"
+MAX_ADMIN_USERS = 4
+
+
+def get_admin_count() -> int:
+    """
+    Return the number of staff users, cached until staff membership changes.
+    
+    Returns:
+        int: Number of users with is_staff=True
+    """
+    from django.contrib.auth.models import User
+    from django.core.cache import cache
+    
+    return cache.get_or_set(
+        ADMIN_COUNT_CACHE_KEY,
+        lambda: User.objects.filter(is_staff=True).count(),
+        300,
+    )
+
+
+def get_staff_emails() -> list:
+    """Return the staff users' email addresses, cached until staff membership changes."""
+    from django.contrib.auth.models import User
+    from django.core.cache import cache
+    
+    return cache.get_or_set(
+        STAFF_EMAILS_CACHE_KEY,
+        lambda: list(User.objects.filter(is_staff=True).values_list("email", flat=True)),
+        300,
+    )
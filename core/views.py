@@ -1,3 +1,4 @@
+import logging
 import os
 from datetime import timedelta
 from django.contrib import messages
@@ -16,18 +17,20 @@ from django.http import JsonResponse
 from django.shortcuts import redirect, render
 from django.utils import timezone
 from django.contrib.auth.tokens import default_token_generator
-from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.conf import settings
 from django.urls import reverse
 
+logger = logging.getLogger(__name__)
+
 
 def forgot_password(request: HttpRequest) -> HttpResponse:
 	"""Display and process forgot password form."""
 	if request.method == "POST":
 		email = request.POST.get("email", "").strip().lower()
-		user = User.objects.filter(email=email).first()
+		# make_token() hashes only these columns
+		user = User.objects.filter(email=email).only("pk", "email", "password", "last_login").first()
 		if not user:
 			messages.error(request, "No user found with that email address.")
 			return render(request, "public/forgot_password.html")
@@ -37,95 +40,40 @@ def forgot_password(request: HttpRequest) -> HttpResponse:
 		reset_url = request.build_absolute_uri(
 			reverse("password_reset_confirm", kwargs={"uidb64": uid, "token": token})
 		)
-		# Send email using direct method
-		try:
-			from core.send_email import send_direct_email
-			
-			html_content = f"""
-			<!DOCTYPE html>
-			<html>
-			<head>
-				<style>
-					body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
-					.container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-					.button {{ background-color: #4CAF50; color: white; padding: 10px 20px; 
-							text-decoration: none; border-radius: 5px; display: inline-block; }}
-				</style>
-			</head>
-			<body>
-				<div class="container">
-					<h2>Password Reset Request</h2>
-					<p>Hello {user.get_full_name() or user.username},</p>
-					<p>We received a request to reset your password. Click the button below to reset it:</p>
-					<p><a href="{reset_url}" class="button">Reset Password</a></p>
-					<p>If you didn't request this, you can safely ignore this email.</p>
-					<p>This link will expire in 24 hours.</p>
-					<p>Best regards,<br>College Portal Team</p>
-				</div>
-			</body>
-			</html>
-			"""
-			
-			text_content = f"""
-			Password Reset Request
-			
-			Hello {user.get_full_name() or user.username},
-			
-			We received a request to reset your password. Please visit the link below to reset it:
-			
-			{reset_url}
-			
-			If you didn't request this, you can safely ignore this email.
-			
-			This link will expire in 24 hours.
-			
-			Best regards,
-			College Portal Team
-			"""
-			
-			email_sent = send_direct_email(
-				to_emails=user.email,
-				subject="Password Reset for College Portal",
-				html_content=html_content,
-				text_content=text_content
-			)
-			
-			if not email_sent:
-				# Fallback to traditional method
-				subject = "Password Reset for College Portal"
-				message = render_to_string("emails/password_reset.txt", {"user": user, "reset_url": reset_url})
-				send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email])
-				
-		except Exception:
-			# Fallback to traditional method if direct method fails
-			subject = "Password Reset for College Portal"
-			message = render_to_string("emails/password_reset.txt", {"user": user, "reset_url": reset_url})
-			send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email])
+		# The task renders and sends the email after the response
+		send_password_reset_task.delay(user.pk, reset_url)
 		
 		messages.success(request, "A password reset link has been sent to your email.")
 		return render(request, "public/forgot_password.html")
 	return render(request, "public/forgot_password.html")
+import heapq
+import json
 import os
 from datetime import timedelta
+from functools import lru_cache
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.csrf import csrf_protect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.contrib.auth.password_validation import validate_password
 from django.core.mail import send_mail
-from django.core.signing import TimestampSigner, BadSignature, SignatureExpired
+from django.core.signing import BadSignature, SignatureExpired
 from django.db import transaction
+from django.db.models import Q
 from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
 from django.http import JsonResponse
+from django.core.cache import cache
 from django.shortcuts import redirect, render
 from django.utils import timezone
+from django.views.decorators.cache import cache_control
 
 from .models import (
 	AcademicRecord,
-	EmailVerificationToken,
+	Institution,
 	Mentor,
 	MentorAssignment,
 	PageContent,
@@ -136,25 +84,32 @@ from .models import (
 	Visitor,
 )
 from .utils import (
+	BROCHURE_PATH,
+	fetch_json,
+	read_verification_token,
 	send_verification_email, 
-	send_mentor_assignment, 
 	send_whatsapp_message,
-	send_mentor_notification_to_mentor,
     send_registration_email
 )
+from .tasks import (
+	send_direct_email_task,
+	send_mentor_notification_task,
+	send_mentor_request_admin_task,
+	send_password_reset_task,
+)
+from .tracking import record_visit
 
 
 def _track_visit(request: HttpRequest, path: str) -> None:
 	"""Record a simple visitor log for analytics.
 
 	Inputs: HttpRequest, path string
-	Side-effects: Creates a Visitor row.
+	Side-effects: Queues a Visitor row (see core.tracking).
 	"""
-	Visitor.objects.create(
+	record_visit(
 		ip_address=request.META.get("REMOTE_ADDR", "0.0.0.0"),
 		path=path,
-		page_visited=path,  # Store the page path for analytics
-		user=request.user if request.user.is_authenticated else None,
+		user_id=request.user.pk if request.user.is_authenticated else None,
 		user_agent=request.META.get("HTTP_USER_AGENT", ""),
 	)
 
@@ -171,7 +126,6 @@ def register_get(request: HttpRequest) -> HttpResponse:
 	return render(request, "public/register.html")
 
 
-@transaction.atomic
 @csrf_protect
 def register_post(request: HttpRequest) -> HttpResponse:
 	"""Process registration submission with server-side validation.
@@ -205,24 +159,8 @@ def register_post(request: HttpRequest) -> HttpResponse:
 		return redirect("register_get")
 
 	first_name = full_name.split(" ")[0]
-	username = email
-	user = User.objects.create_user(username=username, email=email, password=password, first_name=first_name)
-
-	# Create profile explicitly (signals don't auto-create to avoid test collisions)
-	profile = UserProfile.objects.create(user=user)
-
-	profile.full_name = full_name
-	profile.dob = request.POST.get("dob") or None
-	profile.father_name = request.POST.get("father_name", "")
-	profile.mother_name = request.POST.get("mother_name", "")
-	profile.phone = request.POST.get("phone", "")
-	profile.city = request.POST.get("city", "")
-	profile.pincode = request.POST.get("pincode", "")
-	profile.cet_taken = request.POST.get("cet_taken") == "yes"
-	# Allow immediate access without admin verification
-	profile.verified = True
-	profile.registration_source = "web"
-	profile.save()
+	# Hash and parse before opening the transaction; PBKDF2 is the slowest step here
+	password_hash = make_password(password)
 
 	# Academic records (expect arrays)
 	levels = request.POST.getlist("level[]")
@@ -230,25 +168,49 @@ def register_post(request: HttpRequest) -> HttpResponse:
 	institutions = request.POST.getlist("institution[]")
 	years = request.POST.getlist("year[]")
 	percentages = request.POST.getlist("percentage[]")
-	for i in range(len(levels)):
-		if levels[i] and degrees[i]:
-			AcademicRecord.objects.create(
-				user=user,
-				level=levels[i],
-				degree=degrees[i],
-				institution=institutions[i],
-				year=int(years[i] or 0),
-				percentage=float(percentages[i] or 0),
-			)
-			
+	academics = [
+		{
+			"level": levels[i],
+			"degree": degrees[i],
+			"institution": institutions[i],
+			"year": int(years[i] or 0),
+			"percentage": float(percentages[i] or 0),
+		}
+		for i in range(len(levels))
+		if levels[i] and degrees[i]
+	]
+
+	# Only the writes hold the transaction open
+	with transaction.atomic():
+		user = User.objects.create(username=email, email=email, password=password_hash, first_name=first_name)
+
+		# Create profile explicitly (signals don't auto-create to avoid test collisions)
+		UserProfile.objects.create(
+			user=user,
+			full_name=full_name,
+			dob=request.POST.get("dob") or None,
+			father_name=request.POST.get("father_name", ""),
+			mother_name=request.POST.get("mother_name", ""),
+			phone=request.POST.get("phone", ""),
+			city=request.POST.get("city", ""),
+			pincode=request.POST.get("pincode", ""),
+			cet_taken=request.POST.get("cet_taken") == "yes",
+			# Allow immediate access without admin verification
+			verified=True,
+			registration_source="web",
+		)
+
+		# One multi-row INSERT for all rows
+		AcademicRecord.objects.bulk_create(
+			[AcademicRecord(user=user, **academic) for academic in academics],
+			batch_size=50,
+		)
+		RegistrationLog.objects.create(user=user, ip=request.META.get("REMOTE_ADDR"), status="submitted")
+
 	# Send registration email with brochure
 	# Always create the user account even if email fails
 	login_url = f"{settings.SITE_BASE_URL}/login/"
-	brochure_path = os.path.join(settings.BASE_DIR, 'static', 'brochures', 'mca_brochure.pdf')
 	
-	from core.send_email import send_direct_email
-	import logging
-	logger = logging.getLogger(__name__)
 	
 	# Prepare email content
 	html_content = f"""
@@ -290,43 +252,15 @@ def register_post(request: HttpRequest) -> HttpResponse:
 	College Portal Team
 	"""
 	
-	# Try to send email but don't block registration if it fails
-	try:
-		# Send email with fallback options
-		email_sent = send_direct_email(
-			to_emails=email,
-			subject="Welcome to College Portal",
-			html_content=html_content,
-			text_content=text_content,
-			attachments=[brochure_path] if os.path.exists(brochure_path) else None,
-			fallback_to_console=True
-		)
-		
-		# Log the email attempt
-		RegistrationLog.objects.create(
-			user=user,
-			email=email,
-			email_sent=email_sent,
-			source="web"
-		)
-		
-		# Even if email fails, we'll still create the account and let the user log in
-		if email_sent:
-			logger.info(f"Registration email sent to {email} using direct method")
-		else:
-			logger.error(f"Failed to send registration email to {email}")
-	except Exception as e:
-		logger.error(f"Failed to send registration email to {email}: {e}")
-
-	# Optional: keep token for audit, but we won't require email verification
-	signer = TimestampSigner()
-	raw = f"{user.pk}:{email}:{timezone.now().timestamp()}"
-	token = signer.sign(raw)
-	EmailVerificationToken.objects.create(
-		user=user,
-		token=token,
-		expires_at=timezone.now() + timedelta(hours=24),
+	# Queue the email after the commit; a mail failure never blocks registration
+	send_direct_email_task.delay(
+		to_emails=email,
+		subject="Welcome to College Portal",
+		html_content=html_content,
+		text_content=text_content,
+		attachments=[BROCHURE_PATH] if os.path.exists(BROCHURE_PATH) else None,
 	)
+	logger.info(f"Registration email queued for {email}")
 
 	# Email has already been sent above, no need to send again
 	# Commenting out the duplicate email sending to prevent errors
@@ -334,7 +268,6 @@ def register_post(request: HttpRequest) -> HttpResponse:
 	# brochure_path = os.path.join(settings.BASE_DIR, 'static', 'brochures', 'mca_brochure.pdf')
 	# send_registration_email(user=user, full_name=full_name, portal_link=portal_link, brochure_path=brochure_path)
 
-	RegistrationLog.objects.create(user=user, ip=request.META.get("REMOTE_ADDR"), status="submitted")
 	messages.success(request, "Registration successful. Check your email for the portal link and then log in.")
 	return redirect("login_get")
 
@@ -345,22 +278,22 @@ def verify_email(request: HttpRequest) -> HttpResponse:
 	token = request.GET.get("token", "")
 	if not token:
 		return HttpResponse("Invalid token.")
+	# Tokens are signed and timestamped, so checking them needs no table lookup
 	try:
-		# TimestampSigner doesn't automatically expire; we enforce via DB expires_at
-		EmailVerificationToken.objects.get(token=token)
-		# Validate signature
-		TimestampSigner().unsign(token, max_age=None)
-	except (BadSignature, EmailVerificationToken.DoesNotExist):
+		payload = read_verification_token(token)
+	except SignatureExpired:
+		return HttpResponse("Token expired.")
+	except BadSignature:
 		return HttpResponse("Invalid or expired token.")
 
 	# Mark profile verified
 	try:
-		record = EmailVerificationToken.objects.get(token=token)
-		if record.expires_at < timezone.now():
-			return HttpResponse("Token expired.")
-		profile = UserProfile.objects.get(user=record.user)
+		profile = UserProfile.objects.get(user_id=payload["pk"], user__email=payload["e"])
+	except UserProfile.DoesNotExist:
+		return HttpResponse("Invalid or expired token.")
+	try:
 		profile.verified = True
-		profile.save()
+		profile.save(update_fields=["verified"])
 		messages.success(request, "Email verified. You can now log in.")
 		return redirect("login_get")
 	except Exception:
@@ -379,14 +312,9 @@ def login_post(request: HttpRequest) -> HttpResponse:
 		return redirect("login_get")
 	identifier = request.POST.get("email", "").strip()
 	password = request.POST.get("password", "")
-	# Support both flows: users whose username==email and superusers with separate usernames
-	# Try email first, then username fallback for admins or general users
-	user_obj = User.objects.filter(email__iexact=identifier).first()
-	if user_obj:
-		user = authenticate(request, username=user_obj.username, password=password)
-	else:
-		# Fallback: try authenticating directly with provided identifier as username
-		user = authenticate(request, username=identifier, password=password)
+	# Support both flows: users whose username==email and superusers with separate usernames;
+	# EmailOrUsernameBackend looks up either in one query and hashes once
+	user = authenticate(request, username=identifier, password=password)
 	if not user:
 		messages.error(request, "Invalid credentials.")
 		return redirect("login_get")
@@ -415,6 +343,7 @@ def portal_home(request: HttpRequest) -> HttpResponse:
 @login_required
 def portal_academics(request: HttpRequest) -> HttpResponse:
 	"""Show programs/courses managed via admin (PageContent)."""
+	# Lazy: only queried when the template's programs_list fragment is not cached
 	programs = Program.objects.all()
 	return render(request, "portal/academics.html", {"programs": programs})
 
@@ -422,22 +351,20 @@ def portal_academics(request: HttpRequest) -> HttpResponse:
 @login_required
 def portal_contact(request: HttpRequest) -> HttpResponse:
 	"""Display contact info from DB with mentor request button for logged-in users."""
-	contact_email = PageContent.objects.filter(key="contact:email").first()
-	contact_phone = PageContent.objects.filter(key="contact:phone").first()
+	contact = PageContent.get_many_cached(["contact:email", "contact:phone"])
 	
-	# Check if user already has a mentor assigned
-	has_mentor = False
-	if hasattr(request.user, 'profile') and request.user.profile.assigned_mentor:
-		has_mentor = True
+	# Check if user already has a mentor assigned; one query for profile and mentor
+	profile = UserProfile.objects.select_related("assigned_mentor").filter(user_id=request.user.pk).first()
+	assigned_mentor = profile.assigned_mentor if profile else None
 	
 	return render(
 		request,
 		"portal/contact.html",
 		{
-			"contact_email": contact_email, 
-			"contact_phone": contact_phone,
-			"has_mentor": has_mentor,
-			"assigned_mentor": request.user.profile.assigned_mentor if has_mentor else None
+			"contact_email": contact["contact:email"], 
+			"contact_phone": contact["contact:phone"],
+			"has_mentor": assigned_mentor is not None,
+			"assigned_mentor": assigned_mentor,
 		},
 	)
 
@@ -457,73 +384,16 @@ def request_mentor(request: HttpRequest) -> HttpResponse:
 
 	# Create the request
 	MentorRequest.objects.create(user=request.user, status="pending")
+	RegistrationLog.objects.create(user=request.user, ip=request.META.get("REMOTE_ADDR"), status="mentor_requested")
 
 	# Log the request creation
 	logger.info(f"Mentor request created for user {request.user.username}")
 
-	# Notify admins
-	email_success = True
-	try:
-		from core.send_email import send_direct_email
-		
-		admin_emails = User.objects.filter(is_staff=True).values_list("email", flat=True)
-		if admin_emails:
-			subject = "New Mentor Request Received"
-			dashboard_url = request.build_absolute_uri("/director/dashboard/")
-			
-			# Prepare email content
-			html_content = f"""
-			<!DOCTYPE html>
-			<html>
-			<head>
-				<style>
-					body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
-					.container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-					.button {{ background-color: #4CAF50; color: white; padding: 10px 20px; 
-							text-decoration: none; border-radius: 5px; display: inline-block; }}
-				</style>
-			</head>
-			<body>
-				<div class="container">
-					<h2>New Mentor Request</h2>
-					<p>A new mentor request has been submitted by {request.user.get_full_name() or request.user.username}.</p>
-					<p>Email: {request.user.email}</p>
-					<p><a href="{dashboard_url}" class="button">View Dashboard</a></p>
-					<p>Please review and assign a mentor as soon as possible.</p>
-					<p>Best regards,<br>College Portal System</p>
-				</div>
-			</body>
-			</html>
-			"""
-			
-			text_content = render_to_string(
-				"emails/mentor_request_admin.txt",
-				{"user": request.user, "dashboard_url": dashboard_url}
-			)
-			
-			# Use our robust email function with fallbacks
-			email_sent = send_direct_email(
-				to_emails=list(admin_emails),
-				subject=subject,
-				html_content=html_content,
-				text_content=text_content,
-				fallback_to_console=True
-			)
-			
-			if email_sent:
-				logger.info(f"Admin notification sent for mentor request by {request.user.username}")
-			else:
-				email_success = False
-				logger.warning(f"Failed to send admin notification for mentor request by {request.user.username}")
-	except Exception as e:
-		email_success = False
-		logger.error(f"Failed to send admin notification for mentor request: {e}")
-		# Continue execution even if email fails
-
-	success_message = "Your mentor request has been submitted."
-	if email_success:
-		success_message += " You will be notified once it's reviewed."
-	messages.success(request, success_message)
+	# Notify admins after the response; the task looks up staff and renders the email
+	send_mentor_request_admin_task.delay(request.user.pk, request.build_absolute_uri("/director/dashboard/"))
+	logger.info(f"Admin notification queued for mentor request by {request.user.username}")
+
+	messages.success(request, "Your mentor request has been submitted. You will be notified once it's reviewed.")
 	return redirect("portal_home")
 
 
@@ -538,6 +408,20 @@ def program_detail(request: HttpRequest, program_id: int) -> HttpResponse:
 	return render(request, "portal/program_detail.html", {"program": program})
 
 
+# Seconds the dashboard's visitor and registration totals may lag behind the tables
+DASHBOARD_TOTALS_TIMEOUT = 60
+# User columns the dashboard renders for a student (name, email, link ids)
+_DASHBOARD_USER_FIELDS = ("user__id", "user__username", "user__first_name", "user__last_name", "user__email")
+
+
+def _dashboard_totals() -> dict:
+	"""The dashboard's two table-wide counts, computed together for one cache entry."""
+	return {
+		"visitors": Visitor.objects.count(),
+		"registrations": UserProfile.objects.filter(user__is_staff=False, user__is_superuser=False).count(),
+	}
+
+
 def director_dashboard(request: HttpRequest) -> HttpResponse:
 	"""Director dashboard: counts, pending verifications, and mentor requests."""
 	if not request.user.is_authenticated:
@@ -545,24 +429,41 @@ def director_dashboard(request: HttpRequest) -> HttpResponse:
 	if not request.user.is_staff:
 		return HttpResponse(status=403)
 	
-	mentor_requests = MentorRequest.objects.filter(status="pending").select_related("user")
+	# Both lists are rendered in full, so evaluate them once and count in Python;
+	# the template shows every mentor field, but only the requester of a request
+	mentor_requests = list(
+		MentorRequest.objects.filter(status="pending")
+		.select_related("user")
+		.only("created_at", "user", *_DASHBOARD_USER_FIELDS)
+	)
+	mentors = list(Mentor.objects.all())
 
 	counts = {
-		"visitors": Visitor.objects.count(),
-		"registrations": UserProfile.objects.select_related("user").filter(user__is_staff=False, user__is_superuser=False).count(),
-		"pending_mentor_assignments": mentor_requests.count(),
-		"mentors": Mentor.objects.count(),
+		# COUNT(*) over the ever-growing visitor log is the dashboard's slowest
+		# query; minute-old figures are fine for headline numbers
+		**cache.get_or_set("dashboard:totals", _dashboard_totals, DASHBOARD_TOTALS_TIMEOUT),
+		"pending_mentor_assignments": len(mentor_requests),
+		"mentors": len(mentors),
 	}
 	
 	# Show users without mentors in the assignment dropdown for clarity
-	users_for_assignment = UserProfile.objects.filter(
-		assigned_mentor__isnull=True, user__is_staff=False, user__is_superuser=False
-	).select_related("user")
+	users_for_assignment = (
+		UserProfile.objects.filter(assigned_mentor__isnull=True, user__is_staff=False, user__is_superuser=False)
+		.select_related("user")
+		.only("id", "created_at", "user", *_DASHBOARD_USER_FIELDS)
+	)
 
-	# For the general list, show all recent users
-	all_users = UserProfile.objects.select_related("user").filter(user__is_staff=False, user__is_superuser=False).order_by("-created_at")[:50]
-	
-	mentors = Mentor.objects.all()
+	# For the general list, show all recent users; the mentor column is joined in
+	# and only the rendered columns are loaded
+	all_users = (
+		UserProfile.objects.filter(user__is_staff=False, user__is_superuser=False)
+		.select_related("user", "assigned_mentor")
+		.only(
+			"id", "phone", "city", "verified", "created_at", "user", "assigned_mentor",
+			"assigned_mentor__name", *_DASHBOARD_USER_FIELDS,
+		)
+		.order_by("-created_at")[:50]
+	)
 	
 	return render(
 		request, 
@@ -587,7 +488,7 @@ def assign_mentor(request: HttpRequest) -> HttpResponse:
 	mentor_id = request.POST.get("mentor_id")
 
 	try:
-		user = User.objects.get(pk=user_id)
+		user = User.objects.select_related("profile").get(pk=user_id)
 		mentor = Mentor.objects.get(pk=mentor_id)
 	except (User.DoesNotExist, Mentor.DoesNotExist):
 		messages.error(request, "Invalid student or mentor selected.")
@@ -600,7 +501,7 @@ def assign_mentor(request: HttpRequest) -> HttpResponse:
 
 	profile = user.profile
 	profile.assigned_mentor = mentor
-	profile.save()
+	profile.save(update_fields=["assigned_mentor"])
 	
 	MentorAssignment.objects.create(user=user, mentor=mentor, assigned_by=request.user)
 
@@ -610,17 +511,10 @@ def assign_mentor(request: HttpRequest) -> HttpResponse:
 		pending_request.status = "approved"
 		pending_request.save()
 
-	# Send notifications (email + WhatsApp with fallback)
+	# The MentorAssignment post_save signal queues the student's email + WhatsApp;
+	# notify the mentor once the assignment commits, off the request thread
 	student_name = user.get_full_name() or user.first_name or user.email
-	send_mentor_assignment(
-		to_email=user.email,
-		student_name=student_name,
-		mentor_name=mentor.name,
-		portfolio_url=mentor.portfolio_url,
-		whatsapp_link=mentor.whatsapp_group_link,
-	)
-	# Send notification to the mentor
-	send_mentor_notification_to_mentor(mentor, user)
+	send_mentor_notification_task.delay(mentor.pk, user.pk)
 	
 	messages.success(request, f"Mentor '{mentor.name}' assigned to '{student_name}' and notifications triggered.")
 	return redirect("director_dashboard")
@@ -634,42 +528,43 @@ def logout_view(request: HttpRequest) -> HttpResponse:
 
 # ---------- Lightweight JSON API endpoints for dropdown data ----------
 
+# Outbound lookups (through utils.fetch_json's pooled connections) hold a worker
+# thread, so give up quickly and remember the failure for a while instead of
+# letting every request wait on a dead API
+EXTERNAL_API_TIMEOUT = 3
+EXTERNAL_API_RETRY_AFTER = 300
+# Empty answers are usually a misspelt or rare name; recheck those sooner
+EMPTY_RESULT_TIMEOUT = 60 * 10
+
 def api_states(request: HttpRequest) -> JsonResponse:
 	"""Return list of Indian states from a public dataset, cached."""
 	from django.core.cache import cache
-	import json
-	from urllib import request as urlrequest
 
 	cache_key = "states_IN"
 	cached = cache.get(cache_key)
-	if cached:
+	if cached is not None:
 		return JsonResponse({"states": cached})
 
 	# Public API: countriesnow.space (no API key). Use POST with JSON payload.
 	try:
 		api_url = "https://countriesnow.space/api/v0.1/countries/states"
-		payload = json.dumps({"country": "India"}).encode("utf-8")
-		req = urlrequest.Request(api_url, data=payload, headers={"Content-Type": "application/json"}, method="POST")
-		with urlrequest.urlopen(req, timeout=10) as resp:
-			body = resp.read()
-			data = json.loads(body.decode("utf-8"))
-			states = [s.get("name") for s in (data.get("data", {}).get("states", []) or []) if s.get("name")]
-			states.sort()
-			cache.set(cache_key, states, 60 * 60 * 24)  # cache 24h
-			return JsonResponse({"states": states})
+		data = fetch_json(api_url, {"country": "India"}, timeout=EXTERNAL_API_TIMEOUT)
+		states = [s.get("name") for s in (data.get("data", {}).get("states", []) or []) if s.get("name")]
+		states.sort()
+		cache.set(cache_key, states, 60 * 60 * 24)  # cache 24h
+		return JsonResponse({"states": states})
 	except Exception:
 		# Fallback minimal list if API fails
 		fallback = [
 			"Andhra Pradesh", "Delhi", "Gujarat", "Karnataka", "Maharashtra", "Tamil Nadu", "Telangana", "Uttar Pradesh", "West Bengal",
 		]
+		cache.set(cache_key, fallback, EXTERNAL_API_RETRY_AFTER)
 		return JsonResponse({"states": fallback})
 
 
 def api_cities(request: HttpRequest) -> JsonResponse:
 	"""Return list of cities for a given Indian state from a public dataset, cached."""
 	from django.core.cache import cache
-	import json
-	from urllib import request as urlrequest
 
 	state = request.GET.get("state", "").strip()
 	if not state:
@@ -677,21 +572,17 @@ def api_cities(request: HttpRequest) -> JsonResponse:
 
 	cache_key = f"cities_IN_{state}"
 	cached = cache.get(cache_key)
-	if cached:
+	if cached is not None:
 		return JsonResponse({"cities": cached})
 
 	try:
 		api_url = "https://countriesnow.space/api/v0.1/countries/state/cities"
-		payload = json.dumps({"country": "India", "state": state}).encode("utf-8")
-		req = urlrequest.Request(api_url, data=payload, headers={"Content-Type": "application/json"}, method="POST")
-		with urlrequest.urlopen(req, timeout=10) as resp:
-			body = resp.read()
-			data = json.loads(body.decode("utf-8"))
-			cities = data.get("data") or []
-			cities = [c for c in cities if isinstance(c, str)]
-			cities.sort()
-			cache.set(cache_key, cities, 60 * 60 * 24)  # cache 24h
-			return JsonResponse({"cities": cities})
+		data = fetch_json(api_url, {"country": "India", "state": state}, timeout=EXTERNAL_API_TIMEOUT)
+		cities = data.get("data") or []
+		cities = [c for c in cities if isinstance(c, str)]
+		cities.sort()
+		cache.set(cache_key, cities, 60 * 60 * 24 if cities else EMPTY_RESULT_TIMEOUT)
+		return JsonResponse({"cities": cities})
 	except Exception:
 		# Fallback sample map if API is unavailable
 		sample_map = {
@@ -725,43 +616,54 @@ def api_cities(request: HttpRequest) -> JsonResponse:
 			"Uttarakhand": ["Dehradun", "Haridwar"],
 			"West Bengal": ["Kolkata", "Siliguri", "Durgapur"],
 		}
-		return JsonResponse({"cities": sample_map.get(state, [])})
+		cities = sample_map.get(state, [])
+		cache.set(cache_key, cities, EXTERNAL_API_RETRY_AFTER)
+		return JsonResponse({"cities": cities})
 
 
-def api_academic_degrees(request: HttpRequest) -> JsonResponse:
-	"""Return degrees based on level (UG/PG)."""
-	level = (request.GET.get("level", "UG") or "UG").upper()
-	ug = [
+# Static dropdown bodies are serialised once per process (years once per year)
+_DEGREES_JSON = {
+	"UG": json.dumps({"degrees": [
 		"B.Tech Computer Science", "B.Tech Electronics", "B.Tech Mechanical",
 		"B.Sc Computer Science", "BBA", "B.Com",
-	]
-	pg = [
+	]}),
+	"PG": json.dumps({"degrees": [
 		"M.Tech Computer Science", "M.Tech Data Science", "MBA", "MCA",
-	]
-	return JsonResponse({"degrees": ug if level == "UG" else pg})
+	]}),
+}
 
 
-def api_academic_years(request: HttpRequest) -> JsonResponse:
-	"""Return a reasonable range of years for academic records."""
-	from datetime import datetime
+@lru_cache(maxsize=1)
+def _years_json(current: int) -> str:
+	"""JSON body listing academic years from ``current`` back to 1980."""
+	return json.dumps({"years": list(range(current, 1980 - 1, -1))})
 
-	current = datetime.utcnow().year
-	start = 1980
-	years = list(range(current, start - 1, -1))
-	return JsonResponse({"years": years})
+
+@cache_control(max_age=60 * 60 * 24, public=True)
+def api_academic_degrees(request: HttpRequest) -> HttpResponse:
+	"""Return degrees based on level (UG/PG)."""
+	level = (request.GET.get("level", "UG") or "UG").upper()
+	return HttpResponse(_DEGREES_JSON["UG" if level == "UG" else "PG"], content_type="application/json")
+
+
+@cache_control(max_age=60 * 60 * 24, public=True)
+def api_academic_years(request: HttpRequest) -> HttpResponse:
+	"""Return a reasonable range of years for academic records."""
+	return HttpResponse(_years_json(timezone.now().year), content_type="application/json")
 
 
 def api_institutions(request: HttpRequest) -> JsonResponse:
 	"""Return institutions filtered by state/city/level/degree.
 
 	Strategy:
-	- Fetch India universities from Hipolabs (cached 24h)
+	- Search the Institution table (indexed on PostgreSQL)
+	- Otherwise fetch India universities from Hipolabs (cached 24h)
 	- Merge with curated list for popular cities
 	- Filter by state/city heuristics (case-insensitive contains on name/state-province)
 	- Light keyword filter for degree level
+	- Cache each filtered answer for an hour
 	"""
-	import json
-	from urllib import request as urlrequest
+	from urllib.parse import quote
 	from django.core.cache import cache
 
 	state = (request.GET.get("state", "") or "").strip()
@@ -769,35 +671,12 @@ def api_institutions(request: HttpRequest) -> JsonResponse:
 	level = (request.GET.get("level", "UG") or "UG").upper()
 	degree = (request.GET.get("degree", "") or "").strip()
 
-	# 1) Prefer authoritative local datasets if present (AISHE/AICTE/UGC)
-	local_cache_key = "institutions_local_v1"
-	local_rows = cache.get(local_cache_key)
-	if local_rows is None:
-		local_rows = []
-		try:
-			import csv, os
-			base_dir = os.path.dirname(os.path.dirname(__file__))
-			data_dir = os.path.join(base_dir, "core", "data")
-			candidates = [
-				os.path.join(data_dir, "aishe_institutions.csv"),
-				os.path.join(data_dir, "aicte_institutions.csv"),
-				os.path.join(data_dir, "ugc_institutions.csv"),
-			]
-			for path in candidates:
-				if os.path.exists(path):
-					with open(path, newline='', encoding='utf-8') as f:
-						r = csv.DictReader(f)
-						for row in r:
-							name = (row.get("name") or row.get("institution") or row.get("Institute Name") or "").strip()
-							st = (row.get("state") or row.get("State") or row.get("STATE") or "").strip()
-							ct = (row.get("city") or row.get("District") or row.get("CITY") or "").strip()
-							if name:
-								local_rows.append({"name": name, "state": st, "city": ct})
-			cache.set(local_cache_key, local_rows, 60 * 60)  # cache 1h; change if files updated
-		except Exception:
-			local_rows = []
+	# The register page asks for the same few combinations over and over
+	result_key = "inst:" + quote(f"{state}:{city}:{degree}")
+	cached = cache.get(result_key)
+	if cached is not None:
+		return JsonResponse({"institutions": cached})
 
-	# Try to filter local rows first
 	def norm(s: str) -> str:
 		return (s or "").lower()
 
@@ -805,40 +684,35 @@ def api_institutions(request: HttpRequest) -> JsonResponse:
 	n_city = norm(city)
 	n_degree = norm(degree).split(" ")[0] if degree else ""
 
-	if local_rows:
-		candidates = []
-		for r in local_rows:
-			name = r.get("name", "")
-			st = norm(r.get("state", ""))
-			ct = norm(r.get("city", ""))
-			if ((not n_state) or (n_state in st) or (n_state in norm(name))) and ((not n_city) or (n_city in ct) or (n_city in norm(name))):
-				candidates.append(name)
-		# Optional degree keyword filter
-		if n_degree:
-			filtered = [n for n in candidates if n_degree in norm(n)]
-			if filtered:
-				candidates = filtered
-		# Dedupe & return if non-empty
-		seen = set()
-		result = []
-		for n in candidates:
-			if n and n not in seen:
-				seen.add(n)
-				result.append(n)
-		result = sorted(result)[:300]
-		if result:
-			return JsonResponse({"institutions": result})
-
-	# 2) Fallback: Hipolabs (broad coverage)
-	cache_key = "hipo_unis_IN_v1"
+	# 1) Prefer authoritative local datasets if loaded (AISHE/AICTE/UGC, see load_institutions)
+	local = Institution.objects.all()
+	if state:
+		local = local.filter(Q(state__icontains=state) | Q(name__icontains=state))
+	if city:
+		local = local.filter(Q(city__icontains=city) | Q(name__icontains=city))
+	names = local.order_by("name").values_list("name", flat=True).distinct()
+	# Optional degree keyword filter, dropped when nothing matches it
+	result = list(names.filter(name__icontains=n_degree)[:300]) if n_degree else []
+	if not result:
+		result = list(names[:300])
+	if result:
+		cache.set(result_key, result, 60 * 60)
+		return JsonResponse({"institutions": result})
+
+	# 2) Fallback: Hipolabs (broad coverage), cached as parallel columns of
+	# (names, lowercased names, lowercased provinces) rather than the raw dicts
+	cache_key = "hipo_unis_IN_v2"
 	unis = cache.get(cache_key)
 	if unis is None:
 		try:
-			with urlrequest.urlopen("https://universities.hipolabs.com/search?country=India", timeout=10) as resp:
-				unis = json.loads(resp.read().decode("utf-8"))
-				cache.set(cache_key, unis, 60 * 60 * 24)
+			payload = fetch_json("https://universities.hipolabs.com/search?country=India", timeout=EXTERNAL_API_TIMEOUT)
+			rows = [u for u in payload if u.get("name")]
+			names = tuple(u["name"] for u in rows)
+			unis = (names, tuple(map(norm, names)), tuple(norm(u.get("state-province")) for u in rows))
+			cache.set(cache_key, unis, 60 * 60 * 24)
 		except Exception:
-			unis = []
+			unis = ((), (), ())
+			cache.set(cache_key, unis, EXTERNAL_API_RETRY_AFTER)
 
 	# Curated additions by (state, city)
 	curated = {
@@ -865,13 +739,7 @@ def api_institutions(request: HttpRequest) -> JsonResponse:
 
 	# Build initial list from Hipolabs
 	candidates = []
-	for u in unis:
-		name = u.get("name") or ""
-		prov = u.get("state-province") or ""
-		if not name:
-			continue
-		name_n = norm(name)
-		prov_n = norm(prov)
+	for name, name_n, prov_n in zip(*unis):
 		ok_state = (not n_state) or (n_state in prov_n) or (n_state in name_n)
 		ok_city = (not n_city) or (n_city in name_n)
 		if ok_state and ok_city:
@@ -893,14 +761,9 @@ def api_institutions(request: HttpRequest) -> JsonResponse:
 		if filtered:
 			candidates = filtered
 
-	# Dedupe and sort
-	seen = set()
-	result = []
-	for n in candidates:
-		if n not in seen:
-			seen.add(n)
-			result.append(n)
-	result = sorted(result)[:200]
+	# Dedupe, then keep the first 200 alphabetically without sorting the rest
+	result = heapq.nsmallest(200, set(candidates))
+	cache.set(result_key, result, 60 * 60 if result else EMPTY_RESULT_TIMEOUT)
 
 	# Always include an 'Other' on the client; we return just institutions
 	return JsonResponse({"institutions": result})
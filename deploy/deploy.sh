@@ -84,6 +84,20 @@ log "Running database migrations..."
 python manage.py migrate
 log_success "Database migrations completed"
 
+# Reload the institution dropdown data when the AISHE/AICTE/UGC CSVs change
+INSTITUTION_CSVS=$(ls core/data/*_institutions.csv 2>/dev/null || true)
+INSTITUTION_STAMP="$PROJECT_DIR/.institutions.sha256"
+if [ -n "$INSTITUTION_CSVS" ]; then
+    if sha256sum $INSTITUTION_CSVS | cmp -s - "$INSTITUTION_STAMP"; then
+        log "Institution CSVs unchanged, skipping reload"
+    else
+        log "Loading institution CSVs..."
+        python manage.py load_institutions
+        sha256sum $INSTITUTION_CSVS > "$INSTITUTION_STAMP"
+        log_success "Institutions loaded"
+    fi
+fi
+
 # Collect static files
 log "Collecting static files..."
 python manage.py collectstatic --noinput
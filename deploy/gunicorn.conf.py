@@ -9,10 +9,11 @@ backlog = 2048
 
 # Worker processes
 workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+# Threaded workers keep serving while other requests wait on SMTP/WhatsApp/HTTP.
+# Each thread holds its own DB connection, so Postgres sees up to workers * threads.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
 worker_connections = 1000
-max_requests = 1000
-max_requests_jitter = 50
 preload_app = True
 
 # Restart workers after this many requests, to help prevent memory leaks
@@ -59,26 +60,42 @@ raw_env = [
     "PYTHONPATH=/var/www/college_portal",
 ]
 
-# Pre-fork application loading
-def pre_fork(server, worker):
-    server.log.info("Worker spawned (pid: %s)", worker.pid)
-
-def post_fork(server, worker):
-    server.log.info("Worker spawned (pid: %s)", worker.pid)
-
+# Server hooks
 def pre_exec(server):
     server.log.info("Forked child, re-executing.")
 
 def when_ready(server):
+    # With preload_app the app is loaded in the master by now: build shared,
+    # read-only caches once here so every forked worker inherits them
+    from django.apps import apps
+    if apps.ready:
+        from core.utils import warm_email_templates
+        warm_email_templates()
     server.log.info("Server is ready. Spawning workers")
 
 def worker_int(worker):
     worker.log.info("worker received INT or QUIT signal")
 
 def pre_fork(server, worker):
-    server.log.info("Worker spawned (pid: %s)", worker.pid)
+    server.log.info("Spawning worker")
 
 def post_fork(server, worker):
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+    # preload_app imports Django in the master; drop any DB connection the
+    # worker inherited so each process opens its own
+    from django.db import connections
+    for conn in connections.all():
+        conn.close()
+
+    # Compile module-level regexes and build the HTTP session before the first
+    # request, then connect it to the pincode API (per worker: pooled sockets
+    # must not be shared across forks)
+    from core.utils import prewarm_pincode_api
+    prewarm_pincode_api()
     server.log.info("Worker spawned (pid: %s)", worker.pid)
 
 def post_worker_init(worker):